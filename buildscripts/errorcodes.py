@@ -3,9 +3,15 @@
 
 Parses .cpp files for assertions and verifies assertion codes are distinct.
 Optionally replaces zero codes in source code with new distinct values.
+
+Source files are scanned by a pool of processes. The assertions found in each file are kept in an
+index, so that only the files which changed since the last run are scanned again.
 """
 
 import bisect
+import hashlib
+import json
+import multiprocessing
 import os.path
 import sys
 from collections import defaultdict, namedtuple
@@ -17,6 +23,8 @@ from pathlib import Path
 if __name__ == "__main__" and __package__ is None:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from buildscripts.util import fileops  # pylint: disable=wrong-import-position
+
 try:
     import regex as re
 except ImportError:
@@ -35,6 +43,22 @@ AssertLocation = namedtuple("AssertLocation", ['sourceFile', 'byteOffset', 'line
 
 list_files = False  # pylint: disable=invalid-name
 
+# Path of the index of the assertions in each source file, or None to scan every file.
+index_file = None  # pylint: disable=invalid-name
+
+# Number of processes scanning source files, defaults to the number of CPUs.
+jobs = None  # pylint: disable=invalid-name
+
+DEFAULT_INDEX_FILE = os.path.join("build", "errorcodes_index.json")
+
+# Bump this if the format of the index changes.
+_INDEX_VERSION = 1
+
+# Don't start another process to scan fewer files than this.
+_MIN_FILES_PER_PROCESS = 64
+
+# The patterns are kept separate rather than combined into a single alternation, since each of them
+# is searched much faster on its own.
 _CODE_PATTERNS = [
     re.compile(p + r'\s*(?P<code>\d+)', re.MULTILINE) for p in [
         # All the asserts and their optional variant suffixes
@@ -89,35 +113,125 @@ def get_all_source_files(prefix='.'):
         yield str(child)
 
 
-def foreach_source_file(callback, src_root):
-    """Invoke a callback on the text of each source file."""
-    for source_file in get_all_source_files(prefix=src_root):
-        if list_files:
+def _scan_file(args):
+    """Return the hash of a source file, and its assertions unless the hash is known_hash.
+
+    Each assertion is a (byteOffset, lines, code) tuple.
+    """
+    (source_file, known_hash) = args
+    with open(source_file, 'r', encoding='utf-8') as fh:
+        text = fh.read()
+
+    content_hash = hashlib.sha1(text.encode('utf-8')).hexdigest()
+    if content_hash == known_hash:
+        return (content_hash, None)
+
+    # Note that this will include the text of the full match but will report the position of the
+    # beginning of the code portion rather than the beginning of the match. This is to position
+    # editors on the spot that needs to change.
+    assertions = [(match.start('code'), match.group(0), match.group('code'))
+                  for pat in _CODE_PATTERNS for match in pat.finditer(text)]
+    return (content_hash, assertions)
+
+
+def _scan_files(work):
+    """Return the result of _scan_file() for each (source_file, known_hash) pair in work."""
+    if list_files:
+        for (source_file, _) in work:
             print('scanning file: ' + source_file)
-        with open(source_file, 'r', encoding='utf-8') as fh:
-            callback(source_file, fh.read())
+
+    processes = min(jobs or multiprocessing.cpu_count(), len(work) // _MIN_FILES_PER_PROCESS)
+    if processes <= 1:
+        return [_scan_file(args) for args in work]
+
+    with multiprocessing.Pool(processes=processes) as pool:
+        return pool.map(_scan_file, work, chunksize=max(1, len(work) // (processes * 8)))
+
+
+def _get_pattern_strings():
+    """Return the patterns, which the index is only valid for."""
+    return [pat.pattern for pat in _CODE_PATTERNS]
+
+
+def _read_index(src_root):
+    """Return the indexed files under src_root, or {} if there is no usable index."""
+    if not index_file:
+        return {}
+
+    try:
+        with open(index_file) as fh:
+            index = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+    if (index.get("version") != _INDEX_VERSION or index.get("patterns") != _get_pattern_strings()
+            or index.get("src_root") != os.path.abspath(src_root)):
+        return {}
+    return index["files"]
+
+
+def _write_index(src_root, files):
+    """Write the indexed files under src_root."""
+    if not index_file:
+        return
+
+    index = {
+        "version": _INDEX_VERSION,
+        "patterns": _get_pattern_strings(),
+        "src_root": os.path.abspath(src_root),
+        "files": files,
+    }
+    try:
+        fileops.write_file_atomically(index_file, json.dumps(index))
+    except OSError as err:
+        print("Failed to write the error code index '%s': %s" % (index_file, err))
 
 
 def parse_source_files(callback, src_root):
     """Walk MongoDB sourcefiles and invoke a callback for each AssertLocation found."""
+    _line_offsets.clear()
+    indexed_files = _read_index(src_root)
 
-    def scan_for_codes(source_file, text):
-        for pat in _CODE_PATTERNS:
-            for match in pat.finditer(text):
-                # Note that this will include the text of the full match but will report the
-                # position of the beginning of the code portion rather than the beginning of the
-                # match. This is to position editors on the spot that needs to change.
-                loc = AssertLocation(source_file, match.start('code'), match.group(0),
-                                     match.group('code'))
-                callback(loc)
+    # Files whose size and modification time are unchanged since they were indexed are not read.
+    # The others are scanned again, unless their hash shows that their contents are unchanged.
+    files = {}
+    work = []
+    for source_file in get_all_source_files(prefix=src_root):
+        stat = os.stat(source_file)
+        entry = indexed_files.get(source_file)
+        if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            files[source_file] = entry
+            continue
+
+        files[source_file] = {
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "hash": entry["hash"] if entry else None,
+            "assertions": entry["assertions"] if entry else None,
+        }
+        work.append((source_file, files[source_file]["hash"]))
+
+    for ((source_file, _), (content_hash, assertions)) in zip(work, _scan_files(work)):
+        files[source_file]["hash"] = content_hash
+        if assertions is not None:
+            files[source_file]["assertions"] = assertions
+
+    _write_index(src_root, files)
 
-    foreach_source_file(scan_for_codes, src_root)
+    for (source_file, entry) in files.items():
+        for (byte_offset, lines, code) in entry["assertions"]:
+            callback(AssertLocation(source_file, byte_offset, lines, code))
+
+
+# The offset of each line in the files that errors were reported for, see
+# get_line_and_column_for_position().
+_line_offsets = {}  # type: ignore
 
 
 def get_line_and_column_for_position(loc, _file_cache=None):
     """Convert an absolute position in a file into a line number."""
     if _file_cache is None:
-        _file_cache = {}
+        _file_cache = _line_offsets
     if loc.sourceFile not in _file_cache:
         with open(loc.sourceFile) as fh:
             text = fh.read()
@@ -302,15 +416,27 @@ def main():
     parser.add_option("-q", "--quiet", dest="quiet", action="store_true", default=False,
                       help="Suppress output on success [default: %default]")
     parser.add_option("--list-files", dest="list_files", action="store_true", default=False,
-                      help="Print the name of each file as it is scanned [default: %default]")
+                      help="Print the name of each file which is scanned, rather than read from"
+                      " the index [default: %default]")
+    parser.add_option(
+        "--index-file", dest="index_file", type="str", action="store",
+        default=DEFAULT_INDEX_FILE,
+        help="Index of the assertions in each file, so that only the files which changed are"
+        " scanned again [default: %default]")
+    parser.add_option("--no-index", dest="index_file", action="store_const", const=None,
+                      help="Scan every file, and don't read or write the index")
+    parser.add_option("-j", "--jobs", dest="jobs", type="int", action="store", default=None,
+                      help="Number of processes scanning files [default: number of CPUs]")
     parser.add_option(
         "--ticket", dest="ticket", type="str", action="store", default=0,
         help="Generate error codes for a given SERVER ticket number. Inputs can be of"
         " the form: `--ticket=12345` or `--ticket=SERVER-12345`.")
     (options, _) = parser.parse_args()
 
-    global list_files  # pylint: disable=global-statement,invalid-name
+    global list_files, index_file, jobs  # pylint: disable=global-statement,invalid-name
     list_files = options.list_files
+    index_file = options.index_file
+    jobs = options.jobs
 
     (_, errors, seen) = read_error_codes()
     ok = len(errors) == 0
@@ -61,6 +61,7 @@ class EvgExpansions(BaseModel):
     task_name: Name of task running.
     target_resmoke_time: Target time of generated sub-suites.
     task_id: ID of task being run under.
+    split_strategy: Name of strategy to use to split tasks into sub-suites.
     """
 
     build_id: str
@@ -74,6 +75,7 @@ class EvgExpansions(BaseModel):
     task_name: str
     target_resmoke_time: Optional[int] = None
     task_id: str
+    split_strategy: Optional[str] = None
 
     @classmethod
     def from_yaml_file(cls, path: str) -> "EvgExpansions":
@@ -101,6 +103,7 @@ class EvgExpansions(BaseModel):
             max_tests_per_suite=self.max_tests_per_suite,
             start_date=start_date,
             end_date=end_date,
+            split_strategy=self.split_strategy,
         )
 
     def build_evg_config_gen_options(self) -> GenTaskOptions:
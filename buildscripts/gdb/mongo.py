@@ -5,6 +5,7 @@ import json
 import os
 import re
 import sys
+import time
 
 import gdb
 
@@ -35,6 +36,29 @@ if sys.version_info[0] < 3:
     raise gdb.GdbError(
         "MongoDB gdb extensions only support Python 3. Your GDB was compiled against Python 2")
 
+# Types and decoration layouts looked up during this session. Both depend on the loaded objfiles,
+# so they are discarded whenever those change.
+_type_cache = {}
+_decoration_layout_cache = {}
+
+
+def _clear_caches(_event):
+    _type_cache.clear()
+    _decoration_layout_cache.clear()
+
+
+gdb.events.new_objfile.connect(_clear_caches)
+gdb.events.clear_objfiles.connect(_clear_caches)
+
+
+def lookup_type(type_name):
+    """Return the gdb.Type named 'type_name', like gdb.lookup_type() but cached for the session."""
+    type_t = _type_cache.get(type_name)
+    if type_t is None:
+        type_t = gdb.lookup_type(type_name)
+        _type_cache[type_name] = type_t
+    return type_t
+
 
 def get_process_name():
     """Return the main binary we are attached to."""
@@ -43,8 +67,18 @@ def get_process_name():
     return os.path.splitext(os.path.basename(main_binary_name))[0]
 
 
-def get_thread_id():
-    """Return the thread_id of the current GDB thread."""
+def get_thread_id(thread=None):
+    """Return the thread_id of the current GDB thread.
+
+    If 'thread' is given and GDB can provide its pthread_t handle, it is used instead of parsing the
+    output of the "thread" command.
+    """
+    if thread is not None and sys.platform.startswith("linux") and hasattr(thread, "handle"):
+        try:
+            return int.from_bytes(thread.handle(), sys.byteorder)
+        except gdb.error:
+            pass
+
     # GDB thread example:
     #  RHEL
     #   [Current thread is 1 (Thread 0x7f072426cca0 (LWP 12867))]
@@ -107,25 +141,27 @@ def get_session_kv_pairs():
     return list(absl_get_nodes(session_catalog["_sessions"]))  # pylint: disable=undefined-variable
 
 
-def get_decorations(obj):
-    """Return an iterator to all decorations on a given object.
-
-    Each object returned by the iterator is a tuple whose first element is the type name of the
-    decoration and whose second element is the decoration object itself.
+def get_decoration_layout(decorable):
+    """Return a list of (type name, index) pairs describing the decorations of a mongo::Decorable.
 
-    TODO: De-duplicate the logic between here and DecorablePrinter. This code was copied from there.
+    All the objects of a decorable type share the same DecorationRegistry, so the layout is only
+    computed once per registry and session.
     """
-    type_name = str(obj.type).replace("class", "").replace(" ", "")
-    decorable = obj.cast(gdb.lookup_type("mongo::Decorable<{}>".format(type_name)))
     decl_vector = decorable["_decorations"]["_registry"]["_decorationInfo"]
     start = decl_vector["_M_impl"]["_M_start"]
     finish = decl_vector["_M_impl"]["_M_finish"]
 
+    key = (str(decorable.type), int(start), int(finish))
+    layout = _decoration_layout_cache.get(key)
+    if layout is not None:
+        return layout
+
     decorable_t = decorable.type.template_argument(0)
-    decinfo_t = gdb.lookup_type('mongo::DecorationRegistry<{}>::DecorationInfo'.format(
+    decinfo_t = lookup_type('mongo::DecorationRegistry<{}>::DecorationInfo'.format(
         str(decorable_t).replace("class", "").strip()))
     count = int((int(finish) - int(start)) / decinfo_t.sizeof)
 
+    layout = []
     for i in range(count):
         descriptor = start[i]
         dindex = int(descriptor["descriptor"]["_index"])
@@ -134,13 +170,34 @@ def get_decorations(obj):
         type_name = type_name[0:len(type_name) - 1]
         type_name = type_name[0:type_name.rindex(">")]
         type_name = type_name[type_name.index("constructAt<"):].replace("constructAt<", "")
-        # get_unique_ptr should be loaded from 'mongo_printers.py'.
-        decoration_data = get_unique_ptr(decorable["_decorations"]["_decorationData"])  # pylint: disable=undefined-variable
 
         if type_name.endswith('*'):
             type_name = type_name[0:len(type_name) - 1]
         type_name = type_name.rstrip()
-        type_t = gdb.lookup_type(type_name)
+        layout.append((type_name, dindex))
+
+    _decoration_layout_cache[key] = layout
+    return layout
+
+
+def get_decorations(obj):
+    """Return an iterator to all decorations on a given object.
+
+    Each object returned by the iterator is a tuple whose first element is the type name of the
+    decoration and whose second element is the decoration object itself.
+
+    TODO: De-duplicate the logic between here and DecorablePrinter. This code was copied from there.
+    """
+    type_name = str(obj.type).replace("class", "").replace(" ", "")
+    decorable = obj.cast(lookup_type("mongo::Decorable<{}>".format(type_name)))
+    layout = get_decoration_layout(decorable)
+    if not layout:
+        return
+
+    # get_unique_ptr should be loaded from 'mongo_printers.py'.
+    decoration_data = get_unique_ptr(decorable["_decorations"]["_decorationData"])  # pylint: disable=undefined-variable
+    for (type_name, dindex) in layout:
+        type_t = lookup_type(type_name)
         obj = decoration_data[dindex].cast(type_t)
         yield (type_name, obj)
 
@@ -358,7 +415,7 @@ class DumpMongoDSessionCatalog(gdb.Command):
                 if val:
                     locker_addr = get_unique_ptr(val["_locker"])  # pylint: disable=undefined-variable
                     locker_obj = locker_addr.dereference().cast(
-                        gdb.lookup_type("mongo::LockerImpl"))
+                        lookup_type("mongo::LockerImpl"))
                     print('txnResourceStash._locker', "@", locker_addr)
                     print("txnResourceStash._locker._id", "=", locker_obj["_id"])
                 else:
@@ -502,7 +559,7 @@ class MongoDBDumpRecoveryUnits(gdb.Command):
                 recovery_unit_handle = get_unique_ptr(operation_context["_recoveryUnit"])  # pylint: disable=undefined-variable
                 # By default, cast the recovery unit as "mongo::WiredTigerRecoveryUnit"
                 recovery_unit = recovery_unit_handle.dereference().cast(
-                    gdb.lookup_type(recovery_unit_impl_type))
+                    lookup_type(recovery_unit_impl_type))
 
             output_doc["recoveryUnit"] = hex(recovery_unit_handle) if recovery_unit else "0x0"
             print(json.dumps(output_doc))
@@ -531,7 +588,7 @@ class MongoDBDumpRecoveryUnits(gdb.Command):
                     recovery_unit_handle = get_unique_ptr(txn_resource_stash["_recoveryUnit"])  # pylint: disable=undefined-variable
                     # By default, cast the recovery unit as "mongo::WiredTigerRecoveryUnit"
                     recovery_unit = recovery_unit_handle.dereference().cast(
-                        gdb.lookup_type(recovery_unit_impl_type))
+                        lookup_type(recovery_unit_impl_type))
 
             output_doc["recoveryUnit"] = hex(recovery_unit_handle) if recovery_unit else "0x0"
             print(json.dumps(output_doc))
@@ -585,6 +642,8 @@ class MongoDBUniqueStack(gdb.Command):
         if not arg:
             arg = 'bt'  # default to 'bt'
 
+        start_time = time.time()
+        num_threads = 0
         current_thread = gdb.selected_thread()
         try:
             for thread in gdb.selected_inferior().threads():
@@ -592,16 +651,24 @@ class MongoDBUniqueStack(gdb.Command):
                     continue
                 thread.switch()
                 self._process_thread_stack(arg, stacks, thread)
+                num_threads += 1
             self._dump_unique_stacks(stacks)
         finally:
             if current_thread and current_thread.is_valid():
                 current_thread.switch()
 
+        print("Found {} unique stacks among {} threads in {:.2f} seconds".format(
+            len(stacks), num_threads, time.time() - start_time))
+
     @staticmethod
     def _process_thread_stack(arg, stacks, thread):
-        """Process the thread stack."""
+        """Process the thread stack.
+
+        Threads are grouped by the program counters of their frames, so that 'arg' only runs once
+        for each unique stack.
+        """
         thread_info = {}  # thread dict to hold per thread data
-        thread_info['pthread'] = get_thread_id()
+        thread_info['pthread'] = get_thread_id(thread)
         thread_info['gdb_thread_num'] = thread.num
         thread_info['lwpid'] = thread.ptid[1]
         thread_info['name'] = get_current_thread_name()
@@ -41,6 +41,7 @@ from . import binder
 from . import errors
 from . import generator
 from . import parser
+from . import parser_cache
 from . import syntax
 
 
@@ -64,6 +65,8 @@ class CompilerArgs(object):
         self.write_dependencies = False  # type: bool
         self.write_dependencies_inline = False  # type: bool
 
+        self.parse_cache_dir = None  # type: str
+
 
 class CompilerImportResolver(parser.ImportResolverBase):
     """Class for the IDL compiler to resolve imported files."""
@@ -175,9 +178,13 @@ def _update_import_includes(args, spec, header_file_name):
         spec.globals.cpp_includes.append(include_h_file_name)
 
 
-def compile_idl(args):
-    # type: (CompilerArgs) -> bool
-    """Compile an IDL file into C++ code."""
+def compile_idl(args, cache=None):
+    # type: (CompilerArgs, parser_cache.ParsedSpecCache) -> bool
+    """
+    Compile an IDL file into C++ code.
+
+    cache: an optional parsed spec cache to share across several calls, overrides parse_cache_dir.
+    """
     # Named compile_idl to avoid naming conflict with builtin
     if not os.path.exists(args.input_file):
         logging.error("File '%s' not found", args.input_file)
@@ -200,10 +207,13 @@ def compile_idl(args):
     if args.target_arch is None:
         args.target_arch = platform.machine()
 
+    if cache is None and args.parse_cache_dir:
+        cache = parser_cache.ParsedSpecCache(args.parse_cache_dir)
+
     # Compile the IDL through the 3 passes
     with io.open(args.input_file, encoding='utf-8') as file_stream:
         parsed_doc = parser.parse(file_stream, args.input_file,
-                                  CompilerImportResolver(args.import_directories))
+                                  CompilerImportResolver(args.import_directories), cache)
 
         if not parsed_doc.errors:
             if args.write_dependencies or args.write_dependencies_inline:
@@ -217,8 +227,11 @@ def compile_idl(args):
 
             bound_doc = binder.bind(parsed_doc.spec)
             if not bound_doc.errors:
-                generator.generate_code(bound_doc.spec, args.target_arch, args.output_base_dir,
-                                        header_file_name, source_file_name)
+                unchanged_files = generator.generate_code(bound_doc.spec, args.target_arch,
+                                                          args.output_base_dir, header_file_name,
+                                                          source_file_name)
+                logging.debug("Generated '%s': %d of 2 output files unchanged", args.input_file,
+                              unchanged_files)
 
                 return True
             else:
@@ -30,6 +30,7 @@
 
 import hashlib
 import io
+import logging
 import os
 import re
 import sys
@@ -2698,15 +2699,40 @@ def generate_header_str(spec):
     return stream.getvalue()
 
 
+def _write_file_if_changed(file_name, str_value):
+    # type: (str, str) -> bool
+    """
+    Write a generated file unless it already has the exact same contents.
+
+    Leaving unchanged files alone preserves their modification time so that the C++ files which
+    include them are not needlessly recompiled. Returns True if the file was written.
+    """
+    contents = str_value.encode()
+
+    try:
+        if os.path.getsize(file_name) == len(contents):
+            with io.open(file_name, mode='rb') as file_handle:
+                if file_handle.read() == contents:
+                    logging.debug("Skipped writing unchanged file '%s'", file_name)
+                    return False
+    except OSError:
+        # The file does not exist yet or is not readable, write it below.
+        pass
+
+    with io.open(file_name, mode='wb') as file_handle:
+        file_handle.write(contents)
+
+    return True
+
+
 def _generate_header(spec, file_name):
-    # type: (ast.IDLAST, str) -> None
-    """Generate a C++ header."""
+    # type: (ast.IDLAST, str) -> bool
+    """Generate a C++ header, returns True if the file was written."""
 
     str_value = generate_header_str(spec)
 
     # Generate structs
-    with io.open(file_name, mode='wb') as file_handle:
-        file_handle.write(str_value.encode())
+    return _write_file_if_changed(file_name, str_value)
 
 
 def generate_source_str(spec, target_arch, header_file_name):
@@ -2723,20 +2749,23 @@ def generate_source_str(spec, target_arch, header_file_name):
 
 
 def _generate_source(spec, target_arch, file_name, header_file_name):
-    # type: (ast.IDLAST, str, str, str) -> None
-    """Generate a C++ source file."""
+    # type: (ast.IDLAST, str, str, str) -> bool
+    """Generate a C++ source file, returns True if the file was written."""
     str_value = generate_source_str(spec, target_arch, header_file_name)
 
     # Generate structs
-    with io.open(file_name, mode='wb') as file_handle:
-        file_handle.write(str_value.encode())
+    return _write_file_if_changed(file_name, str_value)
 
 
 def generate_code(spec, target_arch, output_base_dir, header_file_name, source_file_name):
-    # type: (ast.IDLAST, str, str, str, str) -> None
-    """Generate a C++ header and source file from an idl.ast tree."""
+    # type: (ast.IDLAST, str, str, str, str) -> int
+    """
+    Generate a C++ header and source file from an idl.ast tree.
 
-    _generate_header(spec, header_file_name)
+    Returns the number of files which were not rewritten because their contents did not change.
+    """
+
+    unchanged_files = 0 if _generate_header(spec, header_file_name) else 1
 
     if output_base_dir:
         include_h_file_name = os.path.relpath(
@@ -2747,4 +2776,7 @@ def generate_code(spec, target_arch, output_base_dir, header_file_name, source_f
     # Normalize to POSIX style for consistency across Windows and POSIX.
     include_h_file_name = include_h_file_name.replace("\\", "/")
 
-    _generate_source(spec, target_arch, source_file_name, include_h_file_name)
+    if not _generate_source(spec, target_arch, source_file_name, include_h_file_name):
+        unchanged_files += 1
+
+    return unchanged_files
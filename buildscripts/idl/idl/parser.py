@@ -42,8 +42,13 @@ from yaml import nodes
 from . import common
 from . import cpp_types
 from . import errors
+from . import parser_cache
 from . import syntax
 
+# Compose YAML documents with libyaml when PyYAML was built with it, it is an order of magnitude
+# faster than the pure Python composer and produces nodes with the same start marks.
+YAML_LOADER = getattr(yaml, "CLoader", yaml.Loader)
+
 
 class _RuleDesc(object):
     """
@@ -106,7 +111,8 @@ def _generic_parser(
             rule_desc = mapping_rules[first_name]
 
             if rule_desc.node_type == "scalar":
-                if ctxt.is_scalar_node(second_node, first_name):
+                # Fast path for the most common rule, only call into the context to report errors
+                if second_node.id == "scalar" or ctxt.is_scalar_node(second_node, first_name):
                     syntax_node.__dict__[first_name] = second_node.value
             elif rule_desc.node_type == "bool_scalar":
                 if ctxt.is_scalar_bool_node(second_node, first_name):
@@ -987,7 +993,7 @@ def _parse(stream, error_file_name):
     # pylint: disable=too-many-branches
 
     # This will raise an exception if the YAML parse fails
-    root_node = yaml.compose(stream)
+    root_node = yaml.compose(stream, Loader=YAML_LOADER)
 
     ctxt = errors.ParserContext(error_file_name, errors.ParserErrorCollection())
 
@@ -1070,13 +1076,35 @@ class ImportResolverBase(object, metaclass=ABCMeta):
         pass
 
 
-def parse(stream, input_file_name, resolver):
-    # type: (Any, str, ImportResolverBase) -> syntax.IDLParsedSpec
+def _parse_imported_file(resolver, resolved_file_name, cache):
+    # type: (ImportResolverBase, str, parser_cache.ParsedSpecCache) -> syntax.IDLParsedSpec
+    """Parse an imported file, consulting the parsed spec cache if there is one."""
+    if cache is None:
+        with resolver.open(resolved_file_name) as file_stream:
+            return _parse(file_stream, resolved_file_name)
+
+    with resolver.open(resolved_file_name) as file_stream:
+        contents = file_stream.read()
+
+    spec = cache.get(resolved_file_name, contents)
+    if spec is not None:
+        return syntax.IDLParsedSpec(spec, None)
+
+    parsed_doc = _parse(io.StringIO(contents), resolved_file_name)
+    if not parsed_doc.errors:
+        cache.put(resolved_file_name, contents, parsed_doc.spec)
+
+    return parsed_doc
+
+
+def parse(stream, input_file_name, resolver, cache=None):
+    # type: (Any, str, ImportResolverBase, parser_cache.ParsedSpecCache) -> syntax.IDLParsedSpec
     """
     Parse a YAML document into an idl.syntax tree.
 
     stream: is a io.Stream.
     input_file_name: a file name for error messages to use, and to help resolve imported files.
+    cache: an optional cache of parsed imported files.
     """
     # pylint: disable=too-many-locals
 
@@ -1116,8 +1144,7 @@ def parse(stream, input_file_name, resolver):
         resolved_file_names.append(resolved_file_name)
 
         # Parse imported file
-        with resolver.open(resolved_file_name) as file_stream:
-            parsed_doc = _parse(file_stream, resolved_file_name)
+        parsed_doc = _parse_imported_file(resolver, resolved_file_name, cache)
 
         # Check for errors
         if parsed_doc.errors:
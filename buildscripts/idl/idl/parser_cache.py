@@ -0,0 +1,160 @@
+# Copyright (C) 2021-present MongoDB, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the Server Side Public License, version 1,
+# as published by MongoDB, Inc.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Server Side Public License for more details.
+#
+# You should have received a copy of the Server Side Public License
+# along with this program. If not, see
+# <http://www.mongodb.com/licensing/server-side-public-license>.
+#
+# As a special exception, the copyright holders give permission to link the
+# code of portions of this program with the OpenSSL library under certain
+# conditions as described in each individual source file and distribute
+# linked combinations including the program with the OpenSSL library. You
+# must comply with the Server Side Public License in all respects for
+# all of the code used other than as permitted herein. If you modify file(s)
+# with this exception, you may extend this exception to your version of the
+# file(s), but you are not obligated to do so. If you do not wish to do so,
+# delete this exception statement from your version. If you delete this
+# exception statement from all source files in the program, then also delete
+# it in the license file.
+#
+"""
+IDL parsed spec cache.
+
+Caches the idl.syntax trees of parsed IDL files so that files which are imported by many other IDL
+files are only parsed once per build tree.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from typing import Dict, Optional
+
+from . import syntax
+
+# Bump this if the pickled representation of the syntax tree changes in a way that is not covered
+# by the hash of the IDL compiler sources.
+_CACHE_FORMAT_VERSION = 1
+
+_compiler_hash = None  # type: Optional[str]
+
+
+def _get_compiler_hash():
+    # type: () -> str
+    """Return a hash of the IDL compiler sources so that the cache is invalidated when they change."""
+    global _compiler_hash  # pylint: disable=global-statement
+
+    if _compiler_hash is None:
+        hasher = hashlib.sha256(str(_CACHE_FORMAT_VERSION).encode())
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+        for file_name in sorted(os.listdir(package_dir)):
+            if file_name.endswith(".py"):
+                with open(os.path.join(package_dir, file_name), "rb") as file_stream:
+                    hasher.update(file_stream.read())
+        _compiler_hash = hasher.hexdigest()
+
+    return _compiler_hash
+
+
+class ParsedSpecCache(object):
+    """
+    Cache of parsed IDL specs keyed by file name and file contents.
+
+    Entries are kept in memory as pickled bytes so that every lookup returns a fresh copy of the
+    syntax tree, since callers mutate the specs they get back. If a cache directory is given, entries
+    are also persisted there and shared across processes.
+    """
+
+    def __init__(self, cache_dir=None):
+        # type: (str) -> None
+        """Construct a cache, optionally backed by a directory on disk."""
+        self._cache_dir = cache_dir
+        self._entries = {}  # type: Dict[str, bytes]
+        self.hits = 0
+        self.misses = 0
+
+        if self._cache_dir:
+            os.makedirs(self._cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _get_key(file_name, contents):
+        # type: (str, str) -> str
+        """Return the cache key for a given file name and its contents."""
+        hasher = hashlib.sha256(_get_compiler_hash().encode())
+        hasher.update(os.path.normpath(file_name).encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(contents.encode("utf-8"))
+        return hasher.hexdigest()
+
+    def _get_path(self, key):
+        # type: (str) -> str
+        """Return the on-disk path of a cache entry."""
+        return os.path.join(self._cache_dir, key[:2], key + ".pickle")
+
+    def get(self, file_name, contents):
+        # type: (str, str) -> Optional[syntax.IDLSpec]
+        """Return a copy of the cached spec for the file, or None if it is not cached."""
+        key = self._get_key(file_name, contents)
+
+        data = self._entries.get(key)
+        if data is None and self._cache_dir:
+            try:
+                with open(self._get_path(key), "rb") as file_stream:
+                    data = file_stream.read()
+            except OSError:
+                data = None
+
+        if data is not None:
+            try:
+                spec = pickle.loads(data)
+            except Exception:  # pylint: disable=broad-except
+                # Treat corrupted cache entries as misses, they are rewritten below.
+                logging.warning("Ignoring corrupted IDL parse cache entry for '%s'", file_name)
+                spec = None
+
+            if isinstance(spec, syntax.IDLSpec):
+                self._entries[key] = data
+                self.hits += 1
+                logging.debug("IDL parse cache hit for '%s'", file_name)
+                return spec
+
+        self.misses += 1
+        logging.debug("IDL parse cache miss for '%s'", file_name)
+        return None
+
+    def put(self, file_name, contents, spec):
+        # type: (str, str, syntax.IDLSpec) -> None
+        """Add a successfully parsed spec to the cache."""
+        key = self._get_key(file_name, contents)
+        data = pickle.dumps(spec, protocol=pickle.HIGHEST_PROTOCOL)
+        self._entries[key] = data
+
+        if not self._cache_dir:
+            return
+
+        # Write to a temporary file and rename it into place so that concurrent IDL compiler
+        # processes never observe a partially written entry. The idl package is loaded by idlc.py
+        # and SCons without the buildscripts package on the path, so it cannot use
+        # buildscripts.util.fileops.write_file_atomically().
+        path = self._get_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            (fd, temp_path) = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file_stream:
+                    file_stream.write(data)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError as err:
+            logging.warning("Failed to write IDL parse cache entry for '%s': %s", file_name, err)
@@ -30,18 +30,47 @@
 """IDL Compiler Driver Main Entry point."""
 
 import argparse
+import contextlib
+import io
+import json
 import logging
 import sys
+from typing import Any
 
 import idl.compiler
+import idl.errors
+import idl.parser_cache
 
 
-def main():
-    # type: () -> None
-    """Execute Main Entry point."""
-    parser = argparse.ArgumentParser(description='MongoDB IDL Compiler.')
+class _ArgumentError(Exception):
+    """Raised instead of exiting when the command line of a batch request is invalid."""
+
+    pass
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    """An argument parser which can raise instead of exiting the process on error."""
+
+    def __init__(self, raise_on_error=False, **kwargs):
+        # type: (bool, **Any) -> None
+        """Construct an argument parser."""
+        self._raise_on_error = raise_on_error
+        super(_ArgumentParser, self).__init__(**kwargs)
+
+    def error(self, message):
+        # type: (str) -> None
+        """Report an invalid command line."""
+        if self._raise_on_error:
+            raise _ArgumentError(message)
+        super(_ArgumentParser, self).error(message)
+
 
-    parser.add_argument('file', type=str, help="IDL input file")
+def _make_argument_parser(raise_on_error=False):
+    # type: (bool) -> _ArgumentParser
+    """Create the command line parser for a single IDL compiler invocation."""
+    parser = _ArgumentParser(raise_on_error=raise_on_error, description='MongoDB IDL Compiler.')
+
+    parser.add_argument('file', type=str, nargs='?', help="IDL input file")
 
     parser.add_argument('-o', '--output', type=str, help="IDL output source file")
 
@@ -60,13 +89,28 @@ def main():
     parser.add_argument('--write-dependencies-inline', action='store_true',
                         help='print out a list of dependent imports during file generation')
 
+    parser.add_argument('--parse-cache-dir', type=str,
+                        help="Directory to cache parsed IDL import files in across invocations")
+
     parser.add_argument('--target_arch', type=str,
                         help="IDL target archiecture (amd64, s390x). defaults to current machine")
 
-    args = parser.parse_args()
+    if not raise_on_error:
+        parser.add_argument(
+            '--batch', type=str, metavar='FILE',
+            help="Compile many IDL files in one process. FILE ('-' for stdin) contains one JSON"
+            " list of idlc arguments per line, and one JSON result per line is written to stdout")
 
-    if args.verbose:
-        logging.basicConfig(level=logging.DEBUG)
+    return parser
+
+
+def _compile(args, cache=None):
+    # type: (argparse.Namespace, idl.parser_cache.ParsedSpecCache) -> bool
+    """Compile the IDL file described by a parsed command line."""
+    if (args.output is not None and args.header is None) or \
+        (args.output is  None and args.header is not None):
+        print("ERROR: Either both --header and --output must be specified or neither.")
+        return False
 
     compiler_args = idl.compiler.CompilerArgs()
 
@@ -80,14 +124,76 @@ def main():
     compiler_args.output_suffix = "_gen"
     compiler_args.write_dependencies = args.write_dependencies
     compiler_args.write_dependencies_inline = args.write_dependencies_inline
-
-    if (args.output is not None and args.header is None) or \
-        (args.output is  None and args.header is not None):
-        print("ERROR: Either both --header and --output must be specified or neither.")
-        sys.exit(1)
+    compiler_args.parse_cache_dir = args.parse_cache_dir
 
     # Compile the IDL document the user specified
-    success = idl.compiler.compile_idl(compiler_args)
+    return idl.compiler.compile_idl(compiler_args, cache)
+
+
+def _run_batch(in_stream, out_stream, cache_dir):
+    # type: (Any, Any, str) -> bool
+    """
+    Compile the IDL files requested by each line of in_stream.
+
+    The parser, generator and parsed imports are kept warm across requests. Each request is a JSON
+    list of idlc arguments and each reply is a JSON object with the success of the compilation and
+    everything it printed.
+    """
+    parser = _make_argument_parser(raise_on_error=True)
+    cache = idl.parser_cache.ParsedSpecCache(cache_dir)
+    all_succeeded = True
+
+    for line in in_stream:
+        if not line.strip():
+            continue
+
+        argv = json.loads(line)
+        output = io.StringIO()
+        batch_argv = sys.argv
+        with contextlib.redirect_stdout(output):
+            try:
+                # The generated file header records sys.argv, make it match a standalone invocation.
+                sys.argv = batch_argv[:1] + argv
+                args = parser.parse_args(argv)
+                if args.file is None:
+                    parser.error("the following arguments are required: file")
+                success = _compile(args, cache)
+            except (_ArgumentError, idl.errors.IDLError, OSError) as err:
+                print("ERROR: %s" % (err))
+                success = False
+            finally:
+                sys.argv = batch_argv
+
+        all_succeeded = all_succeeded and success
+        out_stream.write(json.dumps({"success": success, "output": output.getvalue()}) + "\n")
+        out_stream.flush()
+
+    logging.info("IDL parse cache: %d hits, %d misses", cache.hits, cache.misses)
+    return all_succeeded
+
+
+def main():
+    # type: () -> None
+    """Execute Main Entry point."""
+    parser = _make_argument_parser()
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.basicConfig(level=logging.DEBUG)
+
+    if args.batch is not None:
+        if args.file is not None:
+            parser.error("an IDL input file cannot be specified with --batch")
+
+        if args.batch == '-':
+            success = _run_batch(sys.stdin, sys.stdout, args.parse_cache_dir)
+        else:
+            with open(args.batch, encoding='utf-8') as batch_stream:
+                success = _run_batch(batch_stream, sys.stdout, args.parse_cache_dir)
+    else:
+        if args.file is None:
+            parser.error("the following arguments are required: file")
+        success = _compile(args)
 
     if not success:
         sys.exit(1)
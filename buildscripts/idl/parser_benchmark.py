@@ -0,0 +1,100 @@
+# Copyright (C) 2021-present MongoDB, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the Server Side Public License, version 1,
+# as published by MongoDB, Inc.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Server Side Public License for more details.
+#
+# You should have received a copy of the Server Side Public License
+# along with this program. If not, see
+# <http://www.mongodb.com/licensing/server-side-public-license>.
+#
+# As a special exception, the copyright holders give permission to link the
+# code of portions of this program with the OpenSSL library under certain
+# conditions as described in each individual source file and distribute
+# linked combinations including the program with the OpenSSL library. You
+# must comply with the Server Side Public License in all respects for
+# all of the code used other than as permitted herein. If you modify file(s)
+# with this exception, you may extend this exception to your version of the
+# file(s), but you are not obligated to do so. If you do not wish to do so,
+# delete this exception statement from your version. If you delete this
+# exception statement from all source files in the program, then also delete
+# it in the license file.
+#
+"""
+Benchmark the IDL parser over a source tree.
+
+Parses every IDL file, including its imports, once with each available YAML loader and reports the
+time taken so the speedup of the libyaml composer can be measured.
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List
+
+import yaml
+
+# Permit imports from "buildscripts".
+sys.path.append(os.path.normpath(os.path.join(os.path.abspath(__file__), '../../..')))
+
+# pylint: disable=wrong-import-position
+import buildscripts.idl.lib as lib
+from buildscripts.idl.idl import parser
+
+
+def benchmark_loader(loader, idl_paths, import_dirs, iterations):
+    # type: (type, List[str], List[str], int) -> float
+    """Return the best time in seconds to parse all the IDL files with a YAML loader."""
+    saved_loader = parser.YAML_LOADER
+    parser.YAML_LOADER = loader
+    try:
+        best = float("inf")
+        for _ in range(iterations):
+            start = time.perf_counter()
+            for idl_path in idl_paths:
+                lib.parse_idl(idl_path, import_dirs)
+            best = min(best, time.perf_counter() - start)
+        return best
+    finally:
+        parser.YAML_LOADER = saved_loader
+
+
+def main():
+    """Run the main function."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--import-dir", dest="import_dirs", type=str, action="append",
+                            default=None, help="Directory to search for IDL import files")
+    arg_parser.add_argument("--iterations", type=int, default=3,
+                            help="Number of times to parse the tree, the best time is reported")
+    arg_parser.add_argument("idl_dir", nargs="?", default="src/mongo",
+                            help="Directory to search for IDL files")
+
+    args = arg_parser.parse_args()
+    import_dirs = args.import_dirs or ["src"]
+
+    idl_paths = sorted(lib.list_idls(args.idl_dir))
+    print("Parsing %d IDL files from '%s'" % (len(idl_paths), args.idl_dir))
+
+    loaders = [("python", yaml.Loader)]
+    if hasattr(yaml, "CLoader"):
+        loaders.append(("libyaml", yaml.CLoader))
+    else:
+        print("PyYAML was built without libyaml, only benchmarking the pure Python loader")
+
+    timings = {}
+    for name, loader in loaders:
+        timings[name] = benchmark_loader(loader, idl_paths, import_dirs, args.iterations)
+        print("%-8s %8.3fs" % (name, timings[name]))
+
+    if "libyaml" in timings:
+        print("speedup  %8.2fx" % (timings["python"] / timings["libyaml"]))
+
+
+if __name__ == '__main__':
+    main()
@@ -38,4 +38,5 @@ import idl.compiler  # pylint: disable=wrong-import-position
 import idl.errors  # pylint: disable=wrong-import-position
 import idl.generator  # pylint: disable=wrong-import-position
 import idl.parser  # pylint: disable=wrong-import-position
+import idl.parser_cache  # pylint: disable=wrong-import-position
 import idl.syntax  # pylint: disable=wrong-import-position
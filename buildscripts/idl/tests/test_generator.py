@@ -96,6 +96,38 @@ class TestGenerator(testcase.IDLTestcase):
             args.input_file = os.path.join(self._idl_dir, f'{idl_file}.idl')
             self.assertTrue(idl.compiler.compile_idl(args))
 
+    def test_unchanged_output_not_rewritten(self):
+        # type: () -> None
+        """Validate that generated files are only rewritten when their contents change."""
+        args = idl.compiler.CompilerArgs()
+        args.output_suffix = self.output_suffix
+        args.import_directories = [self._src_dir]
+        args.input_file = os.path.join(self._idl_dir, f'{self.idl_files_to_test[1]}.idl')
+
+        if not os.path.exists(args.input_file):
+            unittest.skip(
+                "Skipping IDL Generator testing since %s could not be found." % (args.input_file))
+            return
+
+        self.assertTrue(idl.compiler.compile_idl(args))
+
+        file_prefix = os.path.join(self._idl_dir, f'{self.idl_files_to_test[1]}{self.output_suffix}')
+        header_file = file_prefix + ".h"
+        source_file = file_prefix + ".cpp"
+
+        # Backdate the outputs so that a rewrite would be observable
+        os.utime(header_file, (0, 0))
+        with open(source_file, 'a') as file_handle:
+            file_handle.write("// stale\n")
+        os.utime(source_file, (0, 0))
+
+        self.assertTrue(idl.compiler.compile_idl(args))
+
+        self.assertEqual(os.stat(header_file).st_mtime, 0)
+        self.assertNotEqual(os.stat(source_file).st_mtime, 0)
+        with open(source_file) as file_handle:
+            self.assertNotIn("// stale", file_handle.read())
+
     def test_enum_non_const(self):
         # type: () -> None
         """Validate enums are not marked as const in getters."""
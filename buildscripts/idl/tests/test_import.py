@@ -30,6 +30,7 @@
 """Test cases for IDL binder."""
 
 import io
+import tempfile
 import textwrap
 import unittest
 from typing import Any, Dict
@@ -463,6 +464,73 @@ class TestImport(testcase.IDLTestcase):
                 bson_serialization_type: string
             """), idl.errors.ERROR_ID_MISSING_REQUIRED_FIELD, resolver=resolver)
 
+    def test_import_parse_cache(self):
+        # type: () -> None
+        """Imported files are parsed once and served from the parse cache afterwards."""
+
+        import_dict = {
+            "basetypes.idl":
+                textwrap.dedent("""
+            global:
+                cpp_namespace: 'something'
+
+            types:
+                string:
+                    description: foo
+                    cpp_type: foo
+                    bson_serialization_type: string
+                    serializer: foo
+                    deserializer: foo
+                    default: foo
+
+            structs:
+                bar:
+                    description: foo
+                    strict: false
+                    fields:
+                        foo: string
+            """),
+        }
+
+        doc_str = textwrap.dedent("""
+        imports:
+            - "basetypes.idl"
+
+        structs:
+            foo:
+                description: foo
+                fields:
+                    foo1: string
+                    foo2: bar
+            """)
+
+        def parse_with_cache(cache):
+            # type: (idl.parser_cache.ParsedSpecCache) -> idl.syntax.IDLParsedSpec
+            parsed_doc = idl.parser.parse(
+                io.StringIO(doc_str), "root.idl", DictionaryImportResolver(import_dict), cache)
+            self.assertIsNone(parsed_doc.errors)
+            return parsed_doc
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = idl.parser_cache.ParsedSpecCache(cache_dir)
+            parse_with_cache(cache)
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+            # Every lookup returns a fresh copy since the symbol tables are mutated on import
+            parsed_doc = parse_with_cache(cache)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual([s.name for s in parsed_doc.spec.symbols.structs], ["foo", "bar"])
+
+            # A new cache over the same directory is served from disk
+            disk_cache = idl.parser_cache.ParsedSpecCache(cache_dir)
+            parse_with_cache(disk_cache)
+            self.assertEqual((disk_cache.hits, disk_cache.misses), (1, 0))
+
+            # Changing the contents of an imported file invalidates its entry
+            import_dict["basetypes.idl"] += "\n# comment\n"
+            parse_with_cache(disk_cache)
+            self.assertEqual((disk_cache.hits, disk_cache.misses), (1, 1))
+
 
 if __name__ == '__main__':
 
@@ -30,8 +30,12 @@
 """Test cases for IDL parser."""
 # pylint: disable=too-many-lines
 
+import io
 import textwrap
 import unittest
+from typing import List, Tuple
+
+import yaml
 
 # import package so that it works regardless of whether we run as a module or file
 if __package__ is None:
@@ -1860,6 +1864,41 @@ class TestParser(testcase.IDLTestcase):
                 reply_type: foo_reply_struct
             """), idl.errors.ERROR_ID_EMPTY_ACCESS_CHECK)
 
+    @unittest.skipUnless(hasattr(yaml, "CLoader"), "PyYAML was built without libyaml")
+    def test_yaml_loader_error_locations(self):
+        # type: () -> None
+        """The libyaml and pure Python YAML loaders report errors at the same locations."""
+        doc_str = textwrap.dedent("""
+        global:
+            cpp_namespace: 'foo'
+
+        structs:
+            foo:
+                description: foo
+                strict: bar
+                fields:
+                    foo: string
+                    foo: string
+            """)
+
+        def get_error_locations(loader):
+            # type: (type) -> List[Tuple[int, int]]
+            saved_loader = idl.parser.YAML_LOADER
+            idl.parser.YAML_LOADER = loader
+            try:
+                parsed_doc = idl.parser.parse(
+                    io.StringIO(doc_str), "root.idl", testcase.NothingImportResolver())
+            finally:
+                idl.parser.YAML_LOADER = saved_loader
+
+            self.assertIsNotNone(parsed_doc.errors)
+            # pylint: disable=protected-access
+            return [(error.line, error.column) for error in parsed_doc.errors._errors]
+
+        python_locations = get_error_locations(yaml.Loader)
+        self.assertEqual(len(python_locations), 2)
+        self.assertEqual(python_locations, get_error_locations(yaml.CLoader))
+
 
 if __name__ == '__main__':
 
@@ -24,13 +24,16 @@
 """Unittests for the graph analyzer."""
 
 import json
+import os
 import sys
+import tempfile
 import unittest
 
 import networkx
 
 import libdeps.analyzer
-from libdeps.graph import LibdepsGraph, EdgeProps, NodeProps, CountTypes
+from libdeps.graph import LibdepsGraph, EdgeProps, NodeProps, CountTypes, load_libdeps_graph, \
+    save_libdeps_graph, BinaryLibdepsGraphFile
 
 
 def add_node(graph, node, builder):
@@ -442,5 +445,41 @@ class Tests(unittest.TestCase):
         self.run_counts(expected_result, libdeps_graph)
 
 
+    def test_binary_graph_round_trip(self):
+        """Test saving and loading a graph in the binary format."""
+
+        graph = LibdepsGraph()
+        graph.graph['build_dir'] = '.'
+        graph.graph['graph_schema_version'] = 2
+        graph.graph['git_hash'] = 'abcdef'
+        graph.graph['deptypes'] = json.dumps({"Public": 1, "Private": 2})
+        add_node(graph, 'lib1.so', 'SharedLibrary')
+        add_node(graph, 'lib2.so', 'SharedLibrary')
+        add_node(graph, 'lib3.so', 'SharedLibrary')
+        add_node(graph, 'prog1', 'Program')
+        add_edge(graph, 'prog1', 'lib1.so', direct=True, visibility=2)
+        add_edge(graph, 'prog1', 'lib2.so', direct=False, visibility=1)
+        add_edge(graph, 'lib1.so', 'lib2.so', direct=True, visibility=1)
+        add_edge(graph, 'lib2.so', 'lib3.so', direct=True, visibility=2)
+        graph['lib1.so']['lib2.so'][EdgeProps.symbols.name] = "_ZN5mongo3fooEv _ZN5mongo3barEv"
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            graph_file = os.path.join(tmpdir, 'libdeps.graph')
+            save_libdeps_graph(graph, graph_file)
+
+            with BinaryLibdepsGraphFile(graph_file) as binary_graph:
+                self.assertEqual(binary_graph.graph['git_hash'], 'abcdef')
+
+            loaded_graph = load_libdeps_graph(graph_file)
+
+        self.assertIsInstance(loaded_graph, LibdepsGraph)
+        self.assertEqual(loaded_graph.graph, graph.graph)
+        self.assertEqual(dict(loaded_graph.nodes(data=True)), dict(graph.nodes(data=True)))
+        self.assertEqual(
+            sorted(loaded_graph.edges(data=True), key=lambda edge: edge[:2]),
+            sorted(graph.edges(data=True), key=lambda edge: edge[:2]))
+        self.assertEqual(sorted(loaded_graph.pred['lib2.so']), ['lib1.so', 'prog1'])
+        self.assertEqual(loaded_graph.get_deptype('Private'), 2)
+
 if __name__ == '__main__':
     unittest.main()
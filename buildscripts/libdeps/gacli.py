@@ -36,7 +36,7 @@ import copy
 import networkx
 
 import libdeps.analyzer as libdeps_analyzer
-from libdeps.graph import LibdepsGraph, CountTypes, LinterTypes
+from libdeps.graph import CountTypes, LinterTypes, load_libdeps_graph
 
 
 class LinterSplitArgs(argparse.Action):
@@ -122,8 +122,9 @@ def setup_args_parser():
 
     parser = argparse.ArgumentParser(formatter_class=CustomFormatter)
 
-    parser.add_argument('--graph-file', type=str, action='store', help="The LIBDEPS graph to load.",
-                        default="build/opt/libdeps/libdeps.graphml")
+    parser.add_argument(
+        '--graph-file', type=str, action='store', default="build/opt/libdeps/libdeps.graph",
+        help="The LIBDEPS graph to load, either in the binary format or graphml.")
 
     parser.add_argument('--format', choices=['pretty', 'json'], default='pretty',
                         help="The output format type.")
@@ -191,12 +192,12 @@ def strip_build_dirs(build_dir, nodes):
 
 
 def load_graph_data(graph_file, output_format):
-    """Load a graphml file."""
+    """Load a binary or graphml graph file."""
 
     if output_format == "pretty":
         sys.stdout.write("Loading graph data...")
         sys.stdout.flush()
-    graph = networkx.read_graphml(graph_file)
+    graph = load_libdeps_graph(graph_file)
     if output_format == "pretty":
         sys.stdout.write("Loaded!\n\n")
     return graph
@@ -206,8 +207,7 @@ def main():
     """Perform graph analysis based on input args."""
 
     args = setup_args_parser()
-    graph = load_graph_data(args.graph_file, args.format)
-    libdeps_graph = LibdepsGraph(graph=graph)
+    libdeps_graph = load_graph_data(args.graph_file, args.format)
     build_dir = libdeps_graph.graph['build_dir']
 
     if libdeps_graph.graph['graph_schema_version'] == 1:
@@ -29,6 +29,7 @@ The backend interacts with the graph_analyzer to perform queries on various libd
 
 from pathlib import Path
 from collections import namedtuple, OrderedDict
+from itertools import chain
 
 import flask
 import networkx
@@ -82,7 +83,7 @@ class BackendServer:
     def load_graph_from_file(self, file_path):
         """Load a graph file from disk and handle version."""
 
-        graph = libdeps.graph.LibdepsGraph(networkx.read_graphml(file_path))
+        graph = libdeps.graph.load_libdeps_graph(file_path)
         if graph.graph['graph_schema_version'] == 1:
             self._dependents_graph = graph
             self._dependency_graph = networkx.reverse_view(self._dependents_graph)
@@ -98,6 +99,12 @@ class BackendServer:
     def get_graph_build_data(self, graph_file):
         """Fast method for extracting basic build data from the graph file."""
 
+        if libdeps.graph.is_binary_libdeps_graph(graph_file):
+            with libdeps.graph.BinaryLibdepsGraphFile(graph_file) as binary_graph:
+                return self.graph_file_tuple(
+                    str(binary_graph.graph['graph_schema_version']),
+                    binary_graph.graph['git_hash'], graph_file)
+
         version = ''
         git_hash = ''
         # pylint: disable=c-extension-no-member
@@ -113,10 +120,13 @@ class BackendServer:
         return self.graph_file_tuple(version, git_hash, graph_file)
 
     def get_graphml_files(self):
-        """Find all graphml files in the target graphml dir."""
+        """Find all graphml and binary graph files in the target graphml dir."""
 
         graph_files = OrderedDict()
-        for graph_file in self.graphml_dir.glob("**/*.graphml"):
+        # Binary graph files come last so they are used instead of the graphml files
+        # generated along side them, since they are much faster to load.
+        for graph_file in chain(
+                self.graphml_dir.glob("**/*.graphml"), self.graphml_dir.glob("**/*.graph")):
             graph_file_tuple = self.get_graph_build_data(graph_file)
             graph_files[graph_file_tuple.git_hash[:7]] = graph_file_tuple
         return graph_files
@@ -28,7 +28,11 @@ These are used for attributing data across the build scripts and analyzer script
 """
 from enum import Enum, auto
 from pathlib import Path
+import array
 import json
+import mmap
+import struct
+import sys
 
 import networkx
 
@@ -171,8 +175,290 @@ class LibdepsGraph(networkx.DiGraph):
         return self._progressbar
 
 
+# Binary graph file layout, all sections are aligned to 8 bytes:
+#
+#   magic                 8 bytes
+#   header length         little endian uint32
+#   header                utf-8 json: graph attributes, counts, column schemas and
+#                         the (offset, length) of each section below
+#   string offsets        uint64[num_strings + 1], every string is stored once
+#   string data           utf-8 bytes
+#   node names            uint32[num_nodes] string ids
+#   edge sources/targets  uint32[num_edges] node indexes
+#   attribute columns     one array per node or edge attribute, with a uint8
+#                         presence mask since not every node or edge has every
+#                         attribute
+BINARY_GRAPH_MAGIC = b"LIBDEPSG"
+BINARY_GRAPH_FORMAT_VERSION = 1
+
+_COLUMN_TYPECODES = {
+    'bool': 'b',
+    'int': 'q',
+    'float': 'd',
+    'str': 'i',
+    'json': 'i',
+}
+
+
+def _get_column_type(values):
+    """Find the narrowest column type which can represent all the given attribute values."""
+
+    types = {type(value) for value in values}
+    for column_type, python_types in (('bool', {bool}), ('int', {int}), ('float', {float, int}),
+                                      ('str', {str})):
+        if types <= python_types:
+            return column_type
+    return 'json'
+
+
+class _StringTable:
+    """Intern strings so each distinct string is written once."""
+
+    def __init__(self):
+        """Create an empty string table."""
+        self.ids = {}
+        self.strings = []
+
+    def intern(self, value):
+        """Return the id of the given string."""
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+
+def _make_columns(items, string_table):
+    """Convert a list of attribute dicts to typed arrays, one per attribute."""
+
+    keys = sorted({key for attrs in items for key in attrs})
+    schema = []
+    sections = []
+    for key in keys:
+        values = [attrs.get(key) for attrs in items]
+        column_type = _get_column_type([value for value in values if value is not None])
+        data = array.array(_COLUMN_TYPECODES[column_type])
+        mask = array.array('B')
+        for value in values:
+            mask.append(value is not None)
+            if value is None:
+                data.append(-1 if column_type in ('str', 'json') else 0)
+            elif column_type == 'str':
+                data.append(string_table.intern(value))
+            elif column_type == 'json':
+                data.append(string_table.intern(json.dumps(value)))
+            else:
+                data.append(value)
+        schema.append({'name': key, 'type': column_type})
+        sections.append((data, mask))
+    return schema, sections
+
+
+def save_libdeps_graph(graph, graph_file):
+    """
+    Write a LibdepsGraph to the compact binary format read by load_libdeps_graph.
+
+    Node names and string attributes are interned, and edges and attributes are
+    stored as flat arrays so the file can be memory mapped and loaded without parsing.
+    """
+
+    string_table = _StringTable()
+    node_index = {}
+    node_names = array.array('I')
+    node_attrs = []
+    for node, attrs in graph.nodes(data=True):
+        node_index[node] = len(node_names)
+        node_names.append(string_table.intern(str(node)))
+        node_attrs.append(attrs)
+
+    edge_sources = array.array('I')
+    edge_targets = array.array('I')
+    edge_attrs = []
+    for from_node, to_node, attrs in graph.edges(data=True):
+        edge_sources.append(node_index[from_node])
+        edge_targets.append(node_index[to_node])
+        edge_attrs.append(attrs)
+
+    node_schema, node_columns = _make_columns(node_attrs, string_table)
+    edge_schema, edge_columns = _make_columns(edge_attrs, string_table)
+
+    encoded_strings = [string.encode('utf-8') for string in string_table.strings]
+    string_offsets = array.array('Q', [0])
+    for encoded in encoded_strings:
+        string_offsets.append(string_offsets[-1] + len(encoded))
+
+    sections = [
+        ('string_offsets', string_offsets),
+        ('string_data', b''.join(encoded_strings)),
+        ('node_names', node_names),
+        ('edge_sources', edge_sources),
+        ('edge_targets', edge_targets),
+    ]
+    for prefix, columns in (('node', node_columns), ('edge', edge_columns)):
+        for i, (data, mask) in enumerate(columns):
+            sections.append((f'{prefix}_column_{i}', data))
+            sections.append((f'{prefix}_mask_{i}', mask))
+
+    offsets = {}
+    position = 0
+    for name, data in sections:
+        length = len(memoryview(data).cast('B'))
+        offsets[name] = [position, length]
+        position += (length + 7) & ~7
+
+    header = json.dumps({
+        'format_version': BINARY_GRAPH_FORMAT_VERSION,
+        'byteorder': sys.byteorder,
+        'graph': dict(graph.graph),
+        'num_nodes': len(node_names),
+        'num_edges': len(edge_sources),
+        'num_strings': len(encoded_strings),
+        'node_columns': node_schema,
+        'edge_columns': edge_schema,
+        'sections': offsets,
+    }).encode('utf-8')
+    header += b' ' * (-(len(BINARY_GRAPH_MAGIC) + 4 + len(header)) % 8)
+
+    with open(graph_file, 'wb') as graph_fh:
+        graph_fh.write(BINARY_GRAPH_MAGIC)
+        graph_fh.write(struct.pack('<I', len(header)))
+        graph_fh.write(header)
+        for name, data in sections:
+            graph_fh.write(data)
+            graph_fh.write(b'\0' * (-offsets[name][1] % 8))
+
+
+def is_binary_libdeps_graph(graph_file):
+    """Check if the given file is in the binary graph format."""
+
+    with open(graph_file, 'rb') as graph_fh:
+        return graph_fh.read(len(BINARY_GRAPH_MAGIC)) == BINARY_GRAPH_MAGIC
+
+
+class BinaryLibdepsGraphFile:
+    """
+    Memory mapped view of a binary graph file.
+
+    Only the header is parsed when the file is opened, so the graph attributes
+    (build dir, git hash, schema version...) are cheap to read. The nodes and
+    edges are decoded when the file is converted with to_libdeps_graph().
+    """
+
+    def __init__(self, graph_file):
+        """Map the file and read its header."""
+
+        with open(graph_file, 'rb') as graph_fh:
+            self._mmap = mmap.mmap(graph_fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic_len = len(BINARY_GRAPH_MAGIC)
+        if self._mmap[:magic_len] != BINARY_GRAPH_MAGIC:
+            raise ValueError(f"'{graph_file}' is not a binary libdeps graph file.")
+        header_len, = struct.unpack_from('<I', self._mmap, magic_len)
+        self._data_start = magic_len + 4 + header_len
+        self.header = json.loads(self._mmap[magic_len + 4:self._data_start].decode('utf-8'))
+        if self.header['format_version'] != BINARY_GRAPH_FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary libdeps graph format version "
+                             f"{self.header['format_version']} in '{graph_file}'.")
+        self._strings = [None] * self.header['num_strings']
+
+    @property
+    def graph(self):
+        """Return the graph attributes."""
+        return self.header['graph']
+
+    def _section(self, name, typecode='B'):
+        offset, length = self.header['sections'][name]
+        start = self._data_start + offset
+        view = memoryview(self._mmap)[start:start + length]
+        if typecode == 'B':
+            return view
+        if self.header['byteorder'] == sys.byteorder:
+            return view.cast(typecode)
+        swapped = array.array(typecode, view)
+        swapped.byteswap()
+        return swapped
+
+    def _get_strings(self):
+        offsets = self._section('string_offsets', 'Q')
+        data = self._section('string_data')
+
+        def get_string(string_id):
+            string = self._strings[string_id]
+            if string is None:
+                string = self._strings[string_id] = str(
+                    data[offsets[string_id]:offsets[string_id + 1]], 'utf-8')
+            return string
+
+        return get_string
+
+    def _get_columns(self, prefix, get_string):
+        columns = []
+        for i, column in enumerate(self.header[f'{prefix}_columns']):
+            column_type = column['type']
+            data = self._section(f'{prefix}_column_{i}', _COLUMN_TYPECODES[column_type])
+            if column_type == 'str':
+                data = [get_string(value) if value >= 0 else None for value in data]
+            elif column_type == 'json':
+                data = [json.loads(get_string(value)) if value >= 0 else None for value in data]
+            elif column_type == 'bool':
+                data = [bool(value) for value in data]
+            else:
+                data = data.tolist()
+            columns.append((column['name'], data, self._section(f'{prefix}_mask_{i}')))
+        return columns
+
+    def to_libdeps_graph(self):
+        """Create a LibdepsGraph from the file contents."""
+
+        get_string = self._get_strings()
+        names = [get_string(string_id) for string_id in self._section('node_names', 'I')]
+
+        graph = LibdepsGraph()
+        graph.graph.update(self.graph)
+
+        node_attrs = [{} for _ in names]
+        for name, data, mask in self._get_columns('node', get_string):
+            for i, present in enumerate(mask):
+                if present:
+                    node_attrs[i][name] = data[i]
+        graph.add_nodes_from(zip(names, node_attrs))
+
+        edge_attrs = [{} for _ in range(self.header['num_edges'])]
+        for name, data, mask in self._get_columns('edge', get_string):
+            for i, present in enumerate(mask):
+                if present:
+                    edge_attrs[i][name] = data[i]
+        # The edges are known to be unique and between existing nodes, so the
+        # adjacency dicts are filled in directly rather than through add_edges_from(),
+        # which is the bulk of the load time for graphs with many transitive edges.
+        # pylint: disable=protected-access
+        successors = [graph._succ[name] for name in names]
+        predecessors = [graph._pred[name] for name in names]
+        sources = self._section('edge_sources', 'I')
+        targets = self._section('edge_targets', 'I')
+        for source, target, attrs in zip(sources, targets, edge_attrs):
+            successors[source][names[target]] = attrs
+            predecessors[target][names[source]] = attrs
+
+        return graph
+
+    def close(self):
+        """Unmap the file."""
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
 def load_libdeps_graph(graph_file):
-    """Load a graphml file and create a LibdepGraph."""
+    """Load a graphml or binary graph file and create a LibdepGraph."""
+
+    if is_binary_libdeps_graph(graph_file):
+        with BinaryLibdepsGraphFile(graph_file) as binary_graph:
+            return binary_graph.to_libdeps_graph()
 
     graph = networkx.read_graphml(graph_file)
     return LibdepsGraph(graph=graph)
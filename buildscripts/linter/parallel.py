@@ -1,19 +1,26 @@
 """Utility code to execute code in parallel."""
 
+import multiprocessing
 import queue
 import threading
 import time
 from multiprocessing import cpu_count
-from typing import Any, Callable, List
+from typing import Any, Callable, List, Tuple
+
+
+def _get_cpu_count():
+    # type: () -> int
+    """Return the number of CPUs, or 1 if it cannot be determined."""
+    try:
+        return cpu_count()
+    except NotImplementedError:
+        return 1
 
 
 def parallel_process(items, func):
     # type: (List[Any], Callable[[Any], bool]) -> bool
     """Run a set of work items to completion and wait."""
-    try:
-        cpus = cpu_count()
-    except NotImplementedError:
-        cpus = 1
+    cpus = _get_cpu_count()
 
     task_queue = queue.Queue()  # type: queue.Queue
 
@@ -69,3 +76,21 @@ def parallel_process(items, func):
         thread.join()
 
     return pp_result[0]
+
+
+def parallel_process_pool(items, func, initializer=None, initargs=()):
+    # type: (List[Any], Callable[[Any], Any], Callable[..., None], Tuple[Any, ...]) -> List[Any]
+    """Return the results of func for each work item, computed by a pool of worker processes.
+
+    Unlike parallel_process(), the work is not serialized by the GIL, so this suits CPU bound work
+    written in Python. func and the work items must be picklable. All the work items are processed.
+    """
+    cpus = _get_cpu_count()
+    if not items:
+        return []
+
+    # Hand out several work items at once to amortize the cost of passing them between processes.
+    chunksize = max(1, len(items) // (cpus * 8))
+    with multiprocessing.Pool(processes=cpus, initializer=initializer,
+                              initargs=initargs) as pool:
+        return pool.map(func, items, chunksize=chunksize)
@@ -15,6 +15,9 @@ mongosymb.py --symbolizer-path=/path/to/llvm-symbolizer /path/to/executable </fi
 
 You can also pass --output-format=json, to get rich json output. It shows some extra information,
 but emits json instead of plain text.
+
+Frames are resolved by a pool of llvm-symbolizer processes, and the results are cached on disk by
+build id in --symbol-cache-dir, so that symbolizing other traces from the same binaries is fast.
 """
 
 import json
@@ -22,6 +25,9 @@ import argparse
 import os
 import subprocess
 import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 
 def parse_input(trace_doc, dbg_path_resolver):
@@ -74,54 +80,240 @@ def symbolize_frames(trace_doc, dbg_path_resolver, symbolizer_path, dsym_hint, i
     if frames is None:
         frames = preprocess_frames(dbg_path_resolver, trace_doc, input_format)
 
-    if not symbolizer_path:
-        symbolizer_path = os.environ.get("MONGOSYMB_SYMBOLIZER_PATH", "llvm-symbolizer")
+    # Callers symbolizing many traces can pass in a Symbolizer to share its processes and cache.
+    symbolizer = kwargs.get("symbolizer")
+    if symbolizer is not None:
+        return symbolizer.symbolize(frames)
+
+    with make_symbolizer(symbolizer_path=symbolizer_path, dsym_hint=dsym_hint,
+                         **kwargs) as symbolizer:
+        return symbolizer.symbolize(frames)
+
+
+def make_symbolizer(symbolizer_path, dsym_hint, symbolizer_jobs=None, symbol_cache_dir=None,
+                    no_symbol_cache=False, **_):
+    """Return a Symbolizer configured from the command line options."""
+    cache = None
+    if not no_symbol_cache:
+        cache = SymbolCache(symbol_cache_dir or get_default_symbol_cache_dir())
+    return Symbolizer(symbolizer_path, dsym_hint, jobs=symbolizer_jobs, cache=cache)
+
+
+def get_default_symbol_cache_dir():
+    """Return the directory where symbolized addresses are cached by default."""
+    return os.environ.get("MONGOSYMB_CACHE_DIR",
+                          os.path.join(os.path.expanduser("~"), ".cache", "mongosymb"))
+
+
+def extract_symbols(stdout):
+    """Extract symbol information from the output of llvm-symbolizer.
+
+    Return a list of dictionaries, each of which has fn, file, column and line entries.
+
+    The format of llvm-symbolizer output is that for every CODE line of input,
+    it outputs zero or more pairs of lines, and then a blank line. This way, if
+    a CODE line of input maps to several inlined functions, you can use the blank
+    line to find the end of the list of symbols corresponding to the CODE line.
+
+    The first line of each pair contains the function name, and the second contains the file,
+    column and line information.
+    """
+    result = []
+    step = 0
+    while True:
+        line = stdout.readline().decode()
+        # An empty line means that llvm-symbolizer exited.
+        if line in ("\n", ""):
+            break
+        if step == 0:
+            result.append({"fn": line.strip()})
+            step = 1
+        else:
+            file_name, line, column = line.strip().rsplit(':', 3)
+            result[-1].update({"file": file_name, "column": int(column), "line": int(line)})
+            step = 0
+    return result
 
-    symbolizer_args = [symbolizer_path]
-    for dh in dsym_hint:
-        symbolizer_args.append("-dsym-hint={}".format(dh))
-    symbolizer_process = subprocess.Popen(args=symbolizer_args, close_fds=True,
-                                          stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-                                          stderr=open("/dev/null"))
 
-    def extract_symbols(stdin):
-        """Extract symbol information from the output of llvm-symbolizer.
+class SymbolizerProcess(object):
+    """A long-lived llvm-symbolizer process."""
 
-        Return a list of dictionaries, each of which has fn, file, column and line entries.
+    def __init__(self, symbolizer_args):
+        """Start llvm-symbolizer."""
+        self._process = subprocess.Popen(args=symbolizer_args, close_fds=True,
+                                         stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         stderr=subprocess.DEVNULL)
 
-        The format of llvm-symbolizer output is that for every CODE line of input,
-        it outputs zero or more pairs of lines, and then a blank line. This way, if
-        a CODE line of input maps to several inlined functions, you can use the blank
-        line to find the end of the list of symbols corresponding to the CODE line.
+    def resolve(self, requests):
+        """Return the symbol information of each (path, addr) pair of requests.
 
-        The first line of each pair contains the function name, and the second contains the file,
-        column and line information.
+        All the requests are written from another thread while the responses are read, so that
+        llvm-symbolizer never waits for the next request.
         """
-        result = []
-        step = 0
-        while True:
-            line = stdin.readline().decode()
-            if line == "\n":
-                break
-            if step == 0:
-                result.append({"fn": line.strip()})
-                step = 1
+
+        def write_requests():
+            try:
+                for path, addr in requests:
+                    self._process.stdin.write("CODE {} {}\n".format(path, addr).encode())
+                self._process.stdin.flush()
+            except BrokenPipeError:
+                pass
+
+        writer = threading.Thread(target=write_requests)
+        writer.start()
+        try:
+            return [extract_symbols(self._process.stdout) for _ in requests]
+        finally:
+            writer.join()
+
+    def close(self):
+        """Stop llvm-symbolizer."""
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._process.wait()
+
+
+class SymbolCache(object):
+    """On-disk cache of the symbol information of addresses, with one file per build id."""
+
+    def __init__(self, cache_dir):
+        """Initialize SymbolCache."""
+        self._cache_dir = cache_dir
+        self._entries = {}
+        self._dirty = set()
+
+    def _get_path(self, build_id):
+        return os.path.join(self._cache_dir, build_id + ".json")
+
+    def _load(self, build_id):
+        if build_id not in self._entries:
+            try:
+                with open(self._get_path(build_id)) as cache_file:
+                    self._entries[build_id] = json.load(cache_file)
+            except (OSError, ValueError):
+                self._entries[build_id] = {}
+        return self._entries[build_id]
+
+    def get(self, build_id, addr):
+        """Return the cached symbol information of an address, or None."""
+        return self._load(build_id).get(addr)
+
+    def put(self, build_id, addr, symbinfo):
+        """Cache the symbol information of an address."""
+        self._load(build_id)[addr] = symbinfo
+        self._dirty.add(build_id)
+
+    def save(self):
+        """Write the build ids that have new entries back to disk."""
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            for build_id in self._dirty:
+                # Write the file atomically, as buildscripts.util.fileops.write_file_atomically()
+                # does. mongosymb.py must stay importable without the buildscripts package: it is
+                # run as a standalone script, and mongosymb_multithread.py imports it as a
+                # top-level module.
+                (fd, temp_path) = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w") as cache_file:
+                        json.dump(self._entries[build_id], cache_file)
+                    os.replace(temp_path, self._get_path(build_id))
+                except BaseException:
+                    os.unlink(temp_path)
+                    raise
+        except OSError as err:
+            sys.stderr.write("Failed to write the symbol cache in {}: {}\n".format(
+                self._cache_dir, err))
+        self._dirty.clear()
+
+
+class Symbolizer(object):
+    """Symbolize frames with a pool of llvm-symbolizer processes.
+
+    Each distinct (path, addr) pair is only resolved once, and its symbol information is kept for
+    the lifetime of the Symbolizer and in the SymbolCache, if any.
+    """
+
+    # Don't start another llvm-symbolizer process for fewer addresses than this.
+    MIN_ADDRESSES_PER_PROCESS = 32
+
+    def __init__(self, symbolizer_path=None, dsym_hint=(), jobs=None, cache=None):
+        """Initialize Symbolizer."""
+        if not symbolizer_path:
+            symbolizer_path = os.environ.get("MONGOSYMB_SYMBOLIZER_PATH", "llvm-symbolizer")
+        self._symbolizer_args = [symbolizer_path]
+        for dh in dsym_hint:
+            self._symbolizer_args.append("-dsym-hint={}".format(dh))
+        self._jobs = jobs or min(8, os.cpu_count() or 1)
+        self._cache = cache
+        self._processes = []
+        self._resolved = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _get_processes(self, count):
+        while len(self._processes) < count:
+            self._processes.append(SymbolizerProcess(self._symbolizer_args))
+        return self._processes[:count]
+
+    def _resolve(self, requests):
+        """Resolve (path, addr) pairs, spreading them over the llvm-symbolizer processes."""
+        count = min(self._jobs, -(-len(requests) // self.MIN_ADDRESSES_PER_PROCESS))
+        processes = self._get_processes(count)
+        chunk_size = -(-len(requests) // count)
+        chunks = [requests[i:i + chunk_size] for i in range(0, len(requests), chunk_size)]
+
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            results = executor.map(lambda args: args[0].resolve(args[1]),
+                                   zip(processes, chunks))
+            for chunk, symbinfos in zip(chunks, results):
+                self._resolved.update(zip(chunk, symbinfos))
+
+    def symbolize(self, frames):
+        """Add the symbol information of frames as their "symbinfo" and return them."""
+        build_ids = {}
+        requests = []
+        for frame in frames:
+            if frame["path"] is None:
+                continue
+            key = (frame["path"], frame["addr"])
+            if key in self._resolved or key in build_ids:
+                continue
+            build_id = frame.get("buildId")
+            build_ids[key] = build_id
+            cached = self._cache.get(build_id, frame["addr"]) if self._cache and build_id else None
+            if cached is not None:
+                self._resolved[key] = cached
             else:
-                file_name, line, column = line.strip().rsplit(':', 3)
-                result[-1].update({"file": file_name, "column": int(column), "line": int(line)})
-                step = 0
-        return result
+                requests.append(key)
+
+        if requests:
+            self._resolve(requests)
+            if self._cache:
+                for key in requests:
+                    symbinfo = self._resolved[key]
+                    # Don't cache failures, the debug symbols may be found next time.
+                    if build_ids[key] and any(sframe["fn"] != "??" for sframe in symbinfo):
+                        self._cache.put(build_ids[key], key[1], symbinfo)
+                self._cache.save()
 
-    for frame in frames:
-        if frame["path"] is None:
-            continue
-        symbol_line = "CODE {path:} {addr:}\n".format(**frame)
-        symbolizer_process.stdin.write(symbol_line.encode())
-        symbolizer_process.stdin.flush()
-        frame["symbinfo"] = extract_symbols(symbolizer_process.stdout)
-    symbolizer_process.stdin.close()
-    symbolizer_process.wait()
-    return frames
+        for frame in frames:
+            if frame["path"] is not None:
+                frame["symbinfo"] = self._resolved[(frame["path"], frame["addr"])]
+        return frames
+
+    def close(self):
+        """Stop the llvm-symbolizer processes."""
+        for process in self._processes:
+            process.close()
+        self._processes = []
 
 
 def preprocess_frames(dbg_path_resolver, trace_doc, input_format):
@@ -215,6 +407,14 @@ def make_argument_parser(parser=None, **kwargs):
     parser.add_argument('--src-dir-to-move', action="store", type=str, default=None,
                         help="Specify a src dir to move to /data/mci/{original_buildid}/src")
 
+    parser.add_argument('--symbolizer-jobs', type=int, default=None,
+                        help="Maximum number of llvm-symbolizer processes to run at once")
+    parser.add_argument('--symbol-cache-dir', default=None,
+                        help="Directory where symbolized addresses are cached by build id, "
+                        "defaults to $MONGOSYMB_CACHE_DIR or ~/.cache/mongosymb")
+    parser.add_argument('--no-symbol-cache', action="store_true", default=False,
+                        help="Don't read or write the symbol cache")
+
     s3_group = parser.add_argument_group(
         "s3 options", description='Options used with \'--debug-file-resolver s3\'')
     s3_group.add_argument('--s3-cache-dir')
@@ -20,10 +20,26 @@ def main():
     parser = argparse.ArgumentParser(parents=[parent_parser], description=__doc__, add_help=True)
     options = parser.parse_args()
 
+    output_fn = None
+    if options.output_format == 'json':
+        output_fn = json.dump
+    if options.output_format == 'classic':
+        output_fn = mongosymb.classic_output
+
+    resolver = None
+    if options.debug_file_resolver == 'path':
+        resolver = mongosymb.PathDbgFileResolver(options.path_to_executable)
+    elif options.debug_file_resolver == 's3':
+        resolver = mongosymb.S3BuildidDbgFileResolver(options.s3_cache_dir, options.s3_bucket)
+
     # Remember the prologue between lines,
     # Prologue defines the library ids referred to by each record line.
     prologue = None
 
+    # Threads mostly share the same frames, so all of them are symbolized together once every
+    # record has been read.
+    thread_frames = []
+
     for line in sys.stdin:
         try:
             doc = json.JSONDecoder().raw_decode(line)[0]
@@ -42,27 +58,20 @@ def main():
                 thread_record = attr[record_field_name]
                 merged = {**thread_record, **prologue}
 
-                output_fn = None
-                if options.output_format == 'json':
-                    output_fn = json.dump
-                if options.output_format == 'classic':
-                    output_fn = mongosymb.classic_output
+                frames = mongosymb.preprocess_frames(resolver, merged, options.input_format)
+                thread_frames.append((thread_record, frames))
 
-                resolver = None
-                if options.debug_file_resolver == 'path':
-                    resolver = mongosymb.PathDbgFileResolver(options.path_to_executable)
-                elif options.debug_file_resolver == 's3':
-                    resolver = mongosymb.S3BuildidDbgFileResolver(options.s3_cache_dir,
-                                                                  options.s3_bucket)
+        except json.JSONDecodeError:
+            print("failed to parse line: `{}`".format(line), file=sys.stderr)
 
-                frames = mongosymb.symbolize_frames(merged, resolver, **vars(options))
-                print("\nthread {{name='{}', tid={}}}:".format(thread_record["name"],
-                                                               thread_record["tid"]))
+    with mongosymb.make_symbolizer(**vars(options)) as symbolizer:
+        symbolizer.symbolize([frame for _, frames in thread_frames for frame in frames])
 
-                output_fn(frames, sys.stdout, indent=2)
+    for thread_record, frames in thread_frames:
+        print("\nthread {{name='{}', tid={}}}:".format(thread_record["name"],
+                                                       thread_record["tid"]))
 
-        except json.JSONDecodeError:
-            print("failed to parse line: `{}`".format(line), file=sys.stderr)
+        output_fn(frames, sys.stdout, indent=2)
 
 
 if __name__ == '__main__':
@@ -1,13 +1,21 @@
 #!/usr/bin/env python3
-"""Extensible script to run one or more simple C++ Linters across a subset of files in parallel."""
+"""Extensible script to run one or more simple C++ Linters across a subset of files in parallel.
+
+Files are linted by a pool of processes. Files which passed are remembered in a cache keyed by their
+contents and the version of the linter, so that they are skipped by later runs.
+"""
 
 import argparse
+import contextlib
+import hashlib
+import io
+import json
 import logging
 import os
 import re
 import sys
 import threading
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 # Get relative imports to work when the package is not installed on the PYTHONPATH.
 if __name__ == "__main__" and __package__ is None:
@@ -16,9 +24,18 @@ if __name__ == "__main__" and __package__ is None:
 from buildscripts.linter import git  # pylint: disable=wrong-import-position
 from buildscripts.linter import parallel  # pylint: disable=wrong-import-position
 from buildscripts.linter import simplecpplint  # pylint: disable=wrong-import-position
+from buildscripts.util import fileops  # pylint: disable=wrong-import-position
 
 FILES_RE = re.compile('\\.(h|cpp)$')
 
+DEFAULT_CACHE_FILE = os.path.join("build", "quickcpplint_cache.json")
+
+# Path of the cache file, or None to lint every file.
+_cache_file = DEFAULT_CACHE_FILE  # type: Optional[str]
+
+# Content hashes of the files which passed the lint in a previous run, set in each worker process.
+_clean_files = {}  # type: Dict[str, str]
+
 
 def is_interesting_file(file_name: str) -> bool:
     """Return true if this file should be checked."""
@@ -29,10 +46,95 @@ def is_interesting_file(file_name: str) -> bool:
             and not file_name == "src/mongo/db/cst/parser_gen.cpp") and FILES_RE.search(file_name)
 
 
+def _get_linter_version() -> str:
+    """Return a hash of the linter sources so that the cache is invalidated when they change."""
+    hasher = hashlib.sha256()
+    with open(simplecpplint.__file__, "rb") as file_stream:
+        hasher.update(file_stream.read())
+    return hasher.hexdigest()
+
+
+def _read_cache(linter_version: str) -> Dict[str, str]:
+    """Return the content hash of each file which passed the lint, or {} if there is no cache."""
+    if not _cache_file:
+        return {}
+
+    try:
+        with open(_cache_file) as file_stream:
+            cache = json.load(file_stream)
+    except (OSError, ValueError):
+        return {}
+
+    if cache.get("linter_version") != linter_version:
+        return {}
+    return cache.get("files", {})
+
+
+def _write_cache(linter_version: str, clean_files: Dict[str, str]) -> None:
+    """Write the content hash of each file which passed the lint to the cache."""
+    if not _cache_file:
+        return
+
+    try:
+        fileops.write_file_atomically(
+            _cache_file, json.dumps({"linter_version": linter_version, "files": clean_files}))
+    except OSError as err:
+        logging.warning("Failed to write the lint cache '%s': %s", _cache_file, err)
+
+
+def _init_lint_worker(clean_files: Dict[str, str]) -> None:
+    """Initialize a lint worker process."""
+    global _clean_files  # pylint: disable=global-statement
+    _clean_files = clean_files
+
+
+def _lint_file(file_name: str) -> Tuple[str, str, int, str]:
+    """Lint a file unless it passed with the same contents before.
+
+    Return the file name, the hash of its contents, its error count and the linter output, which is
+    printed by the parent process to avoid interleaving the output of several files.
+    """
+    with open(file_name, "rb") as file_stream:
+        content_hash = hashlib.sha256(file_stream.read()).hexdigest()
+    if _clean_files.get(file_name) == content_hash:
+        return (file_name, content_hash, 0, "")
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            error_count = simplecpplint.lint_file(file_name)
+        except Exception as ex:  # pylint: disable=broad-except
+            print('Exception while checking file "{}": {}'.format(file_name, ex))
+            error_count = 1
+    return (file_name, content_hash, error_count, output.getvalue())
+
+
 def _lint_files(file_names: List[str]) -> None:
     """Lint a list of files with clang-format."""
-    run_lint1 = lambda param1: simplecpplint.lint_file(param1) == 0
-    if not parallel.parallel_process([os.path.abspath(f) for f in file_names], run_lint1):
+    linter_version = _get_linter_version()
+    clean_files = _read_cache(linter_version)
+
+    results = parallel.parallel_process_pool([os.path.abspath(f) for f in file_names], _lint_file,
+                                             initializer=_init_lint_worker,
+                                             initargs=(clean_files, ))
+
+    failed = False
+    num_cached = 0
+    for (file_name, content_hash, error_count, output) in results:
+        sys.stdout.write(output)
+        if error_count:
+            failed = True
+            clean_files.pop(file_name, None)
+        else:
+            if clean_files.get(file_name) == content_hash:
+                num_cached += 1
+            clean_files[file_name] = content_hash
+
+    logging.debug("Linted %d files, %d were unchanged since they last passed", len(results),
+                  num_cached)
+    _write_cache(linter_version, clean_files)
+
+    if failed:
         print("ERROR: Code Style does not match coding style")
         sys.exit(1)
 
@@ -77,6 +179,12 @@ def main() -> None:
     parser = argparse.ArgumentParser(description='Quick C++ Lint frontend.')
 
     parser.add_argument('-v', "--verbose", action='store_true', help="Enable verbose logging")
+    parser.add_argument(
+        "--cache-file", default=DEFAULT_CACHE_FILE,
+        help="File remembering the files which passed, so that they are skipped until they change."
+        " Defaults to %(default)s")
+    parser.add_argument("--no-cache", dest="cache_file", action="store_const", const=None,
+                        help="Lint every file, and don't read or write the cache file")
 
     sub = parser.add_subparsers(title="Linter subcommands", help="sub-command help")
 
@@ -102,6 +210,9 @@ def main() -> None:
     if args.verbose:
         logging.basicConfig(level=logging.DEBUG)
 
+    global _cache_file  # pylint: disable=global-statement
+    _cache_file = args.cache_file
+
     args.func(args.file_names)
 
 
@@ -104,11 +104,13 @@ DEFAULTS = {
     "suite_files": "with_server",
     "tag_files": [],
     "test_files": [],
+    "test_runtimes_file": None,
     "transport_layer": None,
     "user_friendly_output": None,
     "mixed_bin_versions": None,
     "old_bin_version": "last_continuous",
     "linear_chain": None,
+    "dbpath_templates": None,
     "num_replset_nodes": None,
     "num_shards": None,
     "export_mongod_config": "off",
@@ -482,6 +484,10 @@ EXPORT_MONGOD_CONFIG = None
 # If true, run ReplicaSetFixture with linear chaining.
 LINEAR_CHAIN = None
 
+# If true, ReplicaSetFixture snapshots the data files of its freshly initiated members and restarts
+# from a copy of them instead of initiating the replica set again.
+DBPATH_TEMPLATES = None
+
 # If set to "on", it enables flow control. If set to "off", it disables flow control. If left as
 # None, the server's default will determine whether flow control is enabled.
 FLOW_CONTROL = None
@@ -506,6 +512,10 @@ TAG_FILES = None
 # The test files to execute.
 TEST_FILES = None
 
+# If set, tests are queued longest-first according to the runtimes recorded in this JSON file, and
+# the file is updated with the runtimes of the tests that ran.
+TEST_RUNTIMES_FILE = None
+
 # If set, then mongod/mongos's started by resmoke.py will use the specified transport layer.
 TRANSPORT_LAYER = None
 
@@ -553,6 +563,10 @@ BENCHMARK_OUT_FORMAT = "json"
 # Default sort order for test execution. Will only be changed if --suites wasn't specified.
 ORDER_TESTS_BY_NAME = True
 
+# Index of the tags declared in JS test files, reused across invocations to speed up selection.
+# Set to None to always parse the tags from the test files.
+JSTEST_TAGS_CACHE_FILE = "build/resmoke_jstest_tags_cache.json"
+
 # Default file names for externally generated lists of tests created during the build.
 DEFAULT_BENCHMARK_TEST_LIST = "build/benchmarks.txt"
 DEFAULT_UNIT_TEST_LIST = "build/unittests.txt"
@@ -205,6 +205,7 @@ def _update_config_vars(values):  # pylint: disable=too-many-statements,too-many
     _config.GENNY_EXECUTABLE = _expand_user(config.pop("genny_executable"))
     _config.JOBS = config.pop("jobs")
     _config.LINEAR_CHAIN = config.pop("linear_chain") == "on"
+    _config.DBPATH_TEMPLATES = config.pop("dbpath_templates") == "on"
     _config.MAJORITY_READ_CONCERN = config.pop("majority_read_concern") == "on"
     _config.MIXED_BIN_VERSIONS = config.pop("mixed_bin_versions")
     if _config.MIXED_BIN_VERSIONS is not None:
@@ -287,6 +288,7 @@ def _update_config_vars(values):  # pylint: disable=too-many-statements,too-many
     if _config.SUITE_FILES is not None:
         _config.SUITE_FILES = _config.SUITE_FILES.split(",")
     _config.TAG_FILES = config.pop("tag_files")
+    _config.TEST_RUNTIMES_FILE = config.pop("test_runtimes_file")
     _config.TRANSPORT_LAYER = config.pop("transport_layer")
     _config.USER_FRIENDLY_OUTPUT = config.pop("user_friendly_output")
 
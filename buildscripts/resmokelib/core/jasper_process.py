@@ -83,6 +83,10 @@ class Process(_process.Process):
             raise OSError("Failed to signal Jasper process with pid {}: {}".format(
                 self.pid, val.text))
 
+    def subscribe_to_log(self, log_id):
+        """Return None since the output of the process is sent to jasper's loggers instead."""
+        return None
+
     def poll(self):
         """Poll."""
         if self._return_code is None:
@@ -5,9 +5,55 @@ Used to avoid deadlocks from the pipe buffer filling up and blocking the subproc
 being waited on.
 """
 
+import json
 import threading
 
 
+class LogEventSubscription(object):
+    """Notifies a waiting thread when a structured log line with a given id is read by a LoggerPipe.
+
+    Only lines in the JSON format of the MongoDB server's logs are matched.
+    """
+
+    def __init__(self, log_id):
+        """Initialize the LogEventSubscription to wait for the log line with the id 'log_id'."""
+        self.log_id = log_id
+        # The servers never put whitespace between a key and its value, so this rules out most lines
+        # without parsing them.
+        self._needle = '"id":{},'.format(log_id)
+        self._event = threading.Event()
+        self._entry = None
+
+    def matches(self, line):
+        """Return the parsed log entry if 'line' is the log line being waited for, else None."""
+        if self._needle not in line:
+            return None
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(entry, dict) or entry.get("id") != self.log_id:
+            return None
+        return entry
+
+    def notify(self, entry):
+        """Wake up the waiting threads with 'entry', which is None if the output ended instead."""
+        self._entry = entry
+        self._event.set()
+
+    def is_set(self):
+        """Return whether the log line was read or the output ended."""
+        return self._event.is_set()
+
+    def wait(self, timeout=None):
+        """Wait up to 'timeout' seconds for the log line.
+
+        Return the parsed log entry, or None if the timeout expired or the output ended first.
+        """
+        self._event.wait(timeout)
+        return self._entry
+
+
 class LoggerPipe(threading.Thread):  # pylint: disable=too-many-instance-attributes
     """Asynchronously reads the output of a subprocess and sends it to a logger."""
 
@@ -16,8 +62,12 @@ class LoggerPipe(threading.Thread):  # pylint: disable=too-many-instance-attribu
     __start = threading.Thread.start
     __join = threading.Thread.join
 
-    def __init__(self, logger, level, pipe_out):
-        """Initialize the LoggerPipe with the specified arguments."""
+    def __init__(self, logger, level, pipe_out, subscriptions=None):
+        """Initialize the LoggerPipe with the specified arguments.
+
+        The LogEventSubscription instances in 'subscriptions' are subscribed before any output is
+        read, so none of the log lines can be missed.
+        """
 
         threading.Thread.__init__(self)
         # Main thread should not call join() when exiting
@@ -32,6 +82,7 @@ class LoggerPipe(threading.Thread):  # pylint: disable=too-many-instance-attribu
 
         self.__started = False
         self.__finished = False
+        self.__subscriptions = list(subscriptions or [])
 
         LoggerPipe.__start(self)
 
@@ -62,9 +113,47 @@ class LoggerPipe(threading.Thread):  # pylint: disable=too-many-instance-attribu
                 line = line.decode("utf-8", "replace")
                 self.__logger.log(self.__level, line.rstrip())
 
+                if self.__subscriptions:
+                    self.__notify_subscriptions(line)
+
         with self.__lock:
             self.__finished = True
             self.__condition.notify_all()
+            subscriptions = self.__subscriptions
+            self.__subscriptions = []
+
+        for subscription in subscriptions:
+            subscription.notify(None)
+
+    def subscribe(self, subscription):
+        """Notify the LogEventSubscription 'subscription' of the next matching log line.
+
+        Lines which were read before this call are not matched.
+        """
+        with self.__lock:
+            if not self.__finished:
+                self.__subscriptions = self.__subscriptions + [subscription]
+                return
+
+        subscription.notify(None)
+
+    def __notify_subscriptions(self, line):
+        with self.__lock:
+            subscriptions = self.__subscriptions
+
+        matched = []
+        for subscription in subscriptions:
+            entry = subscription.matches(line)
+            if entry is not None:
+                subscription.notify(entry)
+                matched.append(subscription)
+
+        if matched:
+            with self.__lock:
+                self.__subscriptions = [
+                    subscription for subscription in self.__subscriptions
+                    if subscription not in matched
+                ]
 
     def join(self, timeout=None):
         """Join not implemented."""
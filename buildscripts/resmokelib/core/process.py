@@ -96,6 +96,7 @@ class Process(object):
         self._recorder = None
         self._stdout_pipe = None
         self._stderr_pipe = None
+        self._log_subscriptions = []
         self._cwd = cwd
 
     def start(self):
@@ -148,7 +149,8 @@ class Process(object):
                 self._recorder = subprocess.Popen(recorder_args, bufsize=buffer_size, env=self.env,
                                                   creationflags=creation_flags)
 
-        self._stdout_pipe = pipe.LoggerPipe(self.logger, logging.INFO, self._process.stdout)
+        self._stdout_pipe = pipe.LoggerPipe(self.logger, logging.INFO, self._process.stdout,
+                                            subscriptions=self._log_subscriptions)
         self._stderr_pipe = pipe.LoggerPipe(self.logger, logging.ERROR, self._process.stderr)
 
         self._stdout_pipe.wait_until_started()
@@ -234,6 +236,19 @@ class Process(object):
                 if err.errno != 3:
                     raise
 
+    def subscribe_to_log(self, log_id):
+        """Return a pipe.LogEventSubscription for the structured log line 'log_id' on stdout.
+
+        Call this before start() so that the log line can't be read before the subscription exists.
+        Return None if the output of the process isn't read by resmoke.
+        """
+        subscription = pipe.LogEventSubscription(log_id)
+        if self._stdout_pipe is None:
+            self._log_subscriptions.append(subscription)
+        else:
+            self._stdout_pipe.subscribe(subscription)
+        return subscription
+
     def poll(self):
         """Poll."""
         return self._process.poll()
@@ -5,6 +5,7 @@ import logging
 import os
 import sys
 import tempfile
+import threading
 from abc import ABCMeta, abstractmethod
 from collections import namedtuple
 from distutils import spawn  # pylint: disable=no-name-in-module
@@ -50,6 +51,20 @@ class Dumper(metaclass=ABCMeta):
         """Initialize dumper."""
         self._root_logger = root_logger
         self._dbg_output = dbg_output
+        self._loggers = {}
+        self._loggers_lock = threading.Lock()
+
+    def _get_process_logger(self, pname: str):
+        """
+        Return the logger shared by the debugger sessions of processes named pname.
+
+        Processes may be dumped concurrently, so the logger is only created once to avoid
+        truncating the log file of another session.
+        """
+        with self._loggers_lock:
+            if pname not in self._loggers:
+                self._loggers[pname] = _get_process_logger(self._dbg_output, pname)
+            return self._loggers[pname]
 
     @abstractmethod
     def dump_info(  # pylint: disable=too-many-arguments,too-many-locals
@@ -60,8 +75,10 @@ class Dumper(metaclass=ABCMeta):
         """
         Perform dump for a process.
 
+        The core dump, if any, is taken in the same debugger session as the info dump.
+
         :param pinfo: A Pinfo describing the process
-        :param take_dump: Whether to take a core dump
+        :param take_dump: Whether to also take a core dump
         """
         raise NotImplementedError("dump_info must be implemented in OS-specific subclasses")
 
@@ -90,7 +107,7 @@ class Dumper(metaclass=ABCMeta):
         Return the commands that attach to each process, dump info and detach.
 
         :param pinfo: A Pinfo describing the process
-        :param take_dump: Whether to take a core dump
+        :param take_dump: Whether to also take a core dump
         :param logger: Logger to output dump info to
         """
         raise NotImplementedError("_process_specific must be implemented in OS-specific subclasses")
@@ -144,6 +161,7 @@ class WindowsDumper(Dumper):
         """Return the commands that attach to each process, dump info and detach."""
         assert isinstance(pinfo.pidv, int)
 
+        cmds = []
         if take_dump:
             # Dump to file, dump_<process name>.<pid>.mdmp
             dump_file = "dump_%s.%d.%s" % (os.path.splitext(pinfo.name)[0], pinfo.pidv,
@@ -151,18 +169,15 @@ class WindowsDumper(Dumper):
             dump_command = ".dump /ma %s" % dump_file
             self._root_logger.info("Dumping core to %s", dump_file)
 
-            cmds = [
-                dump_command,
-                ".detach",  # Detach
-            ]
-        else:
-            cmds = [
-                "!peb",  # Dump current exe, & environment variables
-                "lm",  # Dump loaded modules
-                "!uniqstack -pn",  # Dump All unique Threads with function arguments
-                "!cs -l",  # Dump all locked critical sections
-                ".detach",  # Detach
-            ]
+            cmds += [dump_command]
+
+        cmds += [
+            "!peb",  # Dump current exe, & environment variables
+            "lm",  # Dump loaded modules
+            "!uniqstack -pn",  # Dump All unique Threads with function arguments
+            "!cs -l",  # Dump all locked critical sections
+            ".detach",  # Detach
+        ]
 
         return cmds
 
@@ -219,32 +234,25 @@ class LLDBDumper(Dumper):
     def _process_specific(self, pinfo, take_dump, logger=None):
         """Return the commands that attach to each process, dump info and detach."""
         cmds = []
+        dump_files = self._dump_files(pinfo)
 
-        if take_dump:
-            dump_files = self._dump_files(pinfo)
-            for pid in pinfo.pidv:
+        for pid in pinfo.pidv:
+            dump_commands = []
+            if take_dump:
                 # Dump to file, dump_<process name>.<pid>.core
                 dump_file = dump_files[pid]
-                dump_command = "process save-core %s" % dump_file
+                dump_commands = ["process save-core %s" % dump_file]
                 self._root_logger.info("Dumping core to %s", dump_file)
 
-                cmds += [
-                    "platform shell kill -CONT %d" % pid,
-                    "attach -p %d" % pid,
-                    dump_command,
-                    "process detach",
-                    "platform shell kill -STOP %d" % pid,
-                ]
-        else:
-            for pid in pinfo.pidv:
-                cmds += [
-                    "platform shell kill -CONT %d" % pid,
-                    "attach -p %d" % pid,
-                    "target modules list",
-                    "thread backtrace all",
-                    "process detach",
-                    "platform shell kill -STOP %d" % pid,
-                ]
+            cmds += [
+                "platform shell kill -CONT %d" % pid,
+                "attach -p %d" % pid,
+            ] + dump_commands + [
+                "target modules list",
+                "thread backtrace all",
+                "process detach",
+                "platform shell kill -STOP %d" % pid,
+            ]
 
         return cmds
 
@@ -261,7 +269,7 @@ class LLDBDumper(Dumper):
         """Dump info."""
         debugger = "lldb"
         dbg = self._find_debugger(debugger)
-        logger = _get_process_logger(self._dbg_output, pinfo.name)
+        logger = self._get_process_logger(pinfo.name)
 
         if dbg is None:
             self._root_logger.warning("Debugger %s not found, skipping dumping of %s", debugger,
@@ -362,73 +370,71 @@ class GDBDumper(Dumper):
         """Return the commands that attach to each process, dump info and detach."""
         cmds = []
 
-        if take_dump:
-            for pid in pinfo.pidv:
+        mongodb_dump_locks = "mongodb-dump-locks"
+        mongodb_show_locks = "mongodb-show-locks"
+        mongodb_uniqstack = "mongodb-uniqstack mongodb-bt-if-active"
+        mongodb_javascript_stack = "mongodb-javascript-stack"
+        mongod_dump_sessions = "mongod-dump-sessions"
+        mongodb_dump_mutexes = "mongodb-dump-mutexes"
+        mongodb_dump_recovery_units = "mongodb-dump-recovery-units"
+
+        for pid in pinfo.pidv:
+            if not logger.mongo_process_filename:
+                set_logging_on_commands = []
+                set_logging_off_commands = []
+                raw_stacks_commands = []
+            else:
+                base, ext = os.path.splitext(logger.mongo_process_filename)
+                set_logging_on_commands = [
+                    'set logging file %s_%d%s' % (base, pid, ext), 'set logging on'
+                ]
+                set_logging_off_commands = ['set logging off']
+                raw_stacks_filename = "%s_%d_raw_stacks%s" % (base, pid, ext)
+                raw_stacks_commands = [
+                    'echo \\nWriting raw stacks to %s.\\n' % raw_stacks_filename,
+                    # This sends output to log file rather than stdout until we turn logging off.
+                    'set logging redirect on',
+                    'set logging file ' + raw_stacks_filename,
+                    'set logging on',
+                    'thread apply all bt',
+                    'set logging off',
+                    'set logging redirect off',
+                ]
+
+            dump_commands = []
+            if take_dump:
                 # Dump to file, dump_<process name>.<pid>.core
                 dump_file = "dump_%s.%d.%s" % (pinfo.name, pid, self.get_dump_ext())
-                dump_command = "gcore %s" % dump_file
                 self._root_logger.info("Dumping core to %s", dump_file)
-                cmds += [
-                    "attach %d" % pid,
-                    "handle SIGSTOP ignore noprint",
+                dump_commands = [
                     # Lock the scheduler, before running commands, which execute code in the attached process.
                     "set scheduler-locking on",
-                    dump_command,
-                    "detach",
+                    "gcore %s" % dump_file,
+                    "set scheduler-locking off",
                 ]
-        else:
-            mongodb_dump_locks = "mongodb-dump-locks"
-            mongodb_show_locks = "mongodb-show-locks"
-            mongodb_uniqstack = "mongodb-uniqstack mongodb-bt-if-active"
-            mongodb_javascript_stack = "mongodb-javascript-stack"
-            mongod_dump_sessions = "mongod-dump-sessions"
-            mongodb_dump_mutexes = "mongodb-dump-mutexes"
-            mongodb_dump_recovery_units = "mongodb-dump-recovery-units"
-
-            for pid in pinfo.pidv:
-                if not logger.mongo_process_filename:
-                    set_logging_on_commands = []
-                    set_logging_off_commands = []
-                    raw_stacks_commands = []
-                else:
-                    base, ext = os.path.splitext(logger.mongo_process_filename)
-                    set_logging_on_commands = [
-                        'set logging file %s_%d%s' % (base, pid, ext), 'set logging on'
-                    ]
-                    set_logging_off_commands = ['set logging off']
-                    raw_stacks_filename = "%s_%d_raw_stacks%s" % (base, pid, ext)
-                    raw_stacks_commands = [
-                        'echo \\nWriting raw stacks to %s.\\n' % raw_stacks_filename,
-                        # This sends output to log file rather than stdout until we turn logging off.
-                        'set logging redirect on',
-                        'set logging file ' + raw_stacks_filename,
-                        'set logging on',
-                        'thread apply all bt',
-                        'set logging off',
-                        'set logging redirect off',
-                    ]
-
-                mongodb_waitsfor_graph = "mongodb-waitsfor-graph debugger_waitsfor_%s_%d.gv" % \
-                    (pinfo.name, pid)
-
-                cmds += set_logging_on_commands + [
-                    "attach %d" % pid,
-                    "handle SIGSTOP ignore noprint",
-                    "info sharedlibrary",
-                    "info threads",  # Dump a simple list of commands to get the thread name
-                ] + set_logging_off_commands + raw_stacks_commands + set_logging_on_commands + [
-                    mongodb_uniqstack,
-                    # Lock the scheduler, before running commands, which execute code in the attached process.
-                    "set scheduler-locking on",
-                    mongodb_dump_locks,
-                    mongodb_show_locks,
-                    mongodb_waitsfor_graph,
-                    mongodb_javascript_stack,
-                    mongod_dump_sessions,
-                    mongodb_dump_mutexes,
-                    mongodb_dump_recovery_units,
-                    "detach",
-                ] + set_logging_off_commands
+
+            mongodb_waitsfor_graph = "mongodb-waitsfor-graph debugger_waitsfor_%s_%d.gv" % \
+                (pinfo.name, pid)
+
+            cmds += set_logging_on_commands + [
+                "attach %d" % pid,
+                "handle SIGSTOP ignore noprint",
+            ] + dump_commands + [
+                "info sharedlibrary",
+                "info threads",  # Dump a simple list of commands to get the thread name
+            ] + set_logging_off_commands + raw_stacks_commands + set_logging_on_commands + [
+                mongodb_uniqstack,
+                # Lock the scheduler, before running commands, which execute code in the attached process.
+                "set scheduler-locking on",
+                mongodb_dump_locks,
+                mongodb_show_locks,
+                mongodb_waitsfor_graph,
+                mongodb_javascript_stack,
+                mongod_dump_sessions,
+                mongodb_dump_mutexes,
+                mongodb_dump_recovery_units,
+                "detach",
+            ] + set_logging_off_commands
 
         return cmds
 
@@ -441,7 +447,7 @@ class GDBDumper(Dumper):
         """Dump info."""
         debugger = "gdb"
         dbg = self._find_debugger(debugger)
-        logger = _get_process_logger(self._dbg_output, pinfo.name)
+        logger = self._get_process_logger(pinfo.name)
 
         if dbg is None:
             self._root_logger.warning("Debugger %s not found, skipping dumping of %s", debugger,
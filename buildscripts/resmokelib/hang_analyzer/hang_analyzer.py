@@ -5,6 +5,7 @@ A prototype hang analyzer for Evergreen integration to help investigate test tim
 1. Script supports taking dumps, and/or dumping a summary of useful information about a process
 2. Script will iterate through a list of interesting processes,
     and run the tools from step 1. The list of processes can be provided as an option.
+    Up to --jobs processes are analyzed concurrently.
 3. Java processes will be dumped using jstack, if available.
 
 Supports Linux, MacOS X, and Windows.
@@ -15,8 +16,11 @@ import platform
 import re
 import signal
 import sys
+import threading
+import time
 import traceback
 import getpass
+from concurrent.futures import ThreadPoolExecutor
 
 import psutil
 import distro
@@ -54,6 +58,10 @@ class HangAnalyzer(Subcommand):
         self.go_processes = []
         self.process_ids = []
 
+        # Bytes that core dumps in progress are expected to write, see _check_enough_free_space().
+        self._reserved_dump_bytes = 0
+        self._reserved_dump_bytes_lock = threading.Lock()
+
         def configure_task_id():
             run_tid = resmoke_config.EVERGREEN_TASK_ID
             hang_analyzer_tid = task_id
@@ -111,39 +119,31 @@ class HangAnalyzer(Subcommand):
         trapped_exceptions = []
 
         dump_pids = {}
-        # Dump core files of all processes, except python & java.
-        if self.options.dump_core:
-            for pinfo in [
-                    pinfo for pinfo in processes if not re.match("^(java|python)", pinfo.name)
-            ]:
-                if self._check_enough_free_space():
-                    try:
-                        dumpers.dbg.dump_info(pinfo, take_dump=True)
-                    except dumper.DumpError as err:
-                        self.root_logger.error(err.message)
-                        dump_pids = {**err.dump_pids, **dump_pids}
-                    except Exception as err:  # pylint: disable=broad-except
-                        self.root_logger.info("Error encountered when invoking debugger %s", err)
-                    trapped_exceptions.append(traceback.format_exc())
-                else:
-                    self.root_logger.info(
-                        "Not enough space for a core dump, skipping %s processes with PIDs %s",
-                        pinfo.name, str(pinfo.pidv))
-
-        # Dump info of all processes, except python & java.
-        for pinfo in [pinfo for pinfo in processes if not re.match("^(java|python)", pinfo.name)]:
-            try:
-                dumpers.dbg.dump_info(pinfo, take_dump=False)
-            except Exception as err:  # pylint: disable=broad-except
-                self.root_logger.info("Error encountered when invoking debugger %s", err)
-                trapped_exceptions.append(traceback.format_exc())
+        # Dump info, and core files if requested, of all processes, except python & java. Each
+        # process is dumped in a single debugger session and up to --jobs sessions run at once.
+        dbg_processes = [
+            process_list.Pinfo(name=pinfo.name, pidv=[pid])
+            for pinfo in processes if not re.match("^(java|python)", pinfo.name)
+            for pid in pinfo.pidv
+        ]
+        with ThreadPoolExecutor(max_workers=self.options.jobs) as executor:
+            results = list(
+                executor.map(lambda pinfo: self._dump_process(dumpers.dbg, pinfo),
+                             dbg_processes))
+
+        for (pinfo, (elapsed, failed_dump_pids, exception)) in zip(dbg_processes, results):
+            self.root_logger.info("Analyzed %s process with PID %d in %0.2f seconds", pinfo.name,
+                                  pinfo.pidv[0], elapsed)
+            dump_pids = {**failed_dump_pids, **dump_pids}
+            if exception is not None:
+                trapped_exceptions.append(exception)
 
         # Dump java processes using jstack.
         for pinfo in [pinfo for pinfo in processes if pinfo.name.startswith("java")]:
             for pid in pinfo.pidv:
                 try:
                     dumpers.jstack.dump_info(self.root_logger, self.options.debugger_output,
-                                             pinfo.name, pid)
+                                             pid=pid, process_name=pinfo.name)
                 except Exception as err:  # pylint: disable=broad-except
                     self.root_logger.info("Error encountered when invoking debugger %s", err)
                     trapped_exceptions.append(traceback.format_exc())
@@ -175,6 +175,56 @@ class HangAnalyzer(Subcommand):
             raise RuntimeError(
                 "Exceptions were thrown while dumping. There may still be some valid dumps.")
 
+    def _dump_process(self, dbg, pinfo):
+        """
+        Dump info, and a core file if requested and there is enough free space, of a process.
+
+        :param dbg: The debugger dumper
+        :param pinfo: A Pinfo describing a single process
+        :return: A tuple of the seconds spent, the dict of PIDs whose core dump failed and the
+            formatted exception raised by the debugger, if any
+        """
+        start_time = time.time()
+        failed_dump_pids = {}
+        exception = None
+
+        take_dump = False
+        reserved_bytes = 0
+        if self.options.dump_core:
+            reserved_bytes = self._get_dump_size(pinfo)
+            take_dump = self._check_enough_free_space(reserved_bytes)
+            if not take_dump:
+                self.root_logger.info(
+                    "Not enough space for a core dump, skipping %s processes with PIDs %s",
+                    pinfo.name, str(pinfo.pidv))
+
+        try:
+            dbg.dump_info(pinfo, take_dump=take_dump)
+        except dumper.DumpError as err:
+            self.root_logger.error(err.message)
+            failed_dump_pids = err.dump_pids
+            exception = traceback.format_exc()
+        except Exception as err:  # pylint: disable=broad-except
+            self.root_logger.info("Error encountered when invoking debugger %s", err)
+            exception = traceback.format_exc()
+        finally:
+            if take_dump:
+                with self._reserved_dump_bytes_lock:
+                    self._reserved_dump_bytes -= reserved_bytes
+
+        return (time.time() - start_time, failed_dump_pids, exception)
+
+    @staticmethod
+    def _get_dump_size(pinfo):
+        """Return an estimate of the size of the core dumps of the processes in pinfo."""
+        size = 0
+        for pid in pinfo.pidv:
+            try:
+                size += psutil.Process(pid).memory_info().rss
+            except psutil.Error:
+                pass
+        return size
+
     def _configure_processes(self):
         if self.options.debugger_output is None:
             self.options.debugger_output = ['stdout']
@@ -222,10 +272,23 @@ class HangAnalyzer(Subcommand):
             self.root_logger.warning(
                 "Cannot determine Unix Current Login, not supported on Windows")
 
-    def _check_enough_free_space(self):
-        usage_percent = psutil.disk_usage(".").percent
-        self.root_logger.info("Current disk usage percent: %s", usage_percent)
-        return usage_percent < self.options.max_disk_usage_percent
+    def _check_enough_free_space(self, reserved_bytes=0):
+        """
+        Return whether a core dump of reserved_bytes fits below --max-disk-usage-percent.
+
+        The space is reserved until the dump completes so that the core dumps which are taken
+        concurrently are accounted for.
+        """
+        with self._reserved_dump_bytes_lock:
+            usage = psutil.disk_usage(".")
+            usage_percent = usage.percent
+            self.root_logger.info("Current disk usage percent: %s", usage_percent)
+            expected_percent = usage_percent + (100.0 * (self._reserved_dump_bytes + reserved_bytes)
+                                                / (usage.used + usage.free))
+            if expected_percent >= float(self.options.max_disk_usage_percent):
+                return False
+            self._reserved_dump_bytes += reserved_bytes
+            return True
 
 
 class HangAnalyzerPlugin(PluginInterface):
@@ -260,6 +323,11 @@ class HangAnalyzerPlugin(PluginInterface):
                             default=False, help='Dump core file for each analyzed process')
         parser.add_argument('-s', '--max-disk-usage-percent', dest='max_disk_usage_percent',
                             default=90, help='Maximum disk usage percent for a core dump')
+        parser.add_argument(
+            '-j', '--jobs', dest='jobs', type=int, default=1,
+            help='Maximum number of processes to attach a debugger to at once. Core dumps are only'
+            ' started while the expected disk usage, including the core dumps in progress, stays'
+            ' below --max-disk-usage-percent. Default is 1.')
         parser.add_argument(
             '-o', '--debugger-output', dest='debugger_output', action="append", choices=('file',
                                                                                          'stdout'),
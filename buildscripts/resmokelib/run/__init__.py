@@ -32,6 +32,7 @@ from buildscripts.resmokelib import reportfile
 from buildscripts.resmokelib import sighandler
 from buildscripts.resmokelib import suitesconfig
 from buildscripts.resmokelib import testing
+from buildscripts.resmokelib import testruntimes
 from buildscripts.resmokelib import utils
 from buildscripts.resmokelib.core import process
 from buildscripts.resmokelib.core import jasper_process
@@ -267,6 +268,7 @@ class TestRunner(Subcommand):  # pylint: disable=too-many-instance-attributes
             self._exit_archival()
             if suites:
                 reportfile.write(suites)
+                testruntimes.write(suites)
 
     def _run_suite(self, suite):
         """Run a test suite."""
@@ -791,6 +793,13 @@ class RunPlugin(PluginInterface):
                   " Defaults to auto when not supplied. auto enables randomization in"
                   " all cases except when the number of jobs requested is 1."))
 
+        parser.add_argument(
+            "--testRuntimesFile", dest="test_runtimes_file", metavar="RUNTIMES",
+            help=("Runs the longest tests first according to the runtimes recorded in the JSON file"
+                  " RUNTIMES, so that a long test does not keep one job busy after the others"
+                  " finished. Tests without a recorded runtime are treated as average. The file is"
+                  " created or updated with the runtimes of the tests that were run."))
+
         parser.add_argument(
             "--executor", dest="executor_file",
             help="OBSOLETE: Superceded by --suites; specify --suites=SUITE path/to/test"
@@ -814,6 +823,13 @@ class RunPlugin(PluginInterface):
             metavar="ON|OFF", help="Enable or disable linear chaining for tests using "
             "ReplicaSetFixture.")
 
+        parser.add_argument(
+            "--dbpathTemplates", action="store", dest="dbpath_templates", choices=("on", "off"),
+            metavar="ON|OFF", help="Enable or disable restarting ReplicaSetFixture members from"
+            " a snapshot of their data files taken right after the replica set was first"
+            " initiated, instead of initiating the replica set again. Has no effect when the"
+            " dbpath is preserved.")
+
         parser.add_argument(
             "--backupOnRestartDir", action="store", type=str, dest="backup_on_restart_dir",
             metavar="DIRECTORY", help=
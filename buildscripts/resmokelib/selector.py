@@ -30,6 +30,15 @@ class TestFileExplorer(object):
     The file related code has been confined to this class for testability.
     """
 
+    def __init__(self):
+        """Initialize the TestFileExplorer."""
+        self._jstest_tags_cache = None
+
+    def _get_jstest_tags_cache(self):
+        if self._jstest_tags_cache is None:
+            self._jstest_tags_cache = jscomment.TagsCache(config.JSTEST_TAGS_CACHE_FILE)
+        return self._jstest_tags_cache
+
     @staticmethod
     def is_glob_pattern(path):
         """Indicate if the provided path is a glob pattern.
@@ -48,15 +57,21 @@ class TestFileExplorer(object):
         """
         return globstar.iglob(pattern)
 
-    @staticmethod
-    def jstest_tags(file_path):  # noqa: D406,D407,D411,D413
+    def jstest_tags(self, file_path):  # noqa: D406,D407,D411,D413
         """Extract the tags from a JavaScript test file.
 
         See buildscripts.resmokelib.utils.jscomment.get_tags().
         Returns:
             A list of tags.
         """
-        return jscomment.get_tags(file_path)
+        return self._get_jstest_tags_cache().get_tags(file_path)
+
+    def prefetch_jstest_tags(self, file_paths):
+        """Extract the tags from many JavaScript test files ahead of calls to jstest_tags().
+
+        Files not found in the on-disk tags index are parsed concurrently.
+        """
+        self._get_jstest_tags_cache().prefetch(file_paths)
 
     @staticmethod
     def read_root_file(root_file_path):  # noqa: D406,D407,D411,D413
@@ -226,6 +241,10 @@ class _TestList(object):
         """
         self._filtered = {test for test in self._filtered if tag_expression(get_tags(test))}
 
+    def get_filtered_tests(self):
+        """Return the set of tests which have not been filtered out so far."""
+        return set(self._filtered)
+
     def include_any_pattern(self, patterns):
         """Filter the test list to only include tests that match any provided glob patterns."""
 
@@ -448,6 +467,7 @@ class _Selector(object):
             test_list.exclude_files(selector_config.exclude_files)
         # 4. Apply the tag filters.
         if selector_config.tags_expression:
+            self.prefetch_tags(test_list.get_filtered_tests())
             test_list.match_tag_expression(selector_config.tags_expression, self.get_tags)
         # 5. Apply the include files last with force=True to take precedence over the tags.
         if self._tests_are_files and selector_config.include_files:
@@ -462,6 +482,10 @@ class _Selector(object):
             return sorted(tests, key=str.lower), sorted(excluded, key=str.lower)
         return tests, excluded
 
+    def prefetch_tags(self, test_files):
+        """Prepare for retrieving the tags of many test files, no-op by default."""
+        pass
+
     @staticmethod
     def get_tags(test_file):  # pylint: disable=unused-argument
         """Retrieve the tags associated with the give test file."""
@@ -493,6 +517,10 @@ class _JSTestSelector(_Selector):
                                                               self._tags)
         return _Selector.select(self, selector_config)
 
+    def prefetch_tags(self, test_files):
+        """Extract the tags of all the test files at once."""
+        self._test_file_explorer.prefetch_jstest_tags(test_files)
+
     def get_tags(self, test_file):
         """Return tags from test_file."""
         file_tags = self._test_file_explorer.jstest_tags(test_file)
@@ -21,6 +21,9 @@ if _IS_WINDOWS:
     import win32api
     import win32event
 
+# Maximum number of fixture processes the hang analyzer attaches a debugger to at once.
+_HANG_ANALYZER_JOBS = min(4, os.cpu_count() or 1)
+
 
 def register(logger, suites, start_time):
     """Register an event object to wait for signal, or a signal handler for SIGUSR1."""
@@ -153,7 +156,8 @@ def _analyze_pids(logger, pids):
         return
 
     hang_analyzer_args = [
-        'hang-analyzer', '-o', 'file', '-o', 'stdout', '-k', '-d', ','.join([str(p) for p in pids])
+        'hang-analyzer', '-o', 'file', '-o', 'stdout', '-k', '-d', ','.join([str(p) for p in pids]),
+        '-j', str(_HANG_ANALYZER_JOBS)
     ]
 
     if not os.getenv('ASAN_OPTIONS'):
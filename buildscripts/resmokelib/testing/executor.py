@@ -6,6 +6,7 @@ import time
 from buildscripts.resmokelib import config as _config
 from buildscripts.resmokelib import errors
 from buildscripts.resmokelib import logging
+from buildscripts.resmokelib import testruntimes
 from buildscripts.resmokelib import utils
 from buildscripts.resmokelib.core import network
 from buildscripts.resmokelib.testing import fixtures
@@ -313,13 +314,22 @@ class TestSuiteExecutor(object):  # pylint: disable=too-many-instance-attributes
         Use a multi-consumer queue instead of a unittest.TestSuite so that the test cases can
         be dispatched to multiple threads.
 
+        If a test runtimes file was specified, the longest tests are queued first so that the jobs
+        finish at roughly the same time.
+
         :return: Queue of testcases to run.
         """
         queue = Queue()
 
+        tests = self._suite.tests
+        if _config.TEST_RUNTIMES_FILE is not None:
+            self.logger.info("Ordering %ss longest-first using the runtimes in %s",
+                             self._suite.test_kind, _config.TEST_RUNTIMES_FILE)
+            tests = testruntimes.order_longest_first(tests, testruntimes.read())
+
         # Put all the test cases in a queue.
         for _ in range(self._num_times_to_repeat_tests()):
-            for test_name in self._suite.tests:
+            for test_name in tests:
                 queue_elem = self._create_queue_elem_for_test_name(test_name)
                 queue.put(queue_elem)
 
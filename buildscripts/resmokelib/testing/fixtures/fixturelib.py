@@ -6,6 +6,7 @@ from buildscripts.resmokelib import errors
 from buildscripts.resmokelib import utils
 from buildscripts.resmokelib import logging
 from buildscripts.resmokelib.core import network
+from buildscripts.resmokelib.utils import filesystem
 from buildscripts.resmokelib.utils.history import make_historic as _make_historic
 from buildscripts.resmokelib.testing.fixtures import _builder
 from buildscripts.resmokelib.multiversionconstants import LAST_LTS_MONGOD_BINARY, LAST_LTS_MONGOS_BINARY, LAST_CONTINUOUS_MONGOD_BINARY, LAST_CONTINUOUS_MONGOS_BINARY
@@ -95,6 +96,10 @@ class FixtureLib(object):
         """Return the next available port that fixture can use."""
         return network.PortAllocator.next_fixture_port(job_num)
 
+    def clone_directory(self, source, dest, ignore_patterns=()):
+        """Copy the 'source' directory to 'dest', cloning files where the filesystem allows it."""
+        filesystem.clone_directory(source, dest, ignore_patterns=ignore_patterns)
+
 
 class _FixtureConfig(object):  # pylint: disable=too-many-instance-attributes
     """Class that stores fixture configuration info."""
@@ -125,6 +130,7 @@ class _FixtureConfig(object):  # pylint: disable=too-many-instance-attributes
         self.WT_INDEX_CONFIG = config.WT_INDEX_CONFIG
         self.MIXED_BIN_VERSIONS = config.MIXED_BIN_VERSIONS
         self.LINEAR_CHAIN = config.LINEAR_CHAIN
+        self.DBPATH_TEMPLATES = config.DBPATH_TEMPLATES
         self.NUM_REPLSET_NODES = config.NUM_REPLSET_NODES
         self.NUM_SHARDS = config.NUM_SHARDS
         self.DEFAULT_MONGOS_EXECUTABLE = config.DEFAULT_MONGOS_EXECUTABLE
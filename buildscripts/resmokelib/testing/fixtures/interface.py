@@ -1,6 +1,9 @@
 """Interface of the different fixtures for executing JSTests against."""
 
+import concurrent.futures
+import contextlib
 import os.path
+import threading
 import time
 from enum import Enum
 from collections import namedtuple
@@ -37,7 +40,7 @@ class APIVersion(object, metaclass=registry.make_registry_metaclass(_VERSIONS)):
 
     REGISTERED_NAME = "APIVersion"
 
-    FIXTURE_API_VERSION = "0.1.0"
+    FIXTURE_API_VERSION = "0.4.0"
 
     @classmethod
     def check_api_version(cls, actual):
@@ -78,6 +81,12 @@ class Fixture(object, metaclass=registry.make_registry_metaclass(_FIXTURES)):  #
 
     AWAIT_READY_TIMEOUT_SECS = 300
 
+    # The id of the "Waiting for connections" log line of mongod and mongos.
+    _WAITING_FOR_CONNECTIONS_LOG_ID = 23016
+    # How long await_ready() waits for that log line before trying to connect anyway, in case the
+    # log line was missed.
+    _READY_LOG_PROBE_INTERVAL_SECS = 1
+
     def __init__(self, logger, job_num, fixturelib, dbpath_prefix=None):
         """Initialize the fixture with a logger instance."""
 
@@ -140,6 +149,15 @@ class Fixture(object, metaclass=registry.make_registry_metaclass(_FIXTURES)):  #
         """
         pass
 
+    def _subscribe_to_ready_log(self, process, options):  # pylint: disable=no-self-use
+        """Return a subscription to the log line of 'process' saying it is accepting connections.
+
+        Return None if the log line can't be observed, e.g. because the process logs to a file.
+        """
+        if "logpath" in options or "syslog" in options:
+            return None
+        return process.subscribe_to_log(Fixture._WAITING_FOR_CONNECTIONS_LOG_ID)
+
     def is_running(self):  # pylint: disable=no-self-use
         """Return true if the fixture is still operating and more tests and can be run."""
         return True
@@ -289,6 +307,8 @@ class FixtureTeardownHandler(object):
         self._logger = logger
         self._success = True
         self._message = None
+        # Fixtures may tear down several of their nodes concurrently with the same handler.
+        self._lock = threading.Lock()
 
     def was_successful(self):
         """Indicate whether the teardowns performed by this instance were all successful."""
@@ -318,8 +338,9 @@ class FixtureTeardownHandler(object):
         except fixture.fixturelib.ServerFailure as err:
             msg = "Error while stopping {}: {}".format(name, err)
             self._logger.warning(msg)
-            self._add_error_message(msg)
-            self._success = False
+            with self._lock:
+                self._add_error_message(msg)
+                self._success = False
             return False
 
     def _add_error_message(self, message):
@@ -329,6 +350,56 @@ class FixtureTeardownHandler(object):
             self._message = "{} - {}".format(self._message, message)
 
 
+def run_concurrently(funcs):
+    """Call each of the functions in 'funcs' on its own thread and wait for all of them to return.
+
+    The first exception raised, in the order of 'funcs', is re-raised only after every function has
+    returned so that no node is left starting or stopping in the background.
+    """
+    funcs = list(funcs)
+    if len(funcs) <= 1:
+        for func in funcs:
+            func()
+        return
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(funcs)) as executor:
+        futures = [executor.submit(func) for func in funcs]
+
+    for future in futures:
+        future.result()
+
+
+class FixturePhaseTimer(object):
+    """A helper class used to log how long each phase of starting or stopping a fixture takes."""
+
+    def __init__(self, logger, action):
+        """Initialize a FixturePhaseTimer.
+
+        Args:
+            logger: A logger to use to log the timings.
+            action: A description of what the phases are part of, e.g. "setting up the cluster".
+        """
+        self._logger = logger
+        self._action = action
+        self._start = time.time()
+        self._phases = []
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time the code run in the context as the phase 'name'."""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self._phases.append((name, time.time() - start))
+
+    def log_summary(self):
+        """Log the total time taken and the time taken by each of the phases."""
+        breakdown = ", ".join("{}: {:.2f}s".format(name, secs) for (name, secs) in self._phases)
+        self._logger.info("Finished %s in %.2f seconds (%s).", self._action,
+                          time.time() - self._start, breakdown or "no phases")
+
+
 def create_fixture_table(fixture):
     """Get fixture node info, make it a pretty table. Return it or None if fixture is invalid target."""
     info: List[NodeInfo] = fixture.get_node_info()
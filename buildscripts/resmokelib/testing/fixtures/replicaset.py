@@ -1,7 +1,9 @@
 """Replica set fixture for executing JSTests against."""
 
+import functools
 import os.path
 import random
+import shutil
 import time
 
 import bson
@@ -39,6 +41,27 @@ def compare_optime(optime1, optime2):
         return compare_timestamp(optime1["ts"], optime2["ts"])
 
 
+def get_reconfig_member_counts(members):
+    """Return the number of members to include in each of the reconfigs which add 'members'.
+
+    The first member is expected to already be in the config. Non force reconfigs can only add a
+    single voting member at a time but any number of non-voting members, so non-voting members are
+    added together with the voting member before them.
+    """
+    counts = []
+    adding_voter = False
+    for (count, member) in enumerate(members[1:], start=2):
+        is_voter = member.get("votes", 1) > 0
+        if is_voter and adding_voter:
+            counts.append(count - 1)
+            adding_voter = False
+        adding_voter = adding_voter or is_voter
+
+    if len(members) > 1:
+        counts.append(len(members))
+    return counts
+
+
 class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-instance-attributes, too-many-public-methods
     """Fixture which provides JSTests with a replica set to run against."""
 
@@ -49,6 +72,10 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
     _CURRENT_CONFIG_NOT_COMMITTED_YET = 308
     _INTERRUPTED_DUE_TO_REPL_STATE_CHANGE = 11602
 
+    # Files which are not copied into the dbpath template. mongod recreates them as needed.
+    _DBPATH_TEMPLATE_IGNORE_PATTERNS = ("diagnostic.data", "WiredTigerPreplog.*",
+                                        "WiredTigerTmplog.*")
+
     def __init__(  # pylint: disable=too-many-arguments, too-many-locals
             self, logger, job_num, fixturelib, mongod_executable=None, mongod_options=None,
             dbpath_prefix=None, preserve_dbpath=False, num_nodes=2, start_initial_sync_node=False,
@@ -56,7 +83,7 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
             replset_config_options=None, voting_secondaries=True, all_nodes_electable=False,
             use_replica_set_connection_string=None, linear_chain=False, mixed_bin_versions=None,
             default_read_concern=None, default_write_concern=None, shard_logging_prefix=None,
-            replicaset_logging_prefix=None):
+            replicaset_logging_prefix=None, use_dbpath_template=False):
         """Initialize ReplicaSetFixture."""
 
         interface.ReplFixture.__init__(self, logger, job_num, fixturelib,
@@ -89,6 +116,9 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
                                                               linear_chain)
         self.linear_chain = linear_chain_option if linear_chain_option else linear_chain
 
+        # Use the value given from the command line if it exists for use_dbpath_template.
+        self.use_dbpath_template = self.config.DBPATH_TEMPLATES or use_dbpath_template
+
         # By default, we only use a replica set connection string if all nodes are capable of being
         # elected primary.
         if self.use_replica_set_connection_string is None:
@@ -113,6 +143,11 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
         else:
             self._dbpath_prefix = os.path.join(self._dbpath_prefix, self.config.FIXTURE_SUBDIR)
 
+        # The data files of the members right after the replica set was first initiated, which later
+        # calls to setup() start from instead of initiating the replica set again.
+        self._dbpath_template = os.path.normpath(self._dbpath_prefix) + ".template"
+        self._dbpath_template_created = False
+
         self.nodes = []
         self.replset_name = self.mongod_options.setdefault("replSet", "rs")
         self.initial_sync_node = None
@@ -124,12 +159,22 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
         # Version-agnostic options for mongod/s can be set here.
         # Version-specific options should be set in get_version_specific_options_for_mongod()
         # to avoid options for old versions being applied to new Replicaset fixtures.
-        for i in range(self.num_nodes):
-            self.nodes[i].setup()
+        timer = interface.FixturePhaseTimer(self.logger, "setting up the replica set")
+        if self._dbpath_template_created:
+            self._setup_from_dbpath_template(timer)
+            timer.log_summary()
+            return
 
-        if self.initial_sync_node:
-            self.initial_sync_node.setup()
-            self.initial_sync_node.await_ready()
+        if self._should_use_dbpath_template() and os.path.lexists(self._dbpath_template):
+            # Never start from a template left behind by an earlier resmoke invocation.
+            shutil.rmtree(self._dbpath_template)
+
+        with timer.phase("start nodes"):
+            for i in range(self.num_nodes):
+                self.nodes[i].setup()
+
+            if self.initial_sync_node:
+                self.initial_sync_node.setup()
 
         # Legacy multiversion line
         if self.mixed_bin_versions:
@@ -143,8 +188,12 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
                     raise self.fixturelib.ServerFailure(msg)
 
         # We need only to wait to connect to the first node of the replica set because we first
-        # initiate it as a single node replica set.
-        self.nodes[0].await_ready()
+        # initiate it as a single node replica set. The other nodes keep starting up meanwhile.
+        first_nodes = [self.nodes[0]]
+        if self.initial_sync_node:
+            first_nodes.append(self.initial_sync_node)
+        with timer.phase("await first node"):
+            interface.run_concurrently(node.await_ready for node in first_nodes)
 
         # Initiate the replica set.
         members = []
@@ -172,6 +221,7 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
         if client.local.system.replset.count_documents(filter={}):
             # Skip initializing the replset if there is an existing configuration.
             self.logger.info("Configuration exists. Skipping initializing the replset.")
+            timer.log_summary()
             return
 
         if self.write_concern_majority_journal_default is not None:
@@ -199,8 +249,9 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
         # contains more than 1 node), so the primary is elected more quickly.
         repl_config["members"] = [members[0]]
         self.logger.info("Issuing replSetInitiate command: %s", repl_config)
-        self._initiate_repl_set(client, repl_config)
-        self._await_primary()
+        with timer.phase("initiate"):
+            self._initiate_repl_set(client, repl_config)
+            self._await_primary()
 
         if self.fcv is not None:
             # Initiating a replica set with a single node will use "latest" FCV. This will
@@ -213,15 +264,19 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
         if self.nodes[1:]:
             # Wait to connect to each of the secondaries before running the replSetReconfig
             # command.
-            for node in self.nodes[1:]:
-                node.await_ready()
-            # Add in the members one at a time, since non force reconfigs can only add/remove a
-            # single voting member at a time.
-            for ind in range(2, len(members) + 1):
-                self._add_node_to_repl_set(client, repl_config, ind, members)
-
-        self._await_secondaries()
-        self._await_newly_added_removals()
+            with timer.phase("await secondaries"):
+                interface.run_concurrently(node.await_ready for node in self.nodes[1:])
+            # Add in the members with as few reconfigs as possible, since non force reconfigs can
+            # only add/remove a single voting member at a time.
+            with timer.phase("add members"):
+                for ind in get_reconfig_member_counts(members):
+                    self._add_node_to_repl_set(client, repl_config, ind, members)
+
+        with timer.phase("await secondary state"):
+            self._await_secondaries()
+        with timer.phase("await newlyAdded removals"):
+            self._await_newly_added_removals()
+        timer.log_summary()
 
     def pids(self):
         """:return: all pids owned by this fixture if any."""
@@ -314,10 +369,105 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
 
     def await_ready(self):
         """Wait for replica set to be ready."""
+        timer = interface.FixturePhaseTimer(self.logger, "waiting for the replica set")
+        with timer.phase("await primary"):
+            self._await_primary()
+        with timer.phase("await secondaries"):
+            self._await_secondaries()
+        with timer.phase("await stable recovery timestamps"):
+            self._await_stable_recovery_timestamp()
+        with timer.phase("set read/write concern defaults"):
+            self._setup_cwrwc_defaults()
+        if self._should_use_dbpath_template() and not self._dbpath_template_created:
+            with timer.phase("create dbpath template"):
+                self._create_dbpath_template()
+        timer.log_summary()
+
+    def _get_all_nodes(self):
+        """Return the members of the replica set including the initial sync node."""
+        nodes = list(self.nodes)
+        if self.initial_sync_node:
+            nodes.append(self.initial_sync_node)
+        return nodes
+
+    def _should_use_dbpath_template(self):
+        # Nodes which preserve their dbpath, including when ALWAYS_USE_LOG_FILES is set, are
+        # restarted on the data files they already have.
+        return self.use_dbpath_template and not any(
+            node.preserve_dbpath for node in self._get_all_nodes())
+
+    def _get_node_dbpath_template(self, node):
+        return os.path.join(self._dbpath_template, os.path.basename(node.get_dbpath_prefix()))
+
+    def _create_dbpath_template(self):
+        """Cleanly shut down the members, copy their data files, and start them back up."""
+        self.logger.info("Saving the data files of the replica set as a template in %s.",
+                         self._dbpath_template)
+        # Terminate the secondaries first to reduce noise in the logs.
+        nodes = self._get_all_nodes()
+        interface.run_concurrently(node.teardown for node in nodes[1:])
+        nodes[0].teardown()
+
+        for node in nodes:
+            self.fixturelib.clone_directory(node.get_dbpath_prefix(),
+                                            self._get_node_dbpath_template(node),
+                                            ignore_patterns=self._DBPATH_TEMPLATE_IGNORE_PATTERNS)
+        self._dbpath_template_created = True
+
+        self._start_nodes_on_existing_dbpaths()
+        self._step_up_first_node()
         self._await_primary()
         self._await_secondaries()
         self._await_stable_recovery_timestamp()
-        self._setup_cwrwc_defaults()
+
+    def _setup_from_dbpath_template(self, timer):
+        """Start the members on a copy of the dbpath template instead of initiating the set."""
+        self.logger.info("Starting the replica set from the template in %s.",
+                         self._dbpath_template)
+        with timer.phase("clone dbpath template"):
+            for node in self._get_all_nodes():
+                dbpath = node.get_dbpath_prefix()
+                if os.path.lexists(dbpath):
+                    shutil.rmtree(dbpath)
+                self.fixturelib.clone_directory(self._get_node_dbpath_template(node), dbpath)
+
+        with timer.phase("start nodes"):
+            self._start_nodes_on_existing_dbpaths()
+        with timer.phase("step up first node"):
+            self._step_up_first_node()
+
+    def _start_nodes_on_existing_dbpaths(self):
+        nodes = self._get_all_nodes()
+        for node in nodes:
+            # The nodes are only restarted on existing data files when they don't preserve their
+            # dbpath otherwise.
+            node.preserve_dbpath = True
+            try:
+                node.setup()
+            finally:
+                node.preserve_dbpath = False
+
+        interface.run_concurrently(node.await_ready for node in nodes)
+
+    def _step_up_first_node(self):
+        """Make the first node primary again after the members were restarted on existing data.
+
+        The election timeout is 24 hours by default, so no member would run for election on its
+        own. _await_primary() expects the first node to become primary.
+        """
+        primary = self.nodes[0]
+        client = interface.authenticate(primary.mongo_client(), self.auth_options)
+        deadline = time.time() + self.AWAIT_READY_TIMEOUT_SECS
+        while not client.admin.command("isMaster")["ismaster"]:
+            if time.time() > deadline:
+                msg = "Node on port {} did not step up in {} seconds.".format(
+                    primary.port, self.AWAIT_READY_TIMEOUT_SECS)
+                self.logger.error(msg)
+                raise self.fixturelib.ServerFailure(msg)
+
+            # The step up fails until enough of the secondaries are able to vote for the node.
+            self.stepup_node(primary, self.auth_options)
+            time.sleep(0.1)  # Wait a little bit before trying again.
 
     def _await_primary(self):
         # Wait for the primary to be elected.
@@ -341,7 +491,7 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
         if self.initial_sync_node:
             secondaries.append(self.initial_sync_node)
 
-        for secondary in secondaries:
+        def await_secondary(secondary):
             client = secondary.mongo_client(read_preference=pymongo.ReadPreference.SECONDARY)
             while True:
                 self.logger.info("Waiting for secondary on port %d to become available.",
@@ -352,6 +502,10 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
                 time.sleep(0.1)  # Wait a little bit before trying again.
             self.logger.info("Secondary on port %d is now available.", secondary.port)
 
+        # The secondaries are polled concurrently since they catch up independently of each other.
+        interface.run_concurrently(
+            functools.partial(await_secondary, secondary) for secondary in secondaries)
+
     def _await_stable_recovery_timestamp(self):
         """
         Awaits stable recovery timestamps on all nodes in the replica set.
@@ -379,7 +533,7 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
             "admin", write_concern=pymongo.write_concern.WriteConcern(w="majority"))
         admin.command("appendOplogNote", data={"await_stable_recovery_timestamp": 1})
 
-        for node in self.nodes:
+        def await_stable_recovery_timestamp(node):
             self.logger.info("Waiting for node on port %d to have a stable recovery timestamp.",
                              node.port)
             client = node.mongo_client(read_preference=pymongo.ReadPreference.SECONDARY)
@@ -408,6 +562,9 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
                     break
                 time.sleep(0.1)  # Wait a little bit before trying again.
 
+        interface.run_concurrently(
+            functools.partial(await_stable_recovery_timestamp, node) for node in self.nodes)
+
     def _should_await_newly_added_removals_longer(self, client):
         """
         Return whether the current replica set config has any 'newlyAdded' fields.
@@ -467,13 +624,24 @@ class ReplicaSetFixture(interface.ReplFixture):  # pylint: disable=too-many-inst
                              "but weren't.")
 
         teardown_handler = interface.FixtureTeardownHandler(self.logger)
+        timer = interface.FixturePhaseTimer(self.logger, "stopping the replica set")
 
+        # Terminate the secondaries first to reduce noise in the logs. They are independent of
+        # each other and so are stopped concurrently.
+        secondaries = [(node, "replica set member on port %d" % node.port)
+                       for node in reversed(self.nodes[1:])]
         if self.initial_sync_node:
-            teardown_handler.teardown(self.initial_sync_node, "initial sync node", mode=mode)
-
-        # Terminate the secondaries first to reduce noise in the logs.
-        for node in reversed(self.nodes):
-            teardown_handler.teardown(node, "replica set member on port %d" % node.port, mode=mode)
+            secondaries.insert(0, (self.initial_sync_node, "initial sync node"))
+        with timer.phase("stop secondaries"):
+            interface.run_concurrently(
+                functools.partial(teardown_handler.teardown, node, name, mode=mode)
+                for (node, name) in secondaries)
+
+        with timer.phase("stop primary"):
+            teardown_handler.teardown(self.nodes[0],
+                                      "replica set member on port %d" % self.nodes[0].port,
+                                      mode=mode)
+        timer.log_summary()
 
         if teardown_handler.was_successful():
             self.logger.info("Successfully stopped all members of the replica set.")
@@ -1,5 +1,6 @@
 """Sharded cluster fixture for executing JSTests against."""
 
+import functools
 import os.path
 import time
 import yaml
@@ -98,26 +99,28 @@ class ShardedClusterFixture(interface.Fixture):  # pylint: disable=too-many-inst
         if self.configsvr is None:
             self.configsvr = self._new_configsvr()
 
-        self.configsvr.setup()
-
         if not self.shards:
             for i in range(self.num_shards):
                 shard = self._new_rs_shard(i, self.num_rs_nodes_per_shard)
                 self.shards.append(shard)
 
-        # Start up each of the shards
-        for shard in self.shards:
-            shard.setup()
+        # Start up the config server and each of the shards. They don't depend on each other until
+        # the shards are added through mongos, so they are set up concurrently.
+        timer = interface.FixturePhaseTimer(self.logger, "setting up the sharded cluster")
+        with timer.phase("set up config server and shards"):
+            interface.run_concurrently(replset.setup for replset in [self.configsvr] + self.shards)
+        timer.log_summary()
 
     def await_ready(self):
         """Block until the fixture can be used for testing."""
-        # Wait for the config server
-        if self.configsvr is not None:
-            self.configsvr.await_ready()
+        timer = interface.FixturePhaseTimer(self.logger, "waiting for the sharded cluster")
 
-        # Wait for each of the shards
-        for shard in self.shards:
-            shard.await_ready()
+        # Wait for the config server and each of the shards
+        replsets = list(self.shards)
+        if self.configsvr is not None:
+            replsets.insert(0, self.configsvr)
+        with timer.phase("await config server and shards"):
+            interface.run_concurrently(replset.await_ready for replset in replsets)
 
         # We call self._new_mongos() and mongos.setup() in self.await_ready() function
         # instead of self.setup() because mongos routers have to connect to a running cluster.
@@ -126,13 +129,31 @@ class ShardedClusterFixture(interface.Fixture):  # pylint: disable=too-many-inst
                 mongos = self._new_mongos(i, self.num_mongos)
                 self.mongos.append(mongos)
 
-        for mongos in self.mongos:
-            # Start up the mongos.
-            mongos.setup()
+        with timer.phase("start mongos"):
+            # Start up all the mongos before waiting for any of them.
+            for mongos in self.mongos:
+                mongos.setup()
+
+            interface.run_concurrently(mongos.await_ready for mongos in self.mongos)
+
+        with timer.phase("configure cluster"):
+            self._configure_cluster()
+        with timer.phase("await sharding initialization"):
+            # Wait for mongod's to be ready.
+            self._await_mongod_sharding_initialization()
 
-            # Wait for the mongos.
-            mongos.await_ready()
+            # Ensure that the sessions collection gets auto-sharded by the config server
+            if self.configsvr is not None:
+                primary = self.configsvr.get_primary().mongo_client()
+                primary.admin.command({"refreshLogicalSessionCacheNow": 1})
+
+            for shard in self.shards:
+                primary = shard.get_primary().mongo_client()
+                primary.admin.command({"refreshLogicalSessionCacheNow": 1})
+        timer.log_summary()
 
+    def _configure_cluster(self):
+        """Configure the balancer, autosplit, shards and sharded databases through mongos."""
         client = self.mongo_client()
         interface.authenticate(client, self.auth_options)
 
@@ -162,18 +183,6 @@ class ShardedClusterFixture(interface.Fixture):  # pylint: disable=too-many-inst
             self.logger.info("Enabling sharding for '%s' database...", db_name)
             client.admin.command({"enablesharding": db_name})
 
-        # Wait for mongod's to be ready.
-        self._await_mongod_sharding_initialization()
-
-        # Ensure that the sessions collection gets auto-sharded by the config server
-        if self.configsvr is not None:
-            primary = self.configsvr.get_primary().mongo_client()
-            primary.admin.command({"refreshLogicalSessionCacheNow": 1})
-
-        for shard in self.shards:
-            primary = shard.get_primary().mongo_client()
-            primary.admin.command({"refreshLogicalSessionCacheNow": 1})
-
     def _await_mongod_sharding_initialization(self):
         if (self.enable_sharding) and (self.num_rs_nodes_per_shard is not None):
             deadline = time.time(
@@ -229,15 +238,23 @@ class ShardedClusterFixture(interface.Fixture):  # pylint: disable=too-many-inst
             self.stop_balancer()
 
         teardown_handler = interface.FixtureTeardownHandler(self.logger)
+        timer = interface.FixturePhaseTimer(self.logger, "stopping the sharded cluster")
 
-        for mongos in self.mongos:
-            teardown_handler.teardown(mongos, "mongos", mode=mode)
-
-        for shard in self.shards:
-            teardown_handler.teardown(shard, "shard", mode=mode)
+        # The mongos are stopped before the rest of the cluster. Everything within each of the two
+        # phases is stopped concurrently.
+        with timer.phase("stop mongos"):
+            interface.run_concurrently(
+                functools.partial(teardown_handler.teardown, mongos, "mongos", mode=mode)
+                for mongos in self.mongos)
 
+        replsets = [(shard, "shard") for shard in self.shards]
         if self.configsvr is not None:
-            teardown_handler.teardown(self.configsvr, "config server", mode=mode)
+            replsets.append((self.configsvr, "config server"))
+        with timer.phase("stop shards and config server"):
+            interface.run_concurrently(
+                functools.partial(teardown_handler.teardown, replset, name, mode=mode)
+                for (replset, name) in replsets)
+        timer.log_summary()
 
         if teardown_handler.was_successful():
             self.logger.info("Successfully stopped all members of the sharded cluster.")
@@ -407,6 +424,7 @@ class _MongoSFixture(interface.Fixture):
             self.fixturelib.default_if_none(mongos_options, {})).copy()
 
         self.mongos = None
+        self._ready_subscription = None
         self.port = fixturelib.get_next_port(job_num)
         self.mongos_options["port"] = self.port
 
@@ -426,6 +444,7 @@ class _MongoSFixture(interface.Fixture):
         self.mongos_options["port"] = self.port
         try:
             self.logger.info("Starting mongos on port %d...\n%s", self.port, mongos.as_command())
+            self._ready_subscription = self._subscribe_to_ready_log(mongos, self.mongos_options)
             mongos.start()
             self.logger.info("mongos started on port %d with pid %d.", self.port, mongos.pid)
         except Exception as err:
@@ -458,6 +477,12 @@ class _MongoSFixture(interface.Fixture):
                     "Could not connect to mongos on port {}, process ended"
                     " unexpectedly with code {}.".format(self.port, exit_code))
 
+            if self._ready_subscription is not None:
+                # Rather than polling, block until the mongos logs that it is accepting connections
+                # or exits. Connecting is still attempted periodically in case the log line is
+                # missed.
+                self._ready_subscription.wait(timeout=self._READY_LOG_PROBE_INTERVAL_SECS)
+
             try:
                 # Use a shorter connection timeout to more closely satisfy the requested deadline.
                 client = self.mongo_client(timeout_millis=500)
@@ -471,7 +496,8 @@ class _MongoSFixture(interface.Fixture):
                             self.port, interface.Fixture.AWAIT_READY_TIMEOUT_SECS))
 
                 self.logger.info("Waiting to connect to mongos on port %d.", self.port)
-                time.sleep(0.1)  # Wait a little bit before trying again.
+                if self._ready_subscription is None or self._ready_subscription.is_set():
+                    time.sleep(0.1)  # Wait a little bit before trying again.
 
         self.logger.info("Successfully contacted the mongos on port %d.", self.port)
 
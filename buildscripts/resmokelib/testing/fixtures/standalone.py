@@ -48,6 +48,7 @@ class MongoDFixture(interface.Fixture):
             self.preserve_dbpath = preserve_dbpath
 
         self.mongod = None
+        self._ready_subscription = None
         self.port = port or fixturelib.get_next_port(job_num)
         self.mongod_options["port"] = self.port
 
@@ -70,6 +71,7 @@ class MongoDFixture(interface.Fixture):
                                                    mongod_options=self.mongod_options)
         try:
             self.logger.info("Starting mongod on port %d...\n%s", self.port, mongod.as_command())
+            self._ready_subscription = self._subscribe_to_ready_log(mongod, self.mongod_options)
             mongod.start()
             self.logger.info("mongod started on port %d with pid %d.", self.port, mongod.pid)
         except Exception as err:
@@ -101,6 +103,12 @@ class MongoDFixture(interface.Fixture):
                     "Could not connect to mongod on port {}, process ended"
                     " unexpectedly with code {}.".format(self.port, exit_code))
 
+            if self._ready_subscription is not None:
+                # Rather than polling, block until the mongod logs that it is accepting connections
+                # or exits. Connecting is still attempted periodically in case the log line is
+                # missed.
+                self._ready_subscription.wait(timeout=self._READY_LOG_PROBE_INTERVAL_SECS)
+
             try:
                 # Use a shorter connection timeout to more closely satisfy the requested deadline.
                 client = self.mongo_client(timeout_millis=500)
@@ -114,7 +122,8 @@ class MongoDFixture(interface.Fixture):
                             self.port, MongoDFixture.AWAIT_READY_TIMEOUT_SECS))
 
                 self.logger.info("Waiting to connect to mongod on port %d.", self.port)
-                time.sleep(0.1)  # Wait a little bit before trying again.
+                if self._ready_subscription is None or self._ready_subscription.is_set():
+                    time.sleep(0.1)  # Wait a little bit before trying again.
 
         self.logger.info("Successfully contacted the mongod on port %d.", self.port)
 
@@ -0,0 +1,182 @@
+"""Support for running data consistency checks from resmoke.py instead of from a mongo shell.
+
+The checks connect to each node with the pymongo.MongoClient returned by its fixture's
+mongo_client() method and reuse those connections across tests.
+"""
+
+import threading
+
+import pymongo.errors
+from bson import json_util
+
+from buildscripts.resmokelib import errors
+from buildscripts.resmokelib.testing.fixtures import interface as fixture_interface
+from buildscripts.resmokelib.testing.fixtures import replicaset
+from buildscripts.resmokelib.testing.fixtures import shardedcluster
+from buildscripts.resmokelib.testing.fixtures import standalone
+from buildscripts.resmokelib.testing.hooks import interface
+from buildscripts.resmokelib.testing.hooks import jsfile
+from buildscripts.resmokelib.utils import registry
+
+
+def tojson(doc):
+    """Return a single-line extended JSON representation of 'doc' for logging."""
+    return json_util.dumps(doc)
+
+
+def get_test_data(shell_options):
+    """Return the TestData object the mongo shell would have been started with."""
+    global_vars = (shell_options or {}).get("global_vars", {})
+    return global_vars.get("TestData", {})
+
+
+def is_standalone(fixture):
+    """Return True if 'fixture' is a stand-alone mongod."""
+    return isinstance(fixture, standalone.MongoDFixture)
+
+
+def get_replica_sets(fixture):
+    """Return the replica sets making up 'fixture', or None if the topology isn't recognized.
+
+    A stand-alone mongod is made up of no replica sets.
+    """
+    if is_standalone(fixture):
+        return []
+
+    if isinstance(fixture, replicaset.ReplicaSetFixture):
+        return [fixture]
+
+    if isinstance(fixture, shardedcluster.ShardedClusterFixture):
+        return [fixture.configsvr] + fixture.shards
+
+    return None
+
+
+def get_replica_set_members(replset):
+    """Return the nodes of 'replset', including its initial sync node."""
+    members = list(replset.nodes)
+    if replset.initial_sync_node:
+        members.append(replset.initial_sync_node)
+    return members
+
+
+def get_mongod_nodes(fixture):
+    """Return every mongod of 'fixture', or None if the topology isn't recognized."""
+    if is_standalone(fixture):
+        return [fixture]
+
+    replsets = get_replica_sets(fixture)
+    if replsets is None:
+        return None
+
+    return [node for replset in replsets for node in get_replica_set_members(replset)]
+
+
+def get_host(node):
+    """Return the "host:port" string identifying 'node' in log messages."""
+    return node.get_internal_connection_string()
+
+
+def is_arbiter(client):
+    """Return True if the node 'client' is connected to is an arbiter."""
+    return client.admin.command("isMaster").get("arbiterOnly", False)
+
+
+class NodeClients(object):
+    """Authenticated pymongo.MongoClient instances for each node, created on first use."""
+
+    def __init__(self, auth_options=None):
+        """Initialize NodeClients."""
+        self._auth_options = auth_options
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def get(self, node):
+        """Return the client for 'node'."""
+        with self._lock:
+            client = self._clients.get(node.port)
+            if client is None:
+                client = fixture_interface.authenticate(node.mongo_client(), self._auth_options)
+                self._clients[node.port] = client
+            return client
+
+    def close(self):
+        """Close all the clients."""
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+class PythonDataConsistencyHook(jsfile.DataConsistencyHook):
+    """A data consistency hook which can optionally run its check in-process.
+
+    When 'use_python' is true and the fixture is one whose topology is understood, the check runs
+    from resmoke.py as a DynamicPythonTestCase. Otherwise the JavaScript file is run in a mongo
+    shell as it is for any other DataConsistencyHook. Either way a failed check is reported as a
+    failed dynamic test and raises an errors.ServerFailure exception.
+    """
+
+    REGISTERED_NAME = registry.LEAVE_UNREGISTERED
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self, hook_logger, fixture, js_filename, description, shell_options=None,
+            use_python=False, auth_options=None):
+        """Initialize PythonDataConsistencyHook."""
+        jsfile.DataConsistencyHook.__init__(self, hook_logger, fixture, js_filename, description,
+                                            shell_options=shell_options)
+        self._use_python = use_python
+        self._test_data = get_test_data(shell_options)
+        if auth_options is None:
+            auth_options = getattr(fixture, "auth_options", None)
+        self._clients = NodeClients(auth_options)
+
+    def _can_run_python_check(self):
+        """Return True if the check supports the fixture and options it was given."""
+        return get_mongod_nodes(self.fixture) is not None
+
+    def _run_python_check(self, logger):
+        """Run the check, logging to 'logger' and raising errors.TestFailure if it fails."""
+        raise NotImplementedError("_run_python_check must be implemented by subclasses")
+
+    def after_test(self, test, test_report):
+        """After test execution."""
+        if not (self._use_python and self._can_run_python_check()):
+            jsfile.DataConsistencyHook.after_test(self, test, test_report)
+            return
+
+        if not self._should_run_after_test():
+            return
+
+        hook_test_case = DynamicPythonTestCase.create_after_test(test.logger, test, self,
+                                                                 self._run_python_check)
+        hook_test_case.configure(self.fixture)
+        try:
+            hook_test_case.run_dynamic_test(test_report)
+        except errors.TestFailure as err:
+            raise errors.ServerFailure(err.args[0])
+
+    def after_suite(self, test_report):
+        """After suite."""
+        self._clients.close()
+
+
+class DynamicPythonTestCase(interface.DynamicTestCase):
+    """A dynamic TestCase that runs a check function from resmoke.py."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self, logger, test_name, description, base_test_name, hook, check_fn):
+        """Initialize DynamicPythonTestCase."""
+        interface.DynamicTestCase.__init__(self, logger, test_name, description, base_test_name,
+                                           hook)
+        self._check_fn = check_fn
+
+    def run_test(self):
+        """Execute the test."""
+        try:
+            self._check_fn(self.logger)
+        except pymongo.errors.PyMongoError as err:
+            # A command failing is a failed check, the same as an uncaught exception in the mongo
+            # shell would have been.
+            self.logger.exception("Encountered an error running %s.", self.description)
+            raise errors.TestFailure("{} failed: {}".format(self.description, err))
@@ -1,23 +1,512 @@
 """Test hook for verifying data consistency across a replica set."""
 
+import datetime
+import functools
 import os.path
+import time
 
-from buildscripts.resmokelib.testing.hooks import jsfile
+import bson
+import pymongo
+import pymongo.errors
 
+from buildscripts.resmokelib import errors
+from buildscripts.resmokelib.testing.fixtures import interface as fixture_interface
+from buildscripts.resmokelib.testing.hooks import data_consistency
 
-class CheckReplDBHash(jsfile.DataConsistencyHook):
+# The order of the canonical BSON types, as the server compares them.
+_BSON_TYPE_ORDER = {
+    "min_key": 0, "null": 1, "number": 2, "string": 3, "object": 4, "array": 5, "binary": 6,
+    "object_id": 7, "bool": 8, "date": 9, "timestamp": 10, "regex": 11, "code": 12, "max_key": 13
+}
+
+
+class CheckReplDBHash(data_consistency.PythonDataConsistencyHook):
     """Check if the dbhashes match.
 
     This includes dbhashes for all non-local databases and non-replicated system collections that
     match on the primary and secondaries.
+
+    Setting 'use_python' runs the check from resmoke.py instead of from a mongo shell running
+    jstests/hooks/run_check_repl_dbhash.js. The replica sets of a sharded cluster are then checked
+    concurrently.
     """
 
     IS_BACKGROUND = False
 
-    def __init__(  # pylint: disable=super-init-not-called
-            self, hook_logger, fixture, shell_options=None):
+    def __init__(  # pylint: disable=too-many-arguments
+            self, hook_logger, fixture, shell_options=None, use_python=False, auth_options=None):
         """Initialize CheckReplDBHash."""
         description = "Check dbhashes of all replica set or master/slave members"
         js_filename = os.path.join("jstests", "hooks", "run_check_repl_dbhash.js")
-        jsfile.JSHook.__init__(  # pylint: disable=non-parent-init-called
-            self, hook_logger, fixture, js_filename, description, shell_options=shell_options)
+        data_consistency.PythonDataConsistencyHook.__init__(
+            self, hook_logger, fixture, js_filename, description, shell_options=shell_options,
+            use_python=use_python, auth_options=auth_options)
+
+    def _can_run_python_check(self):
+        """Return True if the check supports the fixture and options it was given."""
+        # Comparing the collection counts is left to the mongo shell.
+        if self._test_data.get("checkCollectionCounts"):
+            return False
+        return data_consistency.PythonDataConsistencyHook._can_run_python_check(self)
+
+    def _run_python_check(self, logger):
+        """Check the dbhashes of every replica set with more than one node."""
+        replsets = data_consistency.get_replica_sets(self.fixture)
+        if not replsets:
+            logger.info(
+                "Skipping data consistency checks for cluster because we are connected to a"
+                " stand-alone mongod: %s", self.fixture)
+            return
+
+        start_time = time.time()
+        checkers = []
+        for replset in replsets:
+            members = data_consistency.get_replica_set_members(replset)
+            if len(members) == 1:
+                logger.info("Skipping data consistency checks for 1-node replica set '%s'.",
+                            replset.replset_name)
+                continue
+            checkers.append(
+                _ReplSetDBHashChecker(logger, replset, members, self._clients,
+                                      self._test_data.get("excludedDBsFromDBHash", [])))
+
+        try:
+            results = []
+
+            def check_replset(checker):
+                results.append(checker.check())
+
+            fixture_interface.run_concurrently(
+                functools.partial(check_replset, checker) for checker in checkers)
+            if not all(results):
+                raise errors.TestFailure("dbhash mismatch between primary and secondary")
+        finally:
+            logger.info("Finished data consistency checks for cluster in %d ms.",
+                        (time.time() - start_time) * 1000)
+
+
+class _ReplSetDBHashChecker(object):  # pylint: disable=too-many-instance-attributes
+    """Compare the dbhashes of the secondaries of a replica set against its primary.
+
+    This mirrors ReplSetTest.checkReplicatedDataHashes() in src/mongo/shell/replsettest.js.
+    """
+
+    MSG_PREFIX = "checkReplicatedDataHashes"
+
+    # Secondaries are frozen for as long as ReplSetTest.kForeverSecs so no election can start and
+    # hang on the fsync lock of the primary.
+    FREEZE_SECS = 24 * 60 * 60
+
+    AWAIT_REPLICATION_TIMEOUT_SECS = 10 * 60
+    AWAIT_REPLICATION_INTERVAL_SECS = 0.1
+
+    OPLOG_DUMP_LIMIT = 100
+
+    # Errors the dbHash command returns while an index build or other background operation is in
+    # progress on the namespace. They are retried, as jstests/hooks/run_check_repl_dbhash.js does.
+    BACKGROUND_OPERATION_IN_PROGRESS_CODES = (12586, 12587)
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self, logger, replset, members, clients, excluded_dbs):
+        """Initialize _ReplSetDBHashChecker."""
+        self.logger = logger
+        self.replset = replset
+        self.members = members
+        self.clients = clients
+        self.excluded_dbs = set(excluded_dbs) | {"local"}
+        self.collections_printed = set()
+
+    def check(self):
+        """Return True if the secondaries have the same data as the primary."""
+        primary = self.replset.get_primary()
+        primary_client = self.clients.get(primary)
+
+        secondaries = []
+        for node in self.members:
+            if node.port == primary.port:
+                continue
+            # Arbiters have no replicated data.
+            if data_consistency.is_arbiter(self.clients.get(node)):
+                self.logger.info("checkDBHashesForReplSet skipping data of arbiter: %s",
+                                 data_consistency.get_host(node))
+                continue
+            secondaries.append(node)
+
+        self.logger.info("Freezing nodes: [%s]",
+                         ",".join(data_consistency.get_host(node) for node in secondaries))
+        for node in secondaries:
+            self.clients.get(node).admin.command("replSetFreeze", self.FREEZE_SECS)
+
+        try:
+            # It's not important if the storage engine fails to perform its fsync operation. The
+            # only requirement is that writes are locked out.
+            primary_client.admin.command("fsync", 1, lock=True, allowFsyncFailure=True)
+            try:
+                self._await_replication(primary, secondaries)
+                return self._check_db_hashes(primary, secondaries)
+            finally:
+                self._run_ignoring_errors(primary, "fsyncUnlock")
+        finally:
+            for node in secondaries:
+                self._run_ignoring_errors(node, "replSetFreeze", 0)
+
+    def _run_ignoring_errors(self, node, command, value=1):
+        try:
+            self.clients.get(node).admin.command(command, value)
+        except pymongo.errors.PyMongoError as err:
+            self.logger.info("Continuing after %s error: %s", command, err)
+
+    def _get_last_oplog_ts(self, node):
+        entry = self.clients.get(node).local.oplog.rs.find_one(sort=[("$natural", -1)])
+        return entry["ts"] if entry is not None else None
+
+    def _await_replication(self, primary, secondaries):
+        primary_ts = self._get_last_oplog_ts(primary)
+        if primary_ts is None:
+            return
+
+        deadline = time.time() + self.AWAIT_REPLICATION_TIMEOUT_SECS
+        for node in secondaries:
+            while True:
+                secondary_ts = self._get_last_oplog_ts(node)
+                if secondary_ts is not None and secondary_ts >= primary_ts:
+                    break
+                if time.time() > deadline:
+                    raise errors.TestFailure(
+                        "Timed out waiting for {} to replicate up to {} of primary {}".format(
+                            data_consistency.get_host(node), primary_ts,
+                            data_consistency.get_host(primary)))
+                time.sleep(self.AWAIT_REPLICATION_INTERVAL_SECS)
+
+    def _get_build_indexes(self, primary):
+        """Return a dict of port to whether the member has buildIndexes enabled."""
+        config = self.clients.get(primary).admin.command("replSetGetConfig")["config"]
+        return {
+            int(member["host"].rsplit(":", 1)[1]): member.get("buildIndexes", True)
+            for member in config["members"]
+        }
+
+    def _run_db_hash(self, node, db_name):
+        deadline = time.time() + self.AWAIT_REPLICATION_TIMEOUT_SECS
+        while True:
+            try:
+                return self.clients.get(node)[db_name].command("dbHash")
+            except pymongo.errors.OperationFailure as err:
+                if (err.code not in self.BACKGROUND_OPERATION_IN_PROGRESS_CODES
+                        or time.time() > deadline):
+                    raise
+                self.logger.info("Retrying dbHash on %s after error: %s",
+                                 data_consistency.get_host(node), err)
+                time.sleep(self.AWAIT_REPLICATION_INTERVAL_SECS)
+
+    def _check_db_hashes(self, primary, secondaries):
+        db_names = set(self.clients.get(primary).list_database_names())
+        for node in secondaries:
+            db_names.update(self.clients.get(node).list_database_names())
+
+        build_indexes = self._get_build_indexes(primary)
+        nodes = [primary] + secondaries
+        hashes = {}
+
+        def run_db_hash(node, db_name):
+            hashes[node.port] = self._run_db_hash(node, db_name)
+
+        success = True
+        has_dumped_oplog = False
+        for db_name in sorted(db_names - self.excluded_dbs):
+            fixture_interface.run_concurrently(
+                functools.partial(run_db_hash, node, db_name) for node in nodes)
+
+            primary_infos = _CollInfos(self.clients.get(primary), "primary",
+                                       data_consistency.get_host(primary), db_name)
+            primary_infos.filter(hashes[primary.port]["collections"])
+
+            for node in secondaries:
+                secondary_infos = _CollInfos(self.clients.get(node), "secondary",
+                                             data_consistency.get_host(node), db_name)
+                secondary_infos.filter(hashes[node.port]["collections"])
+
+                self.logger.info("checking db hash between primary: %s and secondary %s",
+                                 primary_infos.host, secondary_infos.host)
+                success = self._check_db_hash(
+                    hashes[primary.port], primary_infos, hashes[node.port], secondary_infos,
+                    build_indexes.get(node.port, True)) and success
+
+                if not success and not has_dumped_oplog:
+                    self.logger.info("checkDBHashesForReplSet dumping oplogs from all nodes")
+                    for oplog_node in nodes:
+                        self._dump_oplog(oplog_node)
+                    has_dumped_oplog = True
+
+        return success
+
+    def _dump_oplog(self, node):
+        entries = self.clients.get(node).local.oplog.rs.find().sort("$natural",
+                                                                    -1).limit(self.OPLOG_DUMP_LIMIT)
+        lines = ["Dumping the latest {} documents from the oplog local.oplog.rs of {}".format(
+            self.OPLOG_DUMP_LIMIT, data_consistency.get_host(node))]
+        lines.extend(data_consistency.tojson(entry) for entry in entries)
+        self.logger.info("\n".join(lines))
+
+    def _log(self, msg):
+        self.logger.info("%s, %s", self.MSG_PREFIX, msg)
+
+    def _check_db_hash(  # pylint: disable=too-many-arguments,too-many-branches,too-many-locals
+            self, source_hash, source_infos, syncing_hash, syncing_infos, syncing_has_indexes):
+        """Compare the dbHash responses the same way DataConsistencyChecker.checkDBHash() does."""
+        success = True
+        db_name = source_infos.db_name
+        source_colls = list(source_hash["collections"])
+        syncing_colls = list(syncing_hash["collections"])
+        hashes_msg = "source: {}, syncing: {}".format(
+            data_consistency.tojson(source_hash), data_consistency.tojson(syncing_hash))
+
+        if len(source_colls) != len(syncing_colls):
+            self._log("the two nodes have a different number of collections: " + hashes_msg)
+            for coll_name in sorted(set(source_colls) ^ set(syncing_colls)):
+                self._dump_collection_diff(source_infos, syncing_infos, coll_name)
+            success = False
+
+        # Only compare the dbhashes of non-capped collections because capped collections are not
+        # necessarily truncated at the same points between the source and syncing nodes.
+        non_capped_colls = source_infos.get_non_capped_coll_names()
+        for coll_name in non_capped_colls:
+            if source_hash["collections"].get(coll_name) != syncing_hash["collections"].get(
+                    coll_name):
+                self._log("the two nodes have a different hash for the collection {}.{}: {}".format(
+                    db_name, coll_name, hashes_msg))
+                self._dump_collection_diff(source_infos, syncing_infos, coll_name)
+                success = False
+
+        for syncing_info in syncing_infos.infos:
+            for source_info in source_infos.infos:
+                if (syncing_info["name"] != source_info["name"]
+                        or syncing_info.get("type") != source_info.get("type")):
+                    continue
+                if _normalize_coll_info(syncing_info) != _normalize_coll_info(source_info):
+                    self._log("the two nodes have different attributes for the collection or"
+                              " view {}.{}".format(db_name, syncing_info["name"]))
+                    self._dump_collection_diff(source_infos, syncing_infos, syncing_info["name"])
+                    success = False
+
+        for coll_name in source_colls:
+            source_stats = source_infos.get_coll_stats(coll_name)
+            syncing_stats = syncing_infos.get_coll_stats(coll_name)
+            if source_stats.get("ok") != 1 or syncing_stats.get("ok") != 1:
+                source_infos.print(self.logger, self.collections_printed, coll_name)
+                syncing_infos.print(self.logger, self.collections_printed, coll_name)
+                success = False
+                continue
+
+            # Provide hint on where to look within stats.
+            reasons = []
+            if source_stats.get("capped") != syncing_stats.get("capped"):
+                reasons.append("capped")
+            if source_stats.get("ns") != syncing_stats.get("ns"):
+                reasons.append("ns")
+            if syncing_has_indexes and source_stats.get("nindexes") != syncing_stats.get(
+                    "nindexes"):
+                reasons.append("indexes")
+            if syncing_has_indexes and not _compare_sets(
+                    source_stats.get("indexBuilds"), syncing_stats.get("indexBuilds")):
+                reasons.append("indexBuilds")
+
+            if reasons:
+                self._log("the two nodes have different states for the collection {}.{}: {}".format(
+                    db_name, coll_name, ", ".join(reasons)))
+                self._dump_collection_diff(source_infos, syncing_infos, coll_name)
+                success = False
+
+        # If the two nodes have the same hashes for all the collections in the database and there
+        # aren't any capped collections, then the hashes for the whole database should match.
+        if (len(non_capped_colls) == len(source_colls)
+                and source_hash.get("md5") != syncing_hash.get("md5")):
+            self._log("the two nodes have a different has for the {} database: {}".format(
+                db_name, hashes_msg))
+            success = False
+
+        return success
+
+    def _dump_collection_diff(self, source_infos, syncing_infos, coll_name):
+        self.logger.info("Dumping collection: %s", source_infos.ns(coll_name))
+
+        source_exists = source_infos.print(self.logger, self.collections_printed, coll_name)
+        syncing_exists = syncing_infos.print(self.logger, self.collections_printed, coll_name)
+        if not source_exists or not syncing_exists:
+            self.logger.info(
+                "Skipping checking collection differences for %s since it does not exist on both"
+                " nodes", source_infos.ns(coll_name))
+            return
+
+        source_docs = source_infos.find_sorted(coll_name)
+        syncing_docs = syncing_infos.find_sorted(coll_name)
+        missing_on_source = []
+        missing_on_syncing = []
+
+        source_doc = next(source_docs, None)
+        syncing_doc = next(syncing_docs, None)
+        while source_doc is not None or syncing_doc is not None:
+            if syncing_doc is None or (source_doc is not None
+                                       and _id_less_than(source_doc, syncing_doc)):
+                missing_on_syncing.append(source_doc)
+                source_doc = next(source_docs, None)
+            elif source_doc is None or _id_less_than(syncing_doc, source_doc):
+                missing_on_source.append(syncing_doc)
+                syncing_doc = next(syncing_docs, None)
+            else:
+                if source_doc != syncing_doc:
+                    self.logger.info(
+                        "Mismatching documents between the source node %s and the syncing node"
+                        " %s:\n    sourceNode:   %s\n    syncingNode: %s", source_infos.host,
+                        syncing_infos.host, data_consistency.tojson(source_doc),
+                        data_consistency.tojson(syncing_doc))
+                source_doc = next(source_docs, None)
+                syncing_doc = next(syncing_docs, None)
+
+        if missing_on_source:
+            self.logger.info("The following documents are missing on the source node %s:\n%s",
+                             source_infos.host,
+                             "\n".join(data_consistency.tojson(doc) for doc in missing_on_source))
+        if missing_on_syncing:
+            self.logger.info("The following documents are missing on the syncing node %s:\n%s",
+                             syncing_infos.host,
+                             "\n".join(data_consistency.tojson(doc) for doc in missing_on_syncing))
+
+
+class _CollInfos(object):
+    """The listCollections response of a node for a database, mirroring CollInfos in the shell."""
+
+    # Special listCollections filter to prevent reloading the view catalog.
+    LIST_COLLECTIONS_FILTER = {"$or": [{"type": "collection"}, {"type": {"$exists": False}}]}
+
+    def __init__(self, client, conn_name, host, db_name):
+        """Initialize _CollInfos."""
+        self.client = client
+        self.conn_name = conn_name
+        self.host = host
+        self.db_name = db_name
+        self.infos = list(client[db_name].list_collections(filter=self.LIST_COLLECTIONS_FILTER))
+
+    def ns(self, coll_name):  # pylint: disable=invalid-name
+        """Return the namespace of 'coll_name'."""
+        return "{}.{}".format(self.db_name, coll_name)
+
+    def filter(self, coll_names):
+        """Only keep the collections named in 'coll_names'."""
+        self.infos = [info for info in self.infos if info["name"] in coll_names]
+
+    def get_non_capped_coll_names(self):
+        """Return the names of the collections which aren't capped."""
+        return [info["name"] for info in self.infos if not info.get("options", {}).get("capped")]
+
+    def get_coll_stats(self, coll_name):
+        """Return the collStats response for 'coll_name'."""
+        return self.client[self.db_name].command("collStats", coll_name, check=False)
+
+    def find_sorted(self, coll_name):
+        """Return a cursor over the documents of 'coll_name' in _id order."""
+        return self.client[self.db_name][coll_name].find().sort("_id", pymongo.ASCENDING)
+
+    def print(self, logger, collections_printed, coll_name):
+        """Log the collection info and stats once and return True if both could be retrieved."""
+        ns = self.ns(coll_name)  # pylint: disable=invalid-name
+        key = (self.host, ns)
+        already_printed = key in collections_printed
+        collections_printed.add(key)
+
+        coll_info = next((info for info in self.infos if info["name"] == coll_name), None)
+        if coll_info is None:
+            logger.info("%s(%s) collection info for %s: not found", self.conn_name, self.host, ns)
+        elif already_printed:
+            logger.info("%s collection info for %s already printed. Search for '%s(%s)"
+                        " collection info for %s'", self.conn_name, ns, self.conn_name, self.host,
+                        ns)
+        else:
+            logger.info("%s(%s) collection info for %s: %s", self.conn_name, self.host, ns,
+                        data_consistency.tojson(coll_info))
+
+        coll_stats = self.get_coll_stats(coll_name)
+        if coll_stats.get("ok") != 1:
+            logger.info("%s(%s) collStats for %s:  error: %s", self.conn_name, self.host, ns,
+                        data_consistency.tojson(coll_stats))
+        elif already_printed:
+            logger.info("%s collStats for %s already printed. Search for '%s(%s) collStats for %s'",
+                        self.conn_name, ns, self.conn_name, self.host, ns)
+        else:
+            logger.info("%s(%s) collStats for %s: %s", self.conn_name, self.host, ns,
+                        data_consistency.tojson(coll_stats))
+
+        return coll_info is not None and coll_stats.get("ok") == 1
+
+
+def _normalize_coll_info(info):
+    """Return a copy of 'info' without the fields which are allowed to differ between versions."""
+    info = dict(info)
+    # The 'flags' collection option was removed in 4.2.
+    info["options"] = {
+        key: value
+        for (key, value) in info.get("options", {}).items() if key != "flags"
+    }
+    # The 'ns' field was removed from index specs in 4.4.
+    if "idIndex" in info:
+        info["idIndex"] = {key: value for (key, value) in info["idIndex"].items() if key != "ns"}
+    return info
+
+
+def _compare_sets(left, right):
+    """Return True if both lists have the same elements, treating None as distinct from empty."""
+    if left is None or right is None:
+        return left is None and right is None
+    return set(left) == set(right)
+
+
+def _id_less_than(left_doc, right_doc):
+    """Return True if the _id of 'left_doc' sorts before the _id of 'right_doc'."""
+    return _bson_sort_key(left_doc["_id"]) < _bson_sort_key(right_doc["_id"])
+
+
+def _bson_sort_key(value):  # pylint: disable=too-many-return-statements
+    """Return a key which orders BSON values the same as the server sorts them.
+
+    Values are ordered by their canonical BSON type first (numbers < strings < objects < arrays <
+    binary data < ObjectId < ...), and then by their value.
+    """
+    # Check bool before the numbers since bool is a subclass of int.
+    if isinstance(value, bool):
+        return (_BSON_TYPE_ORDER["bool"], value)
+    if value is None:
+        return (_BSON_TYPE_ORDER["null"], )
+    if isinstance(value, bson.min_key.MinKey):
+        return (_BSON_TYPE_ORDER["min_key"], )
+    if isinstance(value, bson.max_key.MaxKey):
+        return (_BSON_TYPE_ORDER["max_key"], )
+    if isinstance(value, bson.decimal128.Decimal128):
+        return (_BSON_TYPE_ORDER["number"], value.to_decimal())
+    if isinstance(value, (int, float)):
+        return (_BSON_TYPE_ORDER["number"], value)
+    # Check Code before the strings since Code is a subclass of str.
+    if isinstance(value, bson.code.Code):
+        return (_BSON_TYPE_ORDER["code"], str(value), _bson_sort_key(value.scope or {}))
+    if isinstance(value, str):
+        return (_BSON_TYPE_ORDER["string"], value)
+    if isinstance(value, bson.dbref.DBRef):
+        return _bson_sort_key(value.as_doc())
+    if isinstance(value, dict):
+        return (_BSON_TYPE_ORDER["object"],
+                tuple((_bson_sort_key(item)[0], name, _bson_sort_key(item))
+                      for (name, item) in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (_BSON_TYPE_ORDER["array"], tuple(_bson_sort_key(item) for item in value))
+    if isinstance(value, bytes):
+        subtype = getattr(value, "subtype", bson.binary.BINARY_SUBTYPE)
+        return (_BSON_TYPE_ORDER["binary"], len(value), subtype, bytes(value))
+    if isinstance(value, bson.objectid.ObjectId):
+        return (_BSON_TYPE_ORDER["object_id"], value.binary)
+    if isinstance(value, datetime.datetime):
+        return (_BSON_TYPE_ORDER["date"], value)
+    if isinstance(value, bson.timestamp.Timestamp):
+        return (_BSON_TYPE_ORDER["timestamp"], value.time, value.inc)
+    if isinstance(value, bson.regex.Regex):
+        return (_BSON_TYPE_ORDER["regex"], value.pattern, value.flags)
+
+    raise TypeError("Cannot order a value of type {}".format(type(value).__name__))
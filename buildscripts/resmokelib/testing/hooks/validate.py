@@ -1,23 +1,120 @@
 """Test hook for verifying the consistency and integrity of collection and index data."""
 
+import functools
 import os.path
 
-from buildscripts.resmokelib.testing.hooks import jsfile
+from buildscripts.resmokelib import errors
+from buildscripts.resmokelib.testing.fixtures import interface as fixture_interface
+from buildscripts.resmokelib.testing.hooks import data_consistency
 
 
-class ValidateCollections(jsfile.DataConsistencyHook):
+class ValidateCollections(data_consistency.PythonDataConsistencyHook):
     """Run full validation.
 
     This will run on all collections in all databases on every stand-alone
     node, primary replica-set node, or primary shard node.
+
+    Setting 'use_python' runs the validate commands from resmoke.py instead of from a mongo shell
+    running jstests/hooks/run_validate_collections.js. Every node is validated concurrently.
     """
 
     IS_BACKGROUND = False
 
-    def __init__(  # pylint: disable=super-init-not-called
-            self, hook_logger, fixture, shell_options=None):
+    # The number of documents logged for a collection which failed validation.
+    DUMP_COLLECTION_LIMIT = 100
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self, hook_logger, fixture, shell_options=None, use_python=False, auth_options=None):
         """Initialize ValidateCollections."""
         description = "Full collection validation"
         js_filename = os.path.join("jstests", "hooks", "run_validate_collections.js")
-        jsfile.JSHook.__init__(  # pylint: disable=non-parent-init-called
-            self, hook_logger, fixture, js_filename, description, shell_options=shell_options)
+        data_consistency.PythonDataConsistencyHook.__init__(
+            self, hook_logger, fixture, js_filename, description, shell_options=shell_options,
+            use_python=use_python, auth_options=auth_options)
+
+    def _can_run_python_check(self):
+        """Return True if the check supports the fixture and options it was given."""
+        # Changing the featureCompatibilityVersion before validating is left to the mongo shell.
+        if self._test_data.get("forceValidationWithFeatureCompatibilityVersion"):
+            return False
+        return data_consistency.PythonDataConsistencyHook._can_run_python_check(self)
+
+    def _run_python_check(self, logger):
+        """Validate every collection on every node."""
+        results = []
+
+        def validate_node(node):
+            results.append(self._validate_node(logger, node))
+
+        fixture_interface.run_concurrently(
+            functools.partial(validate_node, node)
+            for node in data_consistency.get_mongod_nodes(self.fixture))
+
+        if not all(results):
+            raise errors.TestFailure("Collection validation failed")
+
+    def _validate_node(self, logger, node):
+        """Return True if every collection on 'node' is valid."""
+        host = data_consistency.get_host(node)
+        logger.info("Running validate() on %s", host)
+        client = self._clients.get(node)
+
+        # Skip validating collections for arbiters.
+        if data_consistency.is_arbiter(client):
+            logger.info("Skipping collection validation on arbiter %s", host)
+            return True
+
+        for db_name in client.list_database_names():
+            if not self._validate_database(logger, host, client[db_name]):
+                return False
+        return True
+
+    def _get_list_collections_filter(self, db_name):
+        # Don't run validate on view namespaces.
+        list_filter = {"type": "collection"}
+        if self._test_data.get("skipValidationOnInvalidViewDefinitions"):
+            # Avoid resolving the view catalog on the admin database.
+            list_filter = {"$or": [list_filter, {"type": {"$exists": False}}]}
+
+        skipped_collections = []
+        for namespace in self._test_data.get("skipValidationNamespaces") or []:
+            (ns_db_name, _, coll_name) = namespace.partition(".")
+            if ns_db_name == db_name and coll_name:
+                skipped_collections.append({"name": {"$ne": coll_name}})
+        if skipped_collections:
+            list_filter = {"$and": [list_filter] + skipped_collections}
+
+        return list_filter
+
+    def _validate_database(self, logger, host, database):
+        """Return True if every collection of 'database' is valid."""
+        success = True
+        for coll_info in database.list_collections(
+                filter=self._get_list_collections_filter(database.name)):
+            coll = database[coll_info["name"]]
+            res = database.command("validate", coll.name, full=True, check=False)
+            if res.get("ok") == 1 and res.get("valid"):
+                continue
+
+            if (self._test_data.get("skipValidationOnNamespaceNotFound")
+                    and res.get("codeName") == "NamespaceNotFound"):
+                # The list of collections can be out of date if operations are still being
+                # applied from the oplog, such as during a 'stopStart' backup/restore.
+                logger.info("Skipping collection validation for %s since collection was not found",
+                            coll.full_name)
+                continue
+
+            logger.info("Collection validation failed on host %s with response: %s", host,
+                        data_consistency.tojson(res))
+            self._dump_collection(logger, coll)
+            success = False
+
+        return success
+
+    def _dump_collection(self, logger, coll):
+        logger.info("Printing indexes in: %s\n%s", coll.full_name,
+                    data_consistency.tojson(list(coll.list_indexes())))
+        logger.info("Printing the first %d documents in: %s\n%s", self.DUMP_COLLECTION_LIMIT,
+                    coll.full_name, "\n".join(
+                        data_consistency.tojson(doc)
+                        for doc in coll.find().limit(self.DUMP_COLLECTION_LIMIT)))
@@ -0,0 +1,69 @@
+"""Manage interactions with the test runtimes file used to run the longest tests first."""
+
+import json
+import os
+
+from buildscripts.resmokelib import config
+
+# Weight given to the latest runtime of a test when updating the runtimes file, so that a single
+# unusually slow or fast run does not completely change the order of the tests.
+_LATEST_RUNTIME_WEIGHT = 0.5
+
+
+def read():
+    """Return a dict of test name to runtime in seconds from the --testRuntimesFile file."""
+
+    if config.TEST_RUNTIMES_FILE is None or not os.path.isfile(config.TEST_RUNTIMES_FILE):
+        return {}
+
+    with open(config.TEST_RUNTIMES_FILE, "r") as fp:
+        runtimes = json.load(fp)
+
+    # Also accept the list of (test_name, runtime) pairs produced by
+    # buildscripts.util.teststats.HistoricTaskData.get_tests_runtimes().
+    if isinstance(runtimes, list):
+        runtimes = dict(runtimes)
+
+    return {test_name: float(runtime) for test_name, runtime in runtimes.items()}
+
+
+def order_longest_first(tests, runtimes):
+    """Return 'tests' sorted by decreasing runtime.
+
+    Tests without a known runtime are assumed to take the average runtime of the known tests. The
+    sort is stable, so tests with the same runtime keep their relative order.
+    """
+
+    known = [runtimes[test] for test in tests if test in runtimes]
+    if not known:
+        return list(tests)
+
+    default_runtime = sum(known) / len(known)
+    return sorted(tests, key=lambda test: runtimes.get(test, default_runtime), reverse=True)
+
+
+def write(suites):
+    """Merge the runtimes of the tests that ran into the file if --testRuntimesFile was specified."""
+
+    if config.TEST_RUNTIMES_FILE is None:
+        return
+
+    runtimes = read()
+
+    for suite in suites:
+        tests = set(suite.tests)
+        for report in suite.get_reports():
+            for test_info in report.test_infos:
+                # Hooks and dynamic test cases are not scheduled on their own.
+                if test_info.test_file not in tests or test_info.end_time is None:
+                    continue
+
+                elapsed = test_info.end_time - test_info.start_time
+                previous = runtimes.get(test_info.test_file)
+                if previous is not None:
+                    elapsed = (_LATEST_RUNTIME_WEIGHT * elapsed +
+                               (1 - _LATEST_RUNTIME_WEIGHT) * previous)
+                runtimes[test_info.test_file] = elapsed
+
+    with open(config.TEST_RUNTIMES_FILE, "w") as fp:
+        json.dump(runtimes, fp, indent=2, sort_keys=True)
@@ -1,6 +1,8 @@
 """Archival utility."""
 
 import collections
+import concurrent.futures
+import gzip
 import json
 import os
 import queue
@@ -20,7 +22,7 @@ if _IS_WINDOWS:
     import ctypes
 
 UploadArgs = collections.namedtuple("UploadArgs", [
-    "archival_file", "display_name", "local_file", "content_type", "s3_bucket", "s3_path",
+    "archival_file", "display_name", "spool_file", "content_type", "s3_bucket", "s3_path",
     "delete_file"
 ])
 
@@ -69,6 +71,171 @@ def free_space(path):
     return stat.f_bavail * stat.f_bsize
 
 
+class ParallelGzipWriter(object):
+    """File-like object which gzip compresses the data written to it on multiple threads.
+
+    The data is split into blocks which are compressed independently, each into its own gzip
+    member. A sequence of gzip members is itself a valid gzip file (RFC 1952), so the output can be
+    read by gzip, tar and Python's gzip and tarfile modules like any other .tgz file. Compressed
+    blocks are written to 'fileobj' in order.
+    """
+
+    BLOCK_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, fileobj, num_threads=None, compresslevel=6, block_size=BLOCK_SIZE):
+        """Initialize ParallelGzipWriter."""
+        self._fileobj = fileobj
+        self._num_threads = num_threads or os.cpu_count() or 1
+        self._compresslevel = compresslevel
+        self._block_size = block_size
+        self._buffer = bytearray()
+        self._pending = collections.deque()
+        self._num_blocks = 0
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self._num_threads)
+
+    def write(self, data):
+        """Buffer 'data' and compress every full block of it."""
+        self._buffer += data
+        while len(self._buffer) >= self._block_size:
+            self._compress_block(bytes(self._buffer[:self._block_size]))
+            del self._buffer[:self._block_size]
+        return len(data)
+
+    def _compress_block(self, block):
+        self._pending.append(self._executor.submit(gzip.compress, block, self._compresslevel))
+        self._num_blocks += 1
+        # Bound the memory used by blocks waiting to be written.
+        while len(self._pending) > 2 * self._num_threads:
+            self._fileobj.write(self._pending.popleft().result())
+
+    def close(self):
+        """Compress the remaining data and write all of the compressed blocks to 'fileobj'."""
+        try:
+            # An empty input still needs one gzip member to be a valid gzip file.
+            if self._buffer or not self._num_blocks:
+                self._compress_block(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self._fileobj.write(self._pending.popleft().result())
+        finally:
+            self._executor.shutdown(wait=True)
+
+
+class SpoolFile(object):
+    """Temporary file which another thread can read from while it is still being written.
+
+    Readers see the data as it is written, and reach the end of the file only once close() has been
+    called. If close() is called with an error, then readers raise an IOError instead.
+    """
+
+    def __init__(self, suffix=None):
+        """Initialize SpoolFile."""
+        (fd, self.name) = tempfile.mkstemp(suffix=suffix)
+        self._file_handle = os.fdopen(fd, "wb")
+        self._cond = threading.Condition()
+        self._size = 0
+        self._closed = False
+        self._error = None
+
+    @property
+    def size(self):
+        """Return the number of bytes written so far."""
+        with self._cond:
+            return self._size
+
+    def write(self, data):
+        """Append 'data' to the file."""
+        self._file_handle.write(data)
+        self._file_handle.flush()
+        with self._cond:
+            self._size += len(data)
+            self._cond.notify_all()
+        return len(data)
+
+    def close(self, error=None):
+        """Mark the file as complete, or as failed if 'error' is specified."""
+        try:
+            self._file_handle.close()
+        finally:
+            with self._cond:
+                self._closed = True
+                self._error = error
+                self._cond.notify_all()
+
+    def wait_for_data(self, offset):
+        """Wait until there is data past 'offset' or the file is complete.
+
+        Return the number of bytes available past 'offset', which is 0 at the end of the file.
+        """
+        with self._cond:
+            while self._size <= offset and not self._closed:
+                self._cond.wait()
+            if self._error is not None:
+                raise IOError("Unable to create {}: {}".format(self.name, self._error))
+            return self._size - offset
+
+    def open_reader(self):
+        """Return a file-like object reading from the beginning of the file."""
+        return SpoolFileReader(self)
+
+
+class SpoolFileReader(object):
+    """Non-seekable file-like object reading from a SpoolFile while it is being written."""
+
+    def __init__(self, spool_file):
+        """Initialize SpoolFileReader."""
+        self._spool_file = spool_file
+        self._file_handle = open(spool_file.name, "rb")
+        self._offset = 0
+
+    def read(self, size=-1):
+        """Read up to 'size' bytes, or until the end of the file if 'size' is negative.
+
+        Fewer than 'size' bytes are only returned at the end of the file.
+        """
+        chunks = []
+        remaining = size if size is not None and size >= 0 else None
+        while remaining is None or remaining > 0:
+            available = self._spool_file.wait_for_data(self._offset)
+            if not available:
+                break
+            data = self._file_handle.read(
+                available if remaining is None else min(available, remaining))
+            self._offset += len(data)
+            chunks.append(data)
+            if remaining is not None:
+                remaining -= len(data)
+        return b"".join(chunks)
+
+    def close(self):
+        """Close the reader."""
+        self._file_handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def append_archival_record(archival_file, archival_record, first_record):
+    """Append 'archival_record' to the JSON list in 'archival_file'.
+
+    The file is rewritten if 'first_record' is true. Otherwise only the closing bracket of the list
+    is overwritten, so the time it takes doesn't grow with the number of records, and the file
+    always holds a complete JSON list.
+    """
+    record_json = json.dumps(archival_record)
+    if first_record:
+        with open(archival_file, "w") as archival_fh:
+            archival_fh.write("[{}]".format(record_json))
+        return
+
+    with open(archival_file, "r+b") as archival_fh:
+        archival_fh.seek(-1, os.SEEK_END)
+        archival_fh.write(", {}]".format(record_json).encode("utf-8"))
+
+
 def remove_file(file_name):
     """Attempt to remove file. Return status and message."""
     try:
@@ -134,7 +301,7 @@ class Archival(object):  # pylint: disable=too-many-instance-attributes
 
         Archive is not done if user specified limits are reached. The size limit is
         enforced after it has been exceeded, since it can only be calculated after the
-        tar/gzip has been done.
+        tar/gzip has been done. The upload to S3 starts while the tar/gzip is still being done.
 
         Return status and message, where message contains information if status is non-0.
         """
@@ -164,7 +331,7 @@ class Archival(object):  # pylint: disable=too-many-instance-attributes
     @staticmethod
     def _update_archive_file_wkr(work_queue, logger):
         """Worker thread: Update the archival JSON file from 'work_queue'."""
-        archival_json = []
+        first_record = True
         while True:
             archive_args = work_queue.get()
             # Exit worker thread when sentinel is received.
@@ -177,9 +344,12 @@ class Archival(object):  # pylint: disable=too-many-instance-attributes
             }
             logger.debug("Updating archive file %s with %s", archive_args.archival_file,
                          archival_record)
-            archival_json.append(archival_record)
-            with open(archive_args.archival_file, "w") as archival_fh:
-                json.dump(archival_json, archival_fh)
+            try:
+                append_archival_record(archive_args.archival_file, archival_record, first_record)
+                first_record = False
+            except (IOError, OSError) as err:
+                logger.error("Unable to update archive file %s: %s", archive_args.archival_file,
+                             err)
             work_queue.task_done()
 
     @staticmethod
@@ -193,20 +363,24 @@ class Archival(object):  # pylint: disable=too-many-instance-attributes
                 archive_file_work_queue.put(None)
                 break
             extra_args = {"ContentType": upload_args.content_type, "ACL": "public-read"}
-            logger.debug("Uploading to S3 %s to bucket %s path %s", upload_args.local_file,
+            local_file = upload_args.spool_file.name
+            logger.debug("Uploading to S3 %s to bucket %s path %s", local_file,
                          upload_args.s3_bucket, upload_args.s3_path)
             upload_completed = False
             try:
-                s3_client.upload_file(upload_args.local_file, upload_args.s3_bucket,
-                                      upload_args.s3_path, ExtraArgs=extra_args)
+                # The archive is read while it is still being created, so the upload is a
+                # multipart upload of a stream rather than of a file of known size.
+                with upload_args.spool_file.open_reader() as reader:
+                    s3_client.upload_fileobj(reader, upload_args.s3_bucket, upload_args.s3_path,
+                                             ExtraArgs=extra_args)
                 upload_completed = True
-                logger.debug("Upload to S3 completed for %s to bucket %s path %s",
-                             upload_args.local_file, upload_args.s3_bucket, upload_args.s3_path)
+                logger.debug("Upload to S3 completed for %s to bucket %s path %s", local_file,
+                             upload_args.s3_bucket, upload_args.s3_path)
             except Exception as err:  # pylint: disable=broad-except
                 logger.exception("Upload to S3 error %s", err)
 
             if upload_args.delete_file:
-                status, message = remove_file(upload_args.local_file)
+                status, message = remove_file(local_file)
                 if status:
                     logger.error("Upload to S3 delete file error %s", message)
 
@@ -222,8 +396,10 @@ class Archival(object):  # pylint: disable=too-many-instance-attributes
         """
         Gather 'input_files' into a single tar/gzip and archive to 's3_path'.
 
-        The caller waits until the list of files has been tar/gzipped to a temporary file.
-        The S3 upload and subsequent update to 'archival_json_file' will be done asynchronosly.
+        The caller waits until the list of files has been tar/gzipped to a temporary file, which
+        is compressed on multiple threads. The S3 upload streams the temporary file while it is
+        being written, and it and the subsequent update to 'archival_json_file' are done
+        asynchronously.
 
         Returns status, message and size_mb of archive.
         """
@@ -254,34 +430,46 @@ class Archival(object):  # pylint: disable=too-many-instance-attributes
         message = "Tar/gzip {} files: {}".format(display_name, input_files)
 
         # Tar/gzip to a temporary file.
-        _, temp_file = tempfile.mkstemp(suffix=".tgz")
+        spool_file = SpoolFile(suffix=".tgz")
 
         # Check if there is sufficient space for the temporary tgz file.
-        if file_list_size(input_files) > free_space(temp_file):
-            status, message = remove_file(temp_file)
+        if file_list_size(input_files) > free_space(spool_file.name):
+            spool_file.close()
+            status, message = remove_file(spool_file.name)
             if status:
                 self.logger.warning("Removing tarfile due to insufficient space - %s", message)
             return 1, "Insufficient space for {}".format(message), 0
 
+        # The upload worker removes the temporary file once it is done with it, including when
+        # the tar/gzip fails.
+        self._upload_queue.put(
+            UploadArgs(self.archival_json_file, display_name, spool_file, "application/x-gzip",
+                       s3_bucket, s3_path, True))
+
         try:
-            with tarfile.open(temp_file, "w:gz") as tar_handle:
-                for input_file in input_files:
-                    try:
-                        tar_handle.add(input_file)
-                    except (IOError, OSError, tarfile.TarError) as err:
-                        message = "{}; Unable to add {} to archive file: {}".format(
-                            message, input_file, err)
+            gzip_writer = ParallelGzipWriter(spool_file)
+            try:
+                with tarfile.open(fileobj=gzip_writer, mode="w|") as tar_handle:
+                    for input_file in input_files:
+                        try:
+                            tar_handle.add(input_file)
+                        except (IOError, OSError, tarfile.TarError) as err:
+                            message = "{}; Unable to add {} to archive file: {}".format(
+                                message, input_file, err)
+            finally:
+                gzip_writer.close()
         except (IOError, OSError, tarfile.TarError) as err:
-            status, message = remove_file(temp_file)
-            if status:
-                self.logger.warning("Removing tarfile due to creation failure - %s", message)
+            spool_file.close(error=err)
             return 1, str(err), 0
+        except BaseException as err:
+            # Don't leave the upload worker waiting for the rest of the archive.
+            spool_file.close(error=err)
+            raise
+
+        spool_file.close()
 
         # Round up the size of the archive.
-        size_mb = int(math.ceil(float(file_list_size(temp_file)) / (1024 * 1024)))
-        self._upload_queue.put(
-            UploadArgs(self.archival_json_file, display_name, temp_file, "application/x-gzip",
-                       s3_bucket, s3_path, True))
+        size_mb = int(math.ceil(float(spool_file.size) / (1024 * 1024)))
 
         return status, message, size_mb
 
@@ -1,8 +1,17 @@
 """Filesystem-related helper functions."""
 
 import os
+import shutil
+import sys
 import tempfile
 
+if sys.platform.startswith("linux"):
+    import fcntl
+
+# The FICLONE ioctl from linux/fs.h, which makes the destination file share the extents of the source
+# file until either is written to.
+_FICLONE = 0x40049409
+
 
 def mkdtemp_in_build_dir():
     """Use build/ as the temp directory since it's mapped to an EBS volume on Evergreen hosts."""
@@ -37,3 +46,27 @@ def build_hygienic_bin_path(parent=None, child=None):
         res = pjoin(res, child)
 
     return res
+
+
+def _clone_file(source, dest):
+    """Copy 'source' to 'dest' as a copy-on-write clone if the filesystem supports reflinks."""
+    if sys.platform.startswith("linux"):
+        try:
+            with open(source, "rb") as src, open(dest, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            shutil.copystat(source, dest)
+            return dest
+        except OSError:
+            # The filesystem doesn't support reflinks, e.g. ext4 or tmpfs.
+            pass
+    return shutil.copy2(source, dest)
+
+
+def clone_directory(source, dest, ignore_patterns=()):
+    """Recursively copy the 'source' directory to 'dest', which must not exist yet.
+
+    Files are cloned instead of copied where the filesystem allows it. They are never hard linked
+    since both copies may be modified in place afterwards.
+    """
+    ignore = shutil.ignore_patterns(*ignore_patterns) if ignore_patterns else None
+    shutil.copytree(source, dest, ignore=ignore, copy_function=_clone_file)
@@ -1,12 +1,46 @@
 """Utility for parsing JS comments."""
 
+import concurrent.futures
+import json
+import os
 import re
+import threading
 
 import yaml
 
+from buildscripts.util import fileops
+
 # TODO: use a more robust regular expression for matching tags
 _JSTEST_TAGS_RE = re.compile(r".*@tags\s*:\s*(\[[^\]]*\])", re.DOTALL)
 
+# The opening line of an immediately invoked function expression wrapping a whole test.
+_IIFE_RE = re.compile(r"^\(\s*(async\s+)?function\s*\(\s*\)\s*\{$")
+
+
+def _read_preamble(fp):
+    """Return the leading part of a JS file in which tags may be declared.
+
+    The preamble consists of comments, blank lines, single-line statements such as 'use strict' or
+    load() calls, and the opening line of a wrapping function. Reading stops at the first other
+    line of code so the rest of the test does not need to be read or matched against.
+    """
+    lines = []
+    in_block_comment = False
+
+    for line in fp:
+        stripped = line.strip()
+        if in_block_comment:
+            in_block_comment = "*/" not in stripped
+        elif stripped.startswith("/*"):
+            in_block_comment = "*/" not in stripped[2:]
+        elif (stripped and not stripped.startswith("//")
+              and not stripped.split("//")[0].rstrip().endswith(";")
+              and not _IIFE_RE.match(stripped)):
+            break
+        lines.append(line)
+
+    return "".join(lines)
+
 
 def get_tags(pathname):
     """Return the list of tags found in the (JS-style) comments of 'pathname'.
@@ -28,7 +62,7 @@ def get_tags(pathname):
     """
 
     with open(pathname, 'r', encoding='utf-8') as fp:
-        match = _JSTEST_TAGS_RE.match(fp.read())
+        match = _JSTEST_TAGS_RE.match(_read_preamble(fp))
         if match:
             try:
                 # TODO: it might be worth supporting the block (indented) style of YAML lists in
@@ -75,3 +109,92 @@ def _strip_jscomments(string):
         yaml_lines.append(line)
 
     return "\n".join(yaml_lines)
+
+
+class TagsCache(object):
+    """An index of the tags found in JS test files, persisted on disk between invocations.
+
+    Entries are keyed by path and are only reused while the file's mtime and size are unchanged.
+    """
+
+    _VERSION = 1
+
+    def __init__(self, cache_file=None, num_threads=None):
+        """Initialize the TagsCache, loading the index from 'cache_file' if it exists."""
+        self._cache_file = cache_file
+        self._num_threads = num_threads if num_threads else min(32, (os.cpu_count() or 1) * 4)
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._dirty = False
+
+        if cache_file is not None:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self._cache_file, "r") as fp:
+                index = json.load(fp)
+        except (OSError, ValueError):
+            return
+
+        if isinstance(index, dict) and index.get("version") == self._VERSION:
+            self._entries = index.get("entries", {})
+
+    @staticmethod
+    def _stat_key(pathname):
+        stat = os.stat(pathname)
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _lookup(self, pathname):
+        """Return the cached tags for 'pathname' and its stat key, the tags are None on a miss."""
+        stat_key = self._stat_key(pathname)
+        with self._lock:
+            entry = self._entries.get(pathname)
+        if entry is not None and entry[:2] == stat_key:
+            return entry[2], stat_key
+        return None, stat_key
+
+    def _update(self, pathname, stat_key, tags):
+        with self._lock:
+            self._entries[pathname] = stat_key + [tags]
+            self._dirty = True
+
+    def get_tags(self, pathname):
+        """Return the list of tags of 'pathname', parsing the file if it is not cached."""
+        tags, stat_key = self._lookup(pathname)
+        if tags is None:
+            tags = get_tags(pathname)
+            self._update(pathname, stat_key, tags)
+        return list(tags)
+
+    def prefetch(self, pathnames):
+        """Parse the tags of all the uncached files in 'pathnames' concurrently and save the index."""
+        misses = []
+        for pathname in pathnames:
+            tags, stat_key = self._lookup(pathname)
+            if tags is None:
+                misses.append((pathname, stat_key))
+
+        if misses:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self._num_threads) as pool:
+                futures = [(pathname, stat_key, pool.submit(get_tags, pathname))
+                           for (pathname, stat_key) in misses]
+                for (pathname, stat_key, future) in futures:
+                    self._update(pathname, stat_key, future.result())
+
+        self.save()
+
+    def save(self):
+        """Write the index to disk if it changed since it was loaded."""
+        if self._cache_file is None or not self._dirty:
+            return
+
+        with self._lock:
+            index = {"version": self._VERSION, "entries": dict(self._entries)}
+            self._dirty = False
+
+        try:
+            fileops.write_file_atomically(self._cache_file, json.dumps(index))
+        except OSError:
+            # The index is only an optimization.
+            pass
@@ -13,9 +13,12 @@ from outgrowing the storage capacity.
 
 import argparse
 import collections
+import json
 import logging
 import os
 import shutil
+import sqlite3
+import time
 
 LOGGER = logging.getLogger("scons.cache.prune.lru")  # type: ignore
 
@@ -23,6 +26,19 @@ GIGBYTES = 1024 * 1024 * 1024
 
 CacheItem = collections.namedtuple("CacheContents", ["path", "time", "size"])
 
+# The index of the cache contents and the journals of cache accesses are kept in this directory
+# of the cache, the layout must match the one written by the CacheIndexJournal class in the
+# validate_cache_dir.py tool in scons.
+INDEX_DIR_NAME = ".prune_index"
+OPEN_JOURNAL_EXT = ".open"
+COMPLETE_JOURNAL_EXT = ".log"
+
+# Journals still open after this long belong to SCons processes which did not exit cleanly.
+STALE_JOURNAL_SECONDS = 24 * 60 * 60
+
+# Number of least recently used items to fetch from the index at a time while pruning.
+PRUNE_BATCH_SIZE = 1000
+
 
 def get_cachefile_size(file_path):
     """Get the size of the cachefile."""
@@ -37,6 +53,16 @@ def get_cachefile_size(file_path):
     return size
 
 
+def get_cachefile_contents_path(file_path):
+    """Get the path of the file holding the contents of a cache item."""
+
+    if file_path.lower().endswith('.cksum'):
+        # This must match the layout of the directories created by the validate_cache_dir.py tool
+        # in scons.
+        return os.path.join(file_path, os.path.basename(file_path).split('.')[0])
+    return file_path
+
+
 def collect_cache_contents(cache_path):
     """Collect the cache contents."""
     # map folder names to timestamps
@@ -47,7 +73,7 @@ def collect_cache_contents(cache_path):
     for name in os.listdir(cache_path):
         path = os.path.join(cache_path, name)
 
-        if os.path.isdir(path):
+        if os.path.isdir(path) and name != INDEX_DIR_NAME:
             for file_name in os.listdir(path):
                 file_path = os.path.join(path, file_name)
                 # Cache prune script is allowing only directories with this extension
@@ -74,6 +100,157 @@ def collect_cache_contents(cache_path):
     return (total, contents)
 
 
+class CacheIndex(object):
+    """
+    Persistent index of the size and last access time of the items in the cache.
+
+    SCons records every item it pushes to or retrieves from the cache in journal files, which are
+    merged into the index each time the cache is pruned, so the cache only needs to be walked
+    when the index is periodically rebuilt to reconcile it with the cache contents.
+    """
+
+    def __init__(self, cache_path):
+        """Open the index of the given cache, creating it if needed."""
+        self.cache_path = cache_path
+        self.index_dir = os.path.join(cache_path, INDEX_DIR_NAME)
+        self.journal_dir = os.path.join(self.index_dir, "journal")
+        os.makedirs(self.journal_dir, exist_ok=True)
+
+        self.db = sqlite3.connect(os.path.join(self.index_dir, "index.sqlite"))
+        self.db.execute("CREATE TABLE IF NOT EXISTS entries "
+                        "(path TEXT PRIMARY KEY, time REAL NOT NULL, size INTEGER NOT NULL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS entries_by_time ON entries (time)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)")
+        self.db.commit()
+
+    def close(self):
+        """Close the index."""
+        self.db.close()
+
+    def get_last_full_scan(self):
+        """Get the time the index was last rebuilt from the cache contents, or None."""
+        row = self.db.execute("SELECT value FROM metadata WHERE key = 'last_full_scan'").fetchone()
+        return float(row[0]) if row else None
+
+    def get_journals(self):
+        """Get the journals which are complete and can be merged into the index."""
+        journals = []
+        now = time.time()
+        for entry in os.scandir(self.journal_dir):
+            if entry.name.endswith(COMPLETE_JOURNAL_EXT):
+                journals.append(entry.path)
+            elif entry.name.endswith(OPEN_JOURNAL_EXT):
+                try:
+                    if now - entry.stat().st_mtime > STALE_JOURNAL_SECONDS:
+                        journals.append(entry.path)
+                except OSError:
+                    pass
+        return journals
+
+    def _upsert(self, path, access_time, size):
+        cursor = self.db.execute(
+            "UPDATE entries SET time = MAX(time, ?), size = ? WHERE path = ?",
+            (access_time, size, path))
+        if cursor.rowcount == 0:
+            self.db.execute("INSERT INTO entries (path, time, size) VALUES (?, ?, ?)",
+                            (path, access_time, size))
+
+    def merge_journals(self):
+        """Merge the complete journals into the index and remove them."""
+        journals = self.get_journals()
+        entries = 0
+        for journal in journals:
+            try:
+                with open(journal) as journal_file:
+                    for line in journal_file:
+                        try:
+                            entry = json.loads(line)
+                            self._upsert(entry["path"], entry["time"], entry["size"])
+                            entries += 1
+                        except (ValueError, KeyError, TypeError):
+                            LOGGER.warning("Ignoring malformed entry in journal %s", journal)
+            except OSError as err:
+                LOGGER.warning("Unable to read journal %s : %s", journal, err)
+        self.db.commit()
+
+        self._remove_journals(journals)
+        LOGGER.info("merged %d entries from %d journals into the index", entries, len(journals))
+
+    def _remove_journals(self, journals):
+        for journal in journals:
+            try:
+                os.remove(journal)
+            except OSError as err:
+                LOGGER.warning("Unable to remove journal %s : %s", journal, err)
+
+    def rebuild(self):
+        """Rebuild the index from a full scan of the cache."""
+        # Journals written before the scan starts are superseded by it.
+        journals = self.get_journals()
+        scan_time = time.time()
+
+        (_, contents) = collect_cache_contents(self.cache_path)
+
+        self.db.execute("DELETE FROM entries")
+        self.db.executemany(
+            "INSERT OR REPLACE INTO entries (path, time, size) VALUES (?, ?, ?)",
+            ((os.path.relpath(item.path, self.cache_path), item.time, item.size)
+             for item in contents))
+        self.db.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES ('last_full_scan', ?)",
+                        (str(scan_time), ))
+        self.db.commit()
+
+        self._remove_journals(journals)
+        LOGGER.info("rebuilt the index with %d items from a full scan of the cache", len(contents))
+
+    def total_size(self):
+        """Get the total size of the items in the index."""
+        return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def least_recently_used(self, limit):
+        """Get the least recently used items in the index."""
+        return [
+            CacheItem(path=os.path.join(self.cache_path, path), time=access_time, size=size)
+            for path, access_time, size in self.db.execute(
+                "SELECT path, time, size FROM entries ORDER BY time LIMIT ?", (limit, ))
+        ]
+
+    def update_time(self, cache_item, access_time):
+        """Update the last access time of an item."""
+        self.db.execute("UPDATE entries SET time = ? WHERE path = ?",
+                        (access_time, os.path.relpath(cache_item.path, self.cache_path)))
+
+    def remove(self, cache_item):
+        """Remove an item from the index."""
+        self.db.execute("DELETE FROM entries WHERE path = ?",
+                        (os.path.relpath(cache_item.path, self.cache_path), ))
+
+
+def remove_cache_item(cache_item):
+    """Remove an item from the cache, return True if it no longer exists."""
+    to_remove = cache_item.path + ".del"
+    try:
+        os.rename(cache_item.path, to_remove)
+    except FileNotFoundError:
+        # another process already cleared the file.
+        return True
+    except Exception as err:  # pylint: disable=broad-except
+        LOGGER.warning("Unable to rename %s : %s", cache_item, err)
+        return False
+
+    try:
+        if os.path.isdir(to_remove):
+            shutil.rmtree(to_remove)
+        else:
+            os.remove(to_remove)
+    except Exception as err:  # pylint: disable=broad-except
+        # this should not happen, but who knows?
+        LOGGER.error("error [%s, %s] removing file '%s', "
+                     "please report this error", err, type(err), to_remove)
+        return False
+    return True
+
+
 def prune_cache(cache_path, cache_size_gb, clean_ratio):
     """Prune the cache."""
     # This function is taken as is from waf, with the interface cleaned up and some minor
@@ -100,23 +277,8 @@ def prune_cache(cache_path, cache_size_gb, clean_ratio):
                 return False
 
             cache_item = contents.pop()
-            to_remove = cache_item.path + ".del"
-            try:
-                os.rename(cache_item.path, to_remove)
-            except Exception as err:  # pylint: disable=broad-except
-                # another process may have already cleared the file.
-                LOGGER.warning("Unable to rename %s : %s", cache_item, err)
-            else:
-                try:
-                    if os.path.isdir(to_remove):
-                        shutil.rmtree(to_remove)
-                    else:
-                        os.remove(to_remove)
-                    total_size -= cache_item.size
-                except Exception as err:  # pylint: disable=broad-except
-                    # this should not happen, but who knows?
-                    LOGGER.error("error [%s, %s] removing file '%s', "
-                                 "please report this error", err, type(err), to_remove)
+            if remove_cache_item(cache_item):
+                total_size -= cache_item.size
 
         LOGGER.info("total cache size at the end of pruning: %d", total_size)
         return True
@@ -124,6 +286,68 @@ def prune_cache(cache_path, cache_size_gb, clean_ratio):
     return True
 
 
+def prune_cache_with_index(cache_path, cache_size_gb, clean_ratio, rescan_interval_hours):
+    """
+    Prune the cache using the index of its contents.
+
+    The index is rebuilt from a full scan of the cache if it is older than the rescan interval,
+    otherwise it is brought up to date from the journals written by SCons. The least recently
+    used items are then removed until the cache is under the target size.
+    """
+    cache_size = cache_size_gb * GIGBYTES
+
+    index = CacheIndex(cache_path)
+    try:
+        last_full_scan = index.get_last_full_scan()
+        if last_full_scan is None or time.time() - last_full_scan > rescan_interval_hours * 3600:
+            index.rebuild()
+        else:
+            index.merge_journals()
+
+        total_size = index.total_size()
+        LOGGER.info("cache size %d, quota %d", total_size, cache_size)
+
+        if total_size < cache_size:
+            LOGGER.info("cache size (%d) is currently within boundaries", total_size)
+            return True
+
+        LOGGER.info("trimming the cache since %d > %d", total_size, cache_size)
+        while total_size >= cache_size * clean_ratio:
+            batch = index.least_recently_used(PRUNE_BATCH_SIZE)
+            if not batch:
+                LOGGER.error("cache size is over quota, and there are no files in "
+                             "the queue to delete.")
+                return False
+
+            for cache_item in batch:
+                if total_size < cache_size * clean_ratio:
+                    break
+
+                # Items may have been used without going through SCons' journal since the index
+                # was updated, only trust the index as much as the file system. The contents
+                # file is checked, since listing the cache directories updates their atime.
+                try:
+                    access_time = os.stat(get_cachefile_contents_path(cache_item.path)).st_atime
+                except OSError:
+                    access_time = None
+                if access_time is not None and access_time > cache_item.time + 1:
+                    index.update_time(cache_item, access_time)
+                    continue
+
+                if remove_cache_item(cache_item):
+                    total_size -= cache_item.size
+                    index.remove(cache_item)
+                else:
+                    # Leave the item for the next full scan rather than retrying it forever.
+                    index.remove(cache_item)
+            index.db.commit()
+
+        LOGGER.info("total cache size at the end of pruning: %d", total_size)
+        return True
+    finally:
+        index.close()
+
+
 def main():
     """Execute Main entry."""
 
@@ -139,6 +363,12 @@ def main():
         help=("ratio (as 1.0 > x > 0) of total cache size to prune "
               "to when cache exceeds quota."))
     parser.add_argument("--print-cache-dir", default=False, action="store_true")
+    parser.add_argument(
+        "--rescan-interval", default=24, type=float,
+        help=("hours between full scans of the cache to rebuild its index. In between, the index "
+              "is updated from the journals written by SCons. 0 scans the cache on every run."))
+    parser.add_argument("--no-index", default=False, action="store_true",
+                        help="scan the cache without reading or writing its index.")
 
     args = parser.parse_args()
 
@@ -146,8 +376,13 @@ def main():
         LOGGER.error("must specify a valid cache path, [%s]", args.cache_dir)
         exit(1)
 
-    ok = prune_cache(cache_path=args.cache_dir, cache_size_gb=args.cache_size,
-                     clean_ratio=args.prune_ratio)
+    if args.no_index:
+        ok = prune_cache(cache_path=args.cache_dir, cache_size_gb=args.cache_size,
+                         clean_ratio=args.prune_ratio)
+    else:
+        ok = prune_cache_with_index(cache_path=args.cache_dir, cache_size_gb=args.cache_size,
+                                    clean_ratio=args.prune_ratio,
+                                    rescan_interval_hours=args.rescan_interval)
 
     if not ok:
         LOGGER.error("encountered error cleaning the cache. exiting.")
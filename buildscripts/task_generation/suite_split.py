@@ -14,7 +14,8 @@ import yaml
 from evergreen import EvergreenApi
 
 from buildscripts.task_generation.resmoke_proxy import ResmokeProxyService
-from buildscripts.task_generation.suite_split_strategies import SplitStrategy, FallbackStrategy
+from buildscripts.task_generation.suite_split_strategies import SplitStrategy, FallbackStrategy, \
+    get_split_strategy
 from buildscripts.task_generation.timeout import TimeoutEstimate
 from buildscripts.util import taskname
 from buildscripts.util.taskname import remove_gen_suffix
@@ -231,6 +232,8 @@ class SuiteSplitConfig(NamedTuple):
     end_date: End date to query for test history.
     default_to_fallback: Use the fallback method for splitting tasks rather than dynamic splitting.
     include_build_variant_in_name: Include the build variant as part of display task names.
+    split_strategy: Name of the split strategy to use instead of the injected one, see
+        `suite_split_strategies.SPLIT_STRATEGIES`.
     """
 
     evg_project: str
@@ -241,6 +244,7 @@ class SuiteSplitConfig(NamedTuple):
     end_date: datetime
     default_to_fallback: bool = False
     include_build_variant_in_name: bool = False
+    split_strategy: Optional[str] = None
 
 
 class SuiteSplitService:
@@ -323,10 +327,13 @@ class SuiteSplitService:
             LOGGER.debug("No test runtimes after filter, using fallback")
             return self.calculate_fallback_suites(params)
 
-        test_lists = self.split_strategy(tests_runtimes, execution_time_secs,
-                                         self.config.max_sub_suites,
-                                         self.config.max_tests_per_suite,
-                                         LOGGER.bind(task=params.task_name))
+        split_strategy = self.split_strategy
+        if self.config.split_strategy:
+            split_strategy = get_split_strategy(self.config.split_strategy)
+
+        test_lists = split_strategy(tests_runtimes, execution_time_secs,
+                                    self.config.max_sub_suites, self.config.max_tests_per_suite,
+                                    LOGGER.bind(task=params.task_name))
 
         return self.test_lists_to_suite(test_lists, params, tests_runtimes, test_stats)
 
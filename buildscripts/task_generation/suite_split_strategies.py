@@ -1,5 +1,7 @@
 """Strategies for splitting tests into multiple sub-suites."""
-from typing import List, Callable, Optional, Any
+import heapq
+import math
+from typing import List, Callable, Optional, Any, Tuple
 
 import structlog
 
@@ -28,23 +30,23 @@ def divide_remaining_tests_among_suites(remaining_tests_runtimes: List[TestRunti
             suite_idx = 0
 
 
-def _new_suite_needed(current_suite: List[TestRuntime], test_runtime: float,
+def _new_suite_needed(current_runtime: float, current_test_count: int, test_runtime: float,
                       max_suite_runtime: float, max_tests_per_suite: Optional[int]) -> bool:
     """
     Check if a new suite should be created for the given suite.
 
-    :param current_suite: Suite currently being added to.
+    :param current_runtime: Runtime of the suite currently being added to.
+    :param current_test_count: Number of tests in the suite currently being added to.
     :param test_runtime: Runtime of test being added.
     :param max_suite_runtime: Max runtime of a single suite.
     :param max_tests_per_suite: Max number of tests in a suite.
     :return: True if a new test suite should be created.
     """
-    current_runtime = sum(test.runtime for test in current_suite)
     if current_runtime + test_runtime > max_suite_runtime:
         # Will adding this test put us over the target runtime?
         return True
 
-    if max_tests_per_suite and len(current_suite) + 1 > max_tests_per_suite:
+    if max_tests_per_suite and current_test_count + 1 > max_tests_per_suite:
         # Will adding this test put us over the max number of tests?
         return True
 
@@ -78,20 +80,23 @@ def greedy_division(tests_runtimes: List[TestRuntime], max_time_seconds: float,
     logger.debug("Determines suites for runtime", max_runtime_seconds=max_time_seconds,
                  max_suites=max_suites, max_tests_per_suite=max_tests_per_suite)
     current_test_list = []
+    current_runtime = 0.0
     for idx, test_instance in enumerate(tests_runtimes):
         logger.debug("Adding test", test=test_instance)
-        if _new_suite_needed(current_test_list, test_instance.runtime, max_time_seconds,
-                             max_tests_per_suite):
+        if _new_suite_needed(current_runtime, len(current_test_list), test_instance.runtime,
+                             max_time_seconds, max_tests_per_suite):
             logger.debug("Finished suite", test_runtime=test_instance.runtime,
                          max_time=max_time_seconds)
             if current_test_list:
                 suites.append(current_test_list)
                 current_test_list = []
+                current_runtime = 0.0
                 if max_suites and len(suites) >= max_suites:
                     last_test_processed = idx
                     break
 
         current_test_list.append(test_instance)
+        current_runtime += test_instance.runtime
 
     if current_test_list:
         suites.append(current_test_list)
@@ -103,6 +108,194 @@ def greedy_division(tests_runtimes: List[TestRuntime], max_time_seconds: float,
     return [[test.test_name for test in test_list] for test_list in suites]
 
 
+def _min_suites_needed(tests_runtimes: List[TestRuntime], max_time_seconds: float,
+                       max_suites: Optional[int], max_tests_per_suite: Optional[int]) -> int:
+    """
+    Get a lower bound on the number of suites needed to respect the given limits.
+
+    :param tests_runtimes: Tests to divide.
+    :param max_time_seconds: Maximum runtime of a single suite.
+    :param max_suites: Maximum number of suites to create.
+    :param max_tests_per_suite: Maximum number of tests to add to a single suite.
+    :return: Number of suites to start packing tests into.
+    """
+    if max_time_seconds > 0:
+        # Tests longer than the max runtime need to be run in a suite on their own.
+        n_long_tests = sum(1 for test in tests_runtimes if test.runtime > max_time_seconds)
+        remaining_runtime = sum(
+            test.runtime for test in tests_runtimes if test.runtime <= max_time_seconds)
+        n_suites = n_long_tests + math.ceil(remaining_runtime / max_time_seconds)
+    else:
+        n_suites = 1
+    if max_tests_per_suite:
+        n_suites = max(n_suites, math.ceil(len(tests_runtimes) / max_tests_per_suite))
+
+    n_suites = min(n_suites, len(tests_runtimes))
+    if max_suites:
+        n_suites = min(n_suites, max_suites)
+    return max(n_suites, 1)
+
+
+def _lpt_pack(sorted_tests: List[TestRuntime], n_suites: int,
+              max_tests_per_suite: Optional[int]) -> List[List[TestRuntime]]:
+    """
+    Pack tests into a fixed number of suites with the longest-processing-time-first rule.
+
+    Each test, longest first, goes to the suite with the lowest total runtime that still has room
+    for another test. If every suite is full, the limit on the number of tests is ignored.
+
+    :param sorted_tests: Tests to divide, sorted by descending runtime.
+    :param n_suites: Number of suites to create.
+    :param max_tests_per_suite: Maximum number of tests to add to a single suite.
+    :return: Tests in each suite.
+    """
+    suites = [[] for _ in range(n_suites)]
+    # Suites that are full sort after all suites with room left, then by runtime, then by index so
+    # that the result is deterministic.
+    heap = [(False, 0.0, idx) for idx in range(n_suites)]
+    for test_instance in sorted_tests:
+        _, runtime, idx = heapq.heappop(heap)
+        suites[idx].append(test_instance)
+        is_full = bool(max_tests_per_suite) and len(suites[idx]) >= max_tests_per_suite
+        heapq.heappush(heap, (is_full, runtime + test_instance.runtime, idx))
+
+    return [suite for suite in suites if suite]
+
+
+def _karmarkar_karp_pack(sorted_tests: List[TestRuntime],
+                         n_suites: int) -> List[List[TestRuntime]]:
+    """
+    Pack tests into a fixed number of suites with the Karmarkar-Karp largest differencing method.
+
+    Every test starts as a partial partition with the test in one suite and all other suites empty.
+    The two partial partitions with the largest spread between their longest and shortest suite are
+    repeatedly merged by combining the longest suite of one with the shortest suite of the other,
+    which cancels out their differences.
+
+    :param sorted_tests: Tests to divide, sorted by descending runtime.
+    :param n_suites: Number of suites to create.
+    :return: Tests in each suite.
+    """
+    # Each partial partition is a list of (runtime, tests) sorted by descending runtime. The counter
+    # breaks ties so partitions themselves are never compared.
+    heap = []  # type: List[Tuple[float, int, List[Tuple[float, List[TestRuntime]]]]]
+    for idx, test_instance in enumerate(sorted_tests):
+        partition = [(test_instance.runtime, [test_instance])]
+        partition.extend((0.0, []) for _ in range(n_suites - 1))
+        heap.append((-test_instance.runtime, idx, partition))
+    heapq.heapify(heap)
+
+    counter = len(sorted_tests)
+    while len(heap) > 1:
+        _, _, first = heapq.heappop(heap)
+        _, _, second = heapq.heappop(heap)
+        merged = [(first[idx][0] + second[-idx - 1][0], first[idx][1] + second[-idx - 1][1])
+                  for idx in range(n_suites)]
+        merged.sort(key=lambda suite: suite[0], reverse=True)
+        heapq.heappush(heap, (merged[-1][0] - merged[0][0], counter, merged))
+        counter += 1
+
+    return [tests for _, tests in heap[0][2] if tests]
+
+
+def _suite_runtime(suite: List[TestRuntime]) -> float:
+    """Get the total runtime of the given suite."""
+    return sum(test.runtime for test in suite)
+
+
+def _max_suite_runtime(suites: List[List[TestRuntime]]) -> float:
+    """Get the runtime of the longest running suite."""
+    return max((_suite_runtime(suite) for suite in suites), default=0.0)
+
+
+def longest_processing_time_division(tests_runtimes: List[TestRuntime], max_time_seconds: float,
+                                     max_suites: Optional[int] = None,
+                                     max_tests_per_suite: Optional[int] = None, logger: Any = LOGGER,
+                                     refine: bool = False) -> List[List[str]]:
+    """
+    Divide the given tests into suites with balanced runtimes.
+
+    Starting from the smallest number of suites that could fit all the tests in `max_time_seconds`,
+    tests are packed longest first into the least loaded suite. If the longest suite is still over
+    `max_time_seconds` (and longer than the longest test), another suite is added, up to
+    `max_suites`.
+
+    Unlike `greedy_division`, tests left over once `max_suites` is reached are still placed based on
+    their runtime, so the suites stay balanced.
+
+    :param tests_runtimes: List of tuples containing test names and test runtimes.
+    :param max_time_seconds: Maximum runtime to add to a single bucket.
+    :param max_suites: Maximum number of suites to create.
+    :param max_tests_per_suite: Maximum number of tests to add to a single suite.
+    :param logger: Logger to write log output to.
+    :param refine: Also try the Karmarkar-Karp differencing method and use it if its longest suite
+        is shorter and it respects `max_tests_per_suite`.
+    :return: List of Suite objects representing grouping of tests.
+    """
+    if not tests_runtimes:
+        return []
+
+    sorted_tests = sorted(tests_runtimes, key=lambda test: test.runtime, reverse=True)
+    longest_test = sorted_tests[0].runtime
+    max_n_suites = min(len(sorted_tests), max_suites) if max_suites else len(sorted_tests)
+    n_suites = _min_suites_needed(sorted_tests, max_time_seconds, max_suites, max_tests_per_suite)
+    logger.debug("Determines suites for runtime", max_runtime_seconds=max_time_seconds,
+                 max_suites=max_suites, max_tests_per_suite=max_tests_per_suite,
+                 initial_suites=n_suites)
+
+    while True:
+        suites = _lpt_pack(sorted_tests, n_suites, max_tests_per_suite)
+        makespan = _max_suite_runtime(suites)
+        if makespan <= max(max_time_seconds, longest_test) or n_suites >= max_n_suites:
+            break
+        n_suites += 1
+
+    if refine and n_suites > 1:
+        kk_suites = _karmarkar_karp_pack(sorted_tests, n_suites)
+        kk_makespan = _max_suite_runtime(kk_suites)
+        fits = not max_tests_per_suite or all(
+            len(suite) <= max_tests_per_suite for suite in kk_suites)
+        logger.debug("Refined suites", lpt_runtime=makespan, kk_runtime=kk_makespan, used=fits
+                     and kk_makespan < makespan)
+        if fits and kk_makespan < makespan:
+            suites = kk_suites
+
+    return [[test.test_name for test in suite] for suite in suites]
+
+
+def karmarkar_karp_division(tests_runtimes: List[TestRuntime], max_time_seconds: float,
+                            max_suites: Optional[int] = None,
+                            max_tests_per_suite: Optional[int] = None,
+                            logger: Any = LOGGER) -> List[List[str]]:
+    """
+    Divide the given tests into suites with `longest_processing_time_division` and refine the result.
+
+    See `longest_processing_time_division` for a description of the parameters.
+    """
+    return longest_processing_time_division(tests_runtimes, max_time_seconds, max_suites,
+                                            max_tests_per_suite, logger, refine=True)
+
+
+SPLIT_STRATEGIES = {
+    "greedy": greedy_division,
+    "lpt": longest_processing_time_division,
+    "karmarkar_karp": karmarkar_karp_division,
+}
+
+
+def get_split_strategy(name: str) -> SplitStrategy:
+    """
+    Get the split strategy with the given name.
+
+    :param name: Name of split strategy, one of the keys of `SPLIT_STRATEGIES`.
+    :return: Split strategy with the given name.
+    """
+    if name not in SPLIT_STRATEGIES:
+        raise ValueError(f"Unknown split strategy '{name}', expected one of: "
+                         f"{', '.join(sorted(SPLIT_STRATEGIES))}")
+    return SPLIT_STRATEGIES[name]
+
+
 def round_robin_fallback(test_list: List[str], max_suites: int) -> List[List[str]]:
     """
     Split the tests among a given number of suites picking them round robin.
@@ -43,3 +43,51 @@ class TestLoggerPipe(unittest.TestCase):
     def test_escapes_null_bytes(self):
         calls = self._get_log_calls(b"a\0b")
         self.assertEqual(calls, [mock.call(self.LOG_LEVEL, u"a\\0b")])
+
+
+class TestLogEventSubscription(unittest.TestCase):
+    WAITING_FOR_CONNECTIONS = (b'{"t":{"$date":"2021-01-01T00:00:00.000+00:00"},"s":"I",  '
+                               b'"c":"NETWORK",  "id":23016,   "ctx":"listener",'
+                               b'"msg":"Waiting for connections","attr":{"port":20000}}\n')
+
+    @staticmethod
+    def _run_pipe(output, subscriptions):
+        logger = logging.Logger("for_testing")
+        logger.log = mock.MagicMock()
+
+        logger_pipe = _pipe.LoggerPipe(logger=logger, level=logging.INFO,
+                                       pipe_out=io.BytesIO(output), subscriptions=subscriptions)
+        logger_pipe.wait_until_started()
+        logger_pipe.wait_until_finished()
+        return logger_pipe
+
+    def test_notified_of_matching_log_line(self):
+        subscription = _pipe.LogEventSubscription(23016)
+        self._run_pipe(b"a\n" + self.WAITING_FOR_CONNECTIONS + b"b\n", [subscription])
+
+        self.assertTrue(subscription.is_set())
+        entry = subscription.wait(timeout=0)
+        self.assertEqual("Waiting for connections", entry["msg"])
+        self.assertEqual(20000, entry["attr"]["port"])
+
+    def test_notified_when_output_ends(self):
+        subscription = _pipe.LogEventSubscription(23016)
+        self._run_pipe(b'{"id":230160, "msg":"other"}\nnot json "id":23016,\n', [subscription])
+
+        self.assertTrue(subscription.is_set())
+        self.assertIsNone(subscription.wait(timeout=0))
+
+    def test_subscribe_after_output_ended(self):
+        logger_pipe = self._run_pipe(self.WAITING_FOR_CONNECTIONS, [])
+
+        subscription = _pipe.LogEventSubscription(23016)
+        logger_pipe.subscribe(subscription)
+
+        # Lines read before subscribing are not matched.
+        self.assertTrue(subscription.is_set())
+        self.assertIsNone(subscription.wait(timeout=0))
+
+    def test_wait_timeout(self):
+        subscription = _pipe.LogEventSubscription(23016)
+        self.assertFalse(subscription.is_set())
+        self.assertIsNone(subscription.wait(timeout=0.01))
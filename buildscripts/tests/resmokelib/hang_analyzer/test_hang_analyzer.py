@@ -0,0 +1,104 @@
+"""Unit tests for the buildscripts.resmokelib.hang_analyzer.hang_analyzer module."""
+
+import argparse
+import threading
+import unittest
+from collections import namedtuple
+
+from mock import MagicMock, patch
+
+from buildscripts.resmokelib.hang_analyzer import dumper
+from buildscripts.resmokelib.hang_analyzer.hang_analyzer import HangAnalyzer
+from buildscripts.resmokelib.hang_analyzer.process_list import Pinfo
+
+# pylint: disable=missing-docstring,protected-access
+
+NS = "buildscripts.resmokelib.hang_analyzer.hang_analyzer"
+
+DiskUsage = namedtuple("DiskUsage", ["total", "used", "free", "percent"])
+
+
+def ns(relative_name):  # pylint: disable=invalid-name
+    """Return a full name from a name relative to the test module"s name space."""
+    return NS + "." + relative_name
+
+
+def make_options(**kwargs):
+    options = dict(process_ids=None, process_names=None, go_process_names=None,
+                   process_match="contains", dump_core=True, max_disk_usage_percent=90,
+                   debugger_output=["stdout"], kill_processes=False, jobs=4)
+    options.update(kwargs)
+    return argparse.Namespace(**options)
+
+
+@patch(ns("HangAnalyzer._log_system_info"), MagicMock())
+@patch(ns("process"), MagicMock())
+@patch(ns("psutil.Process"), MagicMock(**{"return_value.memory_info.return_value.rss": 1}))
+class TestExecute(unittest.TestCase):
+    def setUp(self):
+        self.dbg = MagicMock()
+        self.processes = [Pinfo(name="mongod", pidv=[1, 2, 3]), Pinfo(name="mongos", pidv=[4])]
+
+    def execute(self, **kwargs):
+        analyzer = HangAnalyzer(make_options(**kwargs), logger=MagicMock())
+        with patch(ns("dumper.get_dumpers")) as get_dumpers_mock, \
+             patch(ns("process_list.get_processes")) as get_processes_mock, \
+             patch(ns("psutil.disk_usage")) as disk_usage_mock:
+            get_dumpers_mock.return_value = dumper.Dumpers(dbg=self.dbg, jstack=MagicMock())
+            get_processes_mock.return_value = self.processes
+            disk_usage_mock.return_value = DiskUsage(100, 10, 90, 10.0)
+            analyzer.execute()
+
+    def test_one_session_per_process(self):
+        self.execute()
+
+        calls = sorted((args[0].pidv, kwargs["take_dump"])
+                       for (args, kwargs) in self.dbg.dump_info.call_args_list)
+        self.assertEqual(calls, [([1], True), ([2], True), ([3], True), ([4], True)])
+
+    def test_no_core_dumps(self):
+        self.execute(dump_core=False)
+
+        self.assertEqual(self.dbg.dump_info.call_count, 4)
+        for (_, kwargs) in self.dbg.dump_info.call_args_list:
+            self.assertFalse(kwargs["take_dump"])
+
+    def test_processes_are_dumped_concurrently(self):
+        barrier = threading.Barrier(4, timeout=10)
+        self.dbg.dump_info.side_effect = lambda pinfo, take_dump: barrier.wait()
+
+        self.execute(jobs=4)
+
+        self.assertEqual(self.dbg.dump_info.call_count, 4)
+
+    def test_dump_errors_are_reported(self):
+        def dump_info(pinfo, take_dump):  # pylint: disable=unused-argument
+            if pinfo.pidv == [2]:
+                raise dumper.DumpError({2: "dump_mongod.2.core"})
+
+        self.dbg.dump_info.side_effect = dump_info
+
+        with patch(ns("process.teardown_processes")) as teardown_mock:
+            with self.assertRaises(RuntimeError):
+                self.execute(kill_processes=True)
+
+        self.assertEqual(teardown_mock.call_args[0][2], {2: "dump_mongod.2.core"})
+
+
+class TestCheckEnoughFreeSpace(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = HangAnalyzer(make_options(), logger=MagicMock())
+
+    @patch(ns("psutil.disk_usage"))
+    def test_core_dumps_in_progress_are_reserved(self, disk_usage_mock):
+        disk_usage_mock.return_value = DiskUsage(100, 50, 50, 50.0)
+
+        self.assertTrue(self.analyzer._check_enough_free_space(30))
+        self.assertFalse(self.analyzer._check_enough_free_space(30))
+        self.assertTrue(self.analyzer._check_enough_free_space(5))
+
+    @patch(ns("psutil.disk_usage"))
+    def test_full_disk(self, disk_usage_mock):
+        disk_usage_mock.return_value = DiskUsage(100, 95, 5, 95.0)
+
+        self.assertFalse(self.analyzer._check_enough_free_space())
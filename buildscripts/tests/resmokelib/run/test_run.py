@@ -0,0 +1,67 @@
+"""Unit tests for buildscripts/resmokelib/run/__init__.py."""
+
+import unittest
+
+import mock
+
+from buildscripts.resmokelib import run
+
+# pylint: disable=missing-docstring,protected-access
+
+NS = "buildscripts.resmokelib.run"
+
+
+def ns(relative_name):  # pylint: disable=invalid-name
+    """Return a full name from a name relative to the test module"s name space."""
+    return NS + "." + relative_name
+
+
+def make_suite(return_code):
+    suite = mock.Mock()
+    suite.return_code = return_code
+    suite.options.fail_fast = False
+    return suite
+
+
+@mock.patch(ns("runtime_recorder.setup_start_time"), mock.Mock())
+@mock.patch(ns("config.EVERGREEN_TASK_ID"), None)
+@mock.patch(ns("config.EVERGREEN_TASK_NAME"), None)
+@mock.patch(ns("config.EVERGREEN_TASK_DOC"), None)
+@mock.patch(ns("config.FUZZ_MONGOD_CONFIGS"), False)
+@mock.patch(ns("config.SPAWN_USING"), "python")
+class TestRunTests(unittest.TestCase):
+    def make_runner(self, suites):
+        runner = run.TestRunner("run")
+        runner._resmoke_logger = mock.Mock()
+        runner._get_suites = mock.Mock(return_value=suites)
+        runner._setup_archival = mock.Mock()
+        runner._setup_signal_handler = mock.Mock()
+        runner._log_resmoke_summary = mock.Mock()
+        runner._exit_archival = mock.Mock()
+        runner._run_suite = mock.Mock(return_value=False)
+        return runner
+
+    @mock.patch(ns("testruntimes.write"))
+    @mock.patch(ns("reportfile.write"))
+    def test_reports_are_written_on_exit(self, reportfile_write, testruntimes_write):
+        suites = [make_suite(0), make_suite(1)]
+        runner = self.make_runner(suites)
+
+        with self.assertRaises(SystemExit) as context:
+            runner.run_tests()
+
+        self.assertEqual(1, context.exception.code)
+        reportfile_write.assert_called_once_with(suites)
+        testruntimes_write.assert_called_once_with(suites)
+
+    @mock.patch(ns("testruntimes.write"))
+    @mock.patch(ns("reportfile.write"))
+    def test_no_reports_without_suites(self, reportfile_write, testruntimes_write):
+        runner = self.make_runner([])
+        runner._get_suites.side_effect = ValueError("bad suite")
+
+        with self.assertRaises(ValueError):
+            runner.run_tests()
+
+        reportfile_write.assert_not_called()
+        testruntimes_write.assert_not_called()
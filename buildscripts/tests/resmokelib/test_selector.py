@@ -175,6 +175,9 @@ class MockTestFileExplorer(object):
     def jstest_tags(self, file_path):
         return self.tags.get(file_path, [])
 
+    def prefetch_jstest_tags(self, file_paths):  # pylint: disable=no-self-use,unused-argument
+        pass
+
     def read_root_file(self, root_file_path):  # pylint: disable=no-self-use,unused-argument
         return ["build/testA", "build/testB"]
 
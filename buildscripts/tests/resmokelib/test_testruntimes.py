@@ -0,0 +1,76 @@
+"""Unit tests for the buildscripts.resmokelib.testruntimes module."""
+
+import json
+import os
+import tempfile
+import unittest
+
+import mock
+
+from buildscripts.resmokelib import testruntimes
+
+# pylint: disable=missing-docstring,protected-access
+
+NS = "buildscripts.resmokelib.testruntimes"
+
+
+def ns(relative_name):  # pylint: disable=invalid-name
+    """Return a full name from a name relative to the test module"s name space."""
+    return NS + "." + relative_name
+
+
+class TestOrderLongestFirst(unittest.TestCase):
+    def test_no_runtimes(self):
+        tests = ["a.js", "b.js", "c.js"]
+        self.assertEqual(testruntimes.order_longest_first(tests, {}), tests)
+
+    def test_unknown_tests_are_average(self):
+        tests = ["a.js", "b.js", "c.js", "d.js"]
+        runtimes = {"a.js": 1.0, "c.js": 30.0, "d.js": 2.0}
+        self.assertEqual(
+            testruntimes.order_longest_first(tests, runtimes), ["c.js", "b.js", "d.js", "a.js"])
+
+
+class TestRuntimesFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.runtimes_file = os.path.join(self.temp_dir.name, "runtimes.json")
+        patcher = mock.patch(ns("config"))
+        self.config = patcher.start()
+        self.config.TEST_RUNTIMES_FILE = self.runtimes_file
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def make_suite(tests, elapsed):
+        test_infos = []
+        for test_file in elapsed:
+            test_info = mock.MagicMock(test_file=test_file, start_time=100.0,
+                                       end_time=100.0 + elapsed[test_file])
+            test_infos.append(test_info)
+        report = mock.MagicMock(test_infos=test_infos)
+        return mock.MagicMock(tests=tests, get_reports=lambda: [report])
+
+    def test_read_missing_file(self):
+        self.assertEqual(testruntimes.read(), {})
+
+    def test_read_teststats_format(self):
+        with open(self.runtimes_file, "w") as fp:
+            json.dump([["a.js", 3.0], ["b.js", 1]], fp)
+        self.assertEqual(testruntimes.read(), {"a.js": 3.0, "b.js": 1.0})
+
+    def test_write_merges_runtimes(self):
+        with open(self.runtimes_file, "w") as fp:
+            json.dump({"a.js": 10.0, "c.js": 7.0}, fp)
+
+        suite = self.make_suite(["a.js", "b.js"], {"a.js": 20.0, "b.js": 4.0, "a.js:Hook": 1.0})
+        testruntimes.write([suite])
+
+        self.assertEqual(testruntimes.read(), {"a.js": 15.0, "b.js": 4.0, "c.js": 7.0})
+
+    def test_write_disabled(self):
+        self.config.TEST_RUNTIMES_FILE = None
+        testruntimes.write([self.make_suite(["a.js"], {"a.js": 1.0})])
+        self.assertFalse(os.path.exists(self.runtimes_file))
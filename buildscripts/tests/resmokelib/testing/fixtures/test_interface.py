@@ -1,7 +1,10 @@
 """Unit tests for the resmokelib.testing.fixtures.interface module."""
 import logging
+import threading
 import unittest
 
+from mock import MagicMock
+
 from buildscripts.resmokelib import errors
 from buildscripts.resmokelib.testing.fixtures import interface
 from buildscripts.resmokelib.testing.fixtures.fixturelib import FixtureLib
@@ -20,6 +23,23 @@ class TestFixture(unittest.TestCase):
             raising_fixture.teardown()
 
 
+    def test_subscribe_to_ready_log(self):
+        fixture = UnitTestFixture()
+        process = MagicMock()
+
+        subscription = fixture._subscribe_to_ready_log(process, {"port": 20000})
+
+        process.subscribe_to_log.assert_called_once_with(23016)
+        self.assertIs(process.subscribe_to_log.return_value, subscription)
+
+    def test_subscribe_to_ready_log_with_logpath(self):
+        fixture = UnitTestFixture()
+        process = MagicMock()
+
+        self.assertIsNone(fixture._subscribe_to_ready_log(process, {"logpath": "mongod.log"}))
+        process.subscribe_to_log.assert_not_called()
+
+
 class TestFixtureTeardownHandler(unittest.TestCase):
     def test_teardown_ok(self):
         handler = interface.FixtureTeardownHandler(logging.getLogger("handler_unittests"))
@@ -44,6 +64,67 @@ class TestFixtureTeardownHandler(unittest.TestCase):
         self.assertEqual(expected_msg, handler.get_error_message())
 
 
+    def test_concurrent_teardown_errors(self):
+        handler = interface.FixtureTeardownHandler(logging.getLogger("handler_unittests"))
+        fixtures = [UnitTestFixture(should_raise=True) for _ in range(4)]
+
+        interface.run_concurrently(lambda fixture=fixture: handler.teardown(fixture, "ko")
+                                   for fixture in fixtures)
+
+        self.assertFalse(handler.was_successful())
+        expected_msg = "Error while stopping ko: " + UnitTestFixture.ERROR_MESSAGE
+        self.assertEqual(" - ".join([expected_msg] * 4), handler.get_error_message())
+
+
+class TestRunConcurrently(unittest.TestCase):
+    def test_runs_all_functions_concurrently(self):
+        barrier = threading.Barrier(3, timeout=10)
+        results = []
+
+        def func(value):
+            barrier.wait()
+            results.append(value)
+
+        interface.run_concurrently(lambda value=value: func(value) for value in range(3))
+
+        self.assertEqual([0, 1, 2], sorted(results))
+
+    def test_raises_after_all_functions_return(self):
+        finished = threading.Event()
+
+        def fail():
+            raise errors.ServerFailure("Failed")
+
+        def succeed():
+            self.assertTrue(finished.wait(timeout=10))
+
+        with self.assertRaises(errors.ServerFailure):
+            interface.run_concurrently([fail, succeed, finished.set])
+        self.assertTrue(finished.is_set())
+
+    def test_no_functions(self):  # pylint: disable=no-self-use
+        interface.run_concurrently([])
+
+
+class TestFixturePhaseTimer(unittest.TestCase):
+    def test_log_summary(self):
+        logger = logging.getLogger("timer_unittests")
+        timer = interface.FixturePhaseTimer(logger, "setting up the fixture")
+        with timer.phase("start nodes"):
+            pass
+        with self.assertRaises(ValueError):
+            with timer.phase("initiate"):
+                raise ValueError()
+
+        with self.assertLogs(logger, level="INFO") as logs:
+            timer.log_summary()
+
+        self.assertEqual(1, len(logs.output))
+        self.assertRegex(
+            logs.output[0], r"Finished setting up the fixture in \d+\.\d\d seconds "
+            r"\(start nodes: \d+\.\d\ds, initiate: \d+\.\d\ds\)\.")
+
+
 class UnitTestFixture(interface.Fixture):  # pylint: disable=abstract-method
     ERROR_MESSAGE = "Failed"
 
@@ -0,0 +1,103 @@
+"""Unit tests for the resmokelib.testing.fixtures.replicaset module."""
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import MagicMock, patch
+
+from buildscripts.resmokelib.testing.fixtures import replicaset
+from buildscripts.resmokelib.testing.fixtures.fixturelib import FixtureLib
+
+# pylint: disable=missing-docstring,protected-access
+
+
+def member(votes=None):
+    info = {"host": "localhost"}
+    if votes is not None:
+        info["votes"] = votes
+    return info
+
+
+class TestGetReconfigMemberCounts(unittest.TestCase):
+    def test_single_member(self):
+        self.assertEqual([], replicaset.get_reconfig_member_counts([member()]))
+
+    def test_voting_members_are_added_one_at_a_time(self):
+        members = [member(), member(), member(), member()]
+        self.assertEqual([2, 3, 4], replicaset.get_reconfig_member_counts(members))
+
+    def test_non_voting_members_are_added_together(self):
+        members = [member(), member(votes=0), member(votes=0), member(votes=0)]
+        self.assertEqual([4], replicaset.get_reconfig_member_counts(members))
+
+    def test_non_voting_members_are_added_with_the_previous_voting_member(self):
+        members = [member(), member(), member(votes=0), member(), member(votes=0)]
+        self.assertEqual([3, 5], replicaset.get_reconfig_member_counts(members))
+
+
+class TestDbpathTemplate(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dbpath_prefix = os.path.join(self.tmpdir.name, "resmoke")
+        self.fixture = replicaset.ReplicaSetFixture(
+            logging.getLogger("replicaset_unittests"), 0, FixtureLib(),
+            mongod_options={"dbpath": self.dbpath_prefix}, use_dbpath_template=True)
+        for i in range(3):
+            self.fixture.install_mongod(self.make_node(i))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_node(self, index):
+        dbpath = os.path.join(self.dbpath_prefix, "node{}".format(index))
+        node = MagicMock(preserve_dbpath=False, port=20000 + index)
+        node.get_dbpath_prefix.return_value = dbpath
+
+        def setup():
+            # Like MongoDFixture.setup(), only keep the data files if preserve_dbpath is set.
+            if not node.preserve_dbpath and os.path.lexists(dbpath):
+                shutil.rmtree(dbpath)
+            os.makedirs(os.path.join(dbpath, "diagnostic.data"), exist_ok=True)
+            with open(os.path.join(dbpath, "collection-{}.wt".format(index)), "a") as fh:
+                fh.write("setup;")
+
+        node.setup.side_effect = setup
+        return node
+
+    def read_node_file(self, index):
+        with open(os.path.join(self.dbpath_prefix, "node{}".format(index),
+                               "collection-{}.wt".format(index))) as fh:
+            return fh.read()
+
+    @patch.object(replicaset.ReplicaSetFixture, "_step_up_first_node")
+    @patch.object(replicaset.ReplicaSetFixture, "_await_stable_recovery_timestamp")
+    @patch.object(replicaset.ReplicaSetFixture, "_await_secondaries")
+    @patch.object(replicaset.ReplicaSetFixture, "_await_primary")
+    def test_create_and_setup_from_template(self, *_):
+        for node in self.fixture.nodes:
+            node.setup()
+
+        self.fixture._create_dbpath_template()
+
+        for (i, node) in enumerate(self.fixture.nodes):
+            node.teardown.assert_called_once_with()
+            self.assertEqual(2, node.setup.call_count)
+            self.assertFalse(node.preserve_dbpath)
+            # The nodes were restarted on the data files they already had.
+            self.assertEqual("setup;setup;", self.read_node_file(i))
+            template = os.path.join(self.dbpath_prefix + ".template", "node{}".format(i))
+            self.assertEqual(["collection-{}.wt".format(i)], os.listdir(template))
+
+        self.fixture.setup()
+
+        for (i, node) in enumerate(self.fixture.nodes):
+            self.assertEqual(3, node.setup.call_count)
+            # The nodes were started on a copy of the template.
+            self.assertEqual("setup;setup;", self.read_node_file(i))
+
+    def test_not_used_when_preserving_dbpath(self):
+        self.assertTrue(self.fixture._should_use_dbpath_template())
+        self.fixture.nodes[1].preserve_dbpath = True
+        self.assertFalse(self.fixture._should_use_dbpath_template())
@@ -0,0 +1,239 @@
+"""Unit tests for the in-process checks of the dbhash and validate hooks."""
+
+import datetime
+import logging
+import unittest
+
+import bson
+import mock
+
+from buildscripts.resmokelib import errors
+from buildscripts.resmokelib.testing.fixtures import replicaset
+from buildscripts.resmokelib.testing.hooks import dbhash
+from buildscripts.resmokelib.testing.hooks import jsfile
+from buildscripts.resmokelib.testing.hooks import validate
+
+# pylint: disable=missing-docstring,protected-access
+
+
+def make_client(validate_response=None):
+    database = mock.MagicMock()
+    database.name = "test"
+    database.list_collections.return_value = [{"name": "coll", "type": "collection"}]
+    database.command.return_value = validate_response or {"ok": 1, "valid": True}
+    database.__getitem__.return_value.full_name = "test.coll"
+    database.__getitem__.return_value.name = "coll"
+
+    client = mock.MagicMock()
+    client.admin.command.return_value = {"ismaster": True}
+    client.list_database_names.return_value = ["test"]
+    client.__getitem__.return_value = database
+    return client
+
+
+def make_replset(clients):
+    nodes = []
+    for (i, client) in enumerate(clients):
+        node = mock.Mock()
+        node.port = 20000 + i
+        node.mongo_client.return_value = client
+        node.get_internal_connection_string.return_value = "localhost:%d" % node.port
+        nodes.append(node)
+
+    fixture = mock.MagicMock(spec=replicaset.ReplicaSetFixture)
+    fixture.nodes = nodes
+    fixture.initial_sync_node = None
+    fixture.auth_options = None
+    return fixture
+
+
+def make_test():
+    test = mock.Mock()
+    test.logger = logging.getLogger("test")
+    test.short_name.return_value = "test.js"
+    return test
+
+
+class TestPythonDataConsistencyHook(unittest.TestCase):
+    @mock.patch.object(jsfile.JSHook, "after_test")
+    def test_runs_js_file_by_default(self, js_after_test):
+        fixture = make_replset([make_client(), make_client()])
+        hook = validate.ValidateCollections(logging.getLogger("hook"), fixture)
+
+        hook.after_test(make_test(), mock.Mock())
+
+        js_after_test.assert_called_once()
+        fixture.nodes[0].mongo_client.assert_not_called()
+
+    @mock.patch.object(jsfile.JSHook, "after_test")
+    def test_runs_js_file_for_unknown_fixture(self, js_after_test):
+        hook = validate.ValidateCollections(logging.getLogger("hook"), mock.Mock(),
+                                            use_python=True)
+
+        hook.after_test(make_test(), mock.Mock())
+
+        js_after_test.assert_called_once()
+
+    @mock.patch.object(jsfile.JSHook, "after_test")
+    def test_runs_js_file_for_unsupported_options(self, js_after_test):
+        fixture = make_replset([make_client(), make_client()])
+        shell_options = {"global_vars": {"TestData": {"checkCollectionCounts": True}}}
+        hook = dbhash.CheckReplDBHash(logging.getLogger("hook"), fixture,
+                                      shell_options=shell_options, use_python=True)
+
+        hook.after_test(make_test(), mock.Mock())
+
+        js_after_test.assert_called_once()
+
+    def test_clients_are_reused_across_tests(self):
+        fixture = make_replset([make_client(), make_client()])
+        hook = validate.ValidateCollections(logging.getLogger("hook"), fixture, use_python=True)
+
+        hook.after_test(make_test(), mock.Mock())
+        hook.after_test(make_test(), mock.Mock())
+
+        for node in fixture.nodes:
+            node.mongo_client.assert_called_once()
+
+        hook.after_suite(mock.Mock())
+        for node in fixture.nodes:
+            node.mongo_client.return_value.close.assert_called_once()
+
+
+class TestValidateCollections(unittest.TestCase):
+    def test_valid_collections(self):
+        fixture = make_replset([make_client(), make_client()])
+        hook = validate.ValidateCollections(logging.getLogger("hook"), fixture, use_python=True)
+        test_report = mock.Mock()
+
+        hook.after_test(make_test(), test_report)
+
+        test_report.addSuccess.assert_called_once()
+        for node in fixture.nodes:
+            database = node.mongo_client.return_value["test"]
+            database.command.assert_called_once_with("validate", "coll", full=True, check=False)
+
+    def test_invalid_collection_fails_the_check(self):
+        invalid = {"ok": 1, "valid": False, "errors": ["bad index"]}
+        fixture = make_replset([make_client(), make_client(validate_response=invalid)])
+        hook = validate.ValidateCollections(logging.getLogger("hook"), fixture, use_python=True)
+        test_report = mock.Mock()
+
+        with self.assertRaisesRegex(errors.ServerFailure, "Collection validation failed"):
+            hook.after_test(make_test(), test_report)
+
+        test_report.addFailure.assert_called_once()
+
+    def test_skip_namespace_not_found(self):
+        not_found = {"ok": 0, "codeName": "NamespaceNotFound"}
+        fixture = make_replset([make_client(validate_response=not_found)])
+        shell_options = {"global_vars": {"TestData": {"skipValidationOnNamespaceNotFound": True}}}
+        hook = validate.ValidateCollections(logging.getLogger("hook"), fixture,
+                                            shell_options=shell_options, use_python=True)
+
+        self.assertTrue(hook._validate_node(logging.getLogger("test"), fixture.nodes[0]))
+
+    def test_skip_validation_namespaces(self):
+        shell_options = {
+            "global_vars": {"TestData": {"skipValidationNamespaces": ["test.coll", "other.coll"]}}
+        }
+        hook = validate.ValidateCollections(logging.getLogger("hook"), mock.Mock(),
+                                            shell_options=shell_options)
+
+        self.assertEqual(
+            hook._get_list_collections_filter("test"),
+            {"$and": [{"type": "collection"}, {"name": {"$ne": "coll"}}]})
+        self.assertEqual(hook._get_list_collections_filter("admin"), {"type": "collection"})
+
+
+class TestCheckDBHash(unittest.TestCase):
+    def make_coll_infos(self, conn_name, infos, stats=None):
+        client = mock.MagicMock()
+        client["test"].list_collections.return_value = infos
+        client["test"].command.return_value = stats or {"ok": 1, "capped": False, "nindexes": 1}
+        return dbhash._CollInfos(client, conn_name, conn_name + ":27017", "test")
+
+    def check_db_hash(self, source_hash, syncing_hash, syncing_stats=None):
+        infos = [{"name": "coll", "type": "collection", "options": {}}]
+        checker = dbhash._ReplSetDBHashChecker(logging.getLogger("test"), mock.Mock(), [],
+                                               mock.Mock(), [])
+        checker._dump_collection_diff = mock.Mock()
+        return checker._check_db_hash(source_hash, self.make_coll_infos("primary", infos),
+                                      syncing_hash,
+                                      self.make_coll_infos("secondary", infos, syncing_stats),
+                                      True)
+
+    def test_matching_hashes(self):
+        db_hash = {"collections": {"coll": "abc"}, "md5": "def"}
+        self.assertTrue(self.check_db_hash(db_hash, dict(db_hash)))
+
+    def test_different_collection_hash(self):
+        self.assertFalse(
+            self.check_db_hash({"collections": {"coll": "abc"}, "md5": "def"},
+                               {"collections": {"coll": "xyz"}, "md5": "def"}))
+
+    def test_different_number_of_collections(self):
+        self.assertFalse(
+            self.check_db_hash({"collections": {"coll": "abc"}, "md5": "def"},
+                               {"collections": {"coll": "abc", "extra": "xyz"}, "md5": "def"}))
+
+    def test_different_number_of_indexes(self):
+        db_hash = {"collections": {"coll": "abc"}, "md5": "def"}
+        self.assertFalse(
+            self.check_db_hash(db_hash, dict(db_hash), {"ok": 1, "capped": False, "nindexes": 2}))
+
+    def test_ignores_collection_flags(self):
+        self.assertEqual(
+            dbhash._normalize_coll_info({"name": "coll", "options": {"flags": 1}}),
+            dbhash._normalize_coll_info({"name": "coll", "options": {}}))
+
+
+class TestBSONSortKey(unittest.TestCase):
+    def test_orders_by_bson_type_first(self):
+        values = [
+            bson.max_key.MaxKey(),
+            bson.timestamp.Timestamp(1, 1),
+            datetime.datetime(2021, 1, 1),
+            True,
+            bson.objectid.ObjectId("000000000000000000000001"),
+            b"\x00",
+            {"a": 1},
+            "a",
+            bson.decimal128.Decimal128("2.5"),
+            1,
+            None,
+            bson.min_key.MinKey(),
+        ]
+
+        self.assertEqual(list(reversed(values)), sorted(values, key=dbhash._bson_sort_key))
+
+    def test_orders_numbers_by_value(self):
+        values = [3, 2.5, bson.int64.Int64(2), bson.decimal128.Decimal128("1.5"), -1.0]
+
+        self.assertEqual(list(reversed(values)), sorted(values, key=dbhash._bson_sort_key))
+
+    def test_orders_objects_field_by_field(self):
+        # The type of each field is compared before its name.
+        values = [{"a": "x"}, {"b": 1}, {"a": 2, "b": 1}, {"a": 2}, {"a": 1}]
+
+        self.assertEqual(list(reversed(values)), sorted(values, key=dbhash._bson_sort_key))
+
+    def test_collection_diff_with_mixed_id_types(self):
+        docs = [{"_id": 1}, {"_id": 2.5}, {"_id": "a"}, {"_id": {"x": 1}}]
+        syncing_docs = [{"_id": 1}, {"_id": 2.5, "extra": True}, {"_id": "a"}, {"_id": {"x": 1}}]
+        source_infos = mock.Mock(host="source:27017")
+        source_infos.find_sorted.return_value = iter(docs)
+        syncing_infos = mock.Mock(host="syncing:27017")
+        syncing_infos.find_sorted.return_value = iter(syncing_docs)
+        logger = mock.Mock()
+        checker = dbhash._ReplSetDBHashChecker(logger, mock.Mock(), [], mock.Mock(), [])
+
+        checker._dump_collection_diff(source_infos, syncing_infos, "coll")
+
+        messages = [call[0][0] for call in logger.info.call_args_list]
+        self.assertEqual(1, sum("Mismatching documents" in msg for msg in messages))
+        self.assertFalse(any("missing" in msg for msg in messages))
+
+
+if __name__ == "__main__":
+    unittest.main()
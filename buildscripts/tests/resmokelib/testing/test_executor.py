@@ -144,6 +144,17 @@ class TestMakeTestQueue(unittest.TestCase):
             element = test_queue.get()
             self.assertIn(element, self.suite.tests)
 
+    def test_longest_first(self):
+        runtimes = {self.suite.tests[0]: 5.0, self.suite.tests[2]: 60.0}
+        with mock.patch(ns("_config")) as config_mock, \
+             mock.patch(ns("testruntimes.read"), return_value=runtimes):
+            config_mock.TEST_RUNTIMES_FILE = "runtimes.json"
+            test_queue = self.ut_executor._make_test_queue()
+
+        queued = [test_queue.get() for _ in range(test_queue.qsize())]
+        # The test without a runtime is assumed to take the average runtime.
+        self.assertEqual(queued, [self.suite.tests[2], self.suite.tests[1], self.suite.tests[0]])
+
 
 class UnitTestExecutor(executor.TestSuiteExecutor):
     def __init__(self, suite, config):  # pylint: disable=super-init-not-called
@@ -1,10 +1,15 @@
 """ Unit tests for archival. """
 
+import gzip
+import io
+import json
 import logging
 import os
 import random
 import shutil
+import tarfile
 import tempfile
+import threading
 import unittest
 
 from buildscripts.resmokelib.utils import archival
@@ -31,10 +36,39 @@ class MockS3Client(object):
     def upload_file(self, *args, **kwargs):
         self.logger.info("MockS3Client upload_file %s %s", args, kwargs)
 
+    def upload_fileobj(self, fileobj, *args, **kwargs):
+        self.logger.info("MockS3Client upload_fileobj %s %s", args, kwargs)
+        while fileobj.read(1024 * 1024):
+            pass
+
     def delete_object(self, *args, **kwargs):
         self.logger.info("MockS3Client delete_object %s %s", args, kwargs)
 
 
+class LocalS3Client(object):
+    """ Class standing in for the S3 client by storing the uploaded objects in a directory. """
+
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+
+    def get_path(self, bucket, key):
+        return os.path.join(self.root_dir, bucket, key)
+
+    def upload_fileobj(self, fileobj, bucket, key, **kwargs):  # pylint: disable=unused-argument
+        path = self.get_path(bucket, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as fileh:
+            # Read in multipart upload sized parts, the same as boto3 does for a stream.
+            while True:
+                part = fileobj.read(5 * 1024 * 1024)
+                if not part:
+                    break
+                fileh.write(part)
+
+    def delete_object(self, Bucket, Key):  # pylint: disable=invalid-name
+        os.remove(self.get_path(Bucket, Key))
+
+
 class ArchivalTestCase(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -238,3 +272,111 @@ class ArchivalLimitTests(ArchivalTestCase):
         status, message = self.archive.archive_files_to_s3(display_name, temp_file, self.bucket,
                                                            s3_path)
         self.assertEqual(1, status, message)
+
+
+class ArchivalLocalS3Tests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.s3_client = LocalS3Client(os.path.join(self.temp_dir, "s3"))
+        self.archival_json_file = os.path.join(self.temp_dir, "archive.json")
+        self.archive = archival.Archival(logging.getLogger(), self.archival_json_file,
+                                         s3_client=self.s3_client)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_archives_are_uploaded_and_recorded(self):
+        data_dir = os.path.join(self.temp_dir, "data")
+        os.makedirs(data_dir)
+        contents = {}
+        for i in range(3):
+            contents["file{}".format(i)] = os.urandom(1024 * 1024) + b"x" * (3 * 1024 * 1024)
+            with open(os.path.join(data_dir, "file{}".format(i)), "wb") as fileh:
+                fileh.write(contents["file{}".format(i)])
+
+        for i in range(2):
+            status, message = self.archive.archive_files_to_s3(
+                "Data files {}".format(i), data_dir, _BUCKET, "unittest/data{}.tgz".format(i))
+            self.assertEqual(0, status, message)
+        self.archive.exit()
+
+        for i in range(2):
+            with tarfile.open(self.s3_client.get_path(_BUCKET, "unittest/data{}.tgz".format(i)),
+                              "r:gz") as tar_handle:
+                for (name, data) in contents.items():
+                    member = tar_handle.extractfile(os.path.join(data_dir, name).lstrip("/"))
+                    self.assertEqual(data, member.read())
+
+        with open(self.archival_json_file) as archival_fh:
+            self.assertEqual(
+                json.load(archival_fh),
+                [{
+                    "name": "Data files {}".format(i),
+                    "link": "https://s3.amazonaws.com/{}/unittest/data{}.tgz".format(_BUCKET, i),
+                    "visibility": "private"
+                } for i in range(2)])
+
+
+class ParallelGzipWriterTests(unittest.TestCase):
+    def test_output_is_gzip(self):
+        data = os.urandom(100 * 1024) + b"y" * (100 * 1024)
+        output = io.BytesIO()
+        writer = archival.ParallelGzipWriter(output, num_threads=4, block_size=16 * 1024)
+        for i in range(0, len(data), 1000):
+            writer.write(data[i:i + 1000])
+        writer.close()
+
+        self.assertEqual(data, gzip.decompress(output.getvalue()))
+
+    def test_empty_output_is_gzip(self):
+        output = io.BytesIO()
+        writer = archival.ParallelGzipWriter(output)
+        writer.close()
+
+        self.assertEqual(b"", gzip.decompress(output.getvalue()))
+
+
+class SpoolFileTests(unittest.TestCase):
+    def setUp(self):
+        self.spool_file = archival.SpoolFile()
+
+    def tearDown(self):
+        os.remove(self.spool_file.name)
+
+    def test_reader_waits_for_writer(self):
+        result = []
+
+        def read():
+            with self.spool_file.open_reader() as reader:
+                result.append(reader.read(8))
+                result.append(reader.read())
+
+        reader_thread = threading.Thread(target=read)
+        reader_thread.start()
+        for chunk in [b"abc", b"def", b"ghi", b"jkl"]:
+            self.spool_file.write(chunk)
+        self.spool_file.close()
+        reader_thread.join()
+
+        self.assertEqual([b"abcdefgh", b"ijkl"], result)
+
+    def test_reader_raises_on_error(self):
+        self.spool_file.write(b"abc")
+        self.spool_file.close(error=OSError("No space left on device"))
+
+        with self.spool_file.open_reader() as reader:
+            with self.assertRaises(IOError):
+                reader.read()
+
+
+class AppendArchivalRecordTests(unittest.TestCase):
+    def test_records_form_a_json_list(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            archival_file = os.path.join(temp_dir, "archive.json")
+            with open(archival_file, "w") as archival_fh:
+                archival_fh.write("stale")
+            records = [{"name": "record{}".format(i)} for i in range(3)]
+            for (i, record) in enumerate(records):
+                archival.append_archival_record(archival_file, record, i == 0)
+                with open(archival_file) as archival_fh:
+                    self.assertEqual(records[:i + 1], json.load(archival_fh))
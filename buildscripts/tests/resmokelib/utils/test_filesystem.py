@@ -0,0 +1,51 @@
+"""Unit tests for buildscripts/resmokelib/utils/filesystem.py."""
+
+import os
+import tempfile
+import unittest
+
+from buildscripts.resmokelib.utils import filesystem
+
+# pylint: disable=missing-docstring
+
+
+class TestCloneDirectory(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmpdir.name, "source")
+        os.makedirs(os.path.join(self.source, "journal"))
+        os.makedirs(os.path.join(self.source, "diagnostic.data"))
+        for name in ["collection-0.wt", os.path.join("journal", "WiredTigerLog.01"),
+                     os.path.join("journal", "WiredTigerPreplog.01"),
+                     os.path.join("diagnostic.data", "metrics")]:
+            with open(os.path.join(self.source, name), "w") as fh:
+                fh.write(name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_clone_directory(self):
+        dest = os.path.join(self.tmpdir.name, "dest")
+        filesystem.clone_directory(self.source, dest)
+
+        with open(os.path.join(dest, "journal", "WiredTigerLog.01")) as fh:
+            self.assertEqual(os.path.join("journal", "WiredTigerLog.01"), fh.read())
+        self.assertTrue(os.path.isfile(os.path.join(dest, "diagnostic.data", "metrics")))
+
+    def test_copies_are_independent(self):
+        dest = os.path.join(self.tmpdir.name, "dest")
+        filesystem.clone_directory(self.source, dest)
+
+        with open(os.path.join(dest, "collection-0.wt"), "r+") as fh:
+            fh.write("modified")
+
+        with open(os.path.join(self.source, "collection-0.wt")) as fh:
+            self.assertEqual("collection-0.wt", fh.read())
+
+    def test_ignore_patterns(self):
+        dest = os.path.join(self.tmpdir.name, "dest")
+        filesystem.clone_directory(self.source, dest,
+                                   ignore_patterns=("diagnostic.data", "WiredTigerPreplog.*"))
+
+        self.assertEqual(["collection-0.wt", "journal"], sorted(os.listdir(dest)))
+        self.assertEqual(["WiredTigerLog.01"], os.listdir(os.path.join(dest, "journal")))
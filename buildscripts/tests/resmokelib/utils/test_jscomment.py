@@ -0,0 +1,110 @@
+"""Unit tests for the buildscripts.resmokelib.utils.jscomment module."""
+
+import os
+import tempfile
+import textwrap
+import unittest
+
+from buildscripts.resmokelib.utils import jscomment
+
+# pylint: disable=missing-docstring,protected-access
+
+
+class JSCommentTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_test(self, name, contents):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "w") as fp:
+            fp.write(textwrap.dedent(contents))
+        return path
+
+
+class TestGetTags(JSCommentTestCase):
+    def test_block_comment(self):
+        path = self.write_test(
+            "block.js", """\
+            /**
+             * @tags: [ "tag1",  # double quoted
+             *          'tag2'   # single quoted
+             *                   # line with only a comment
+             *         , tag3    # no quotes
+             *         ]
+             */
+            (function() {
+            })();
+            """)
+        self.assertEqual(jscomment.get_tags(path), ["tag1", "tag2", "tag3"])
+
+    def test_tags_after_statements(self):
+        path = self.write_test(
+            "statements.js", """\
+            (function() {
+            'use strict';
+
+            load("jstests/libs/fixture_helpers.js");  // for FixtureHelpers
+
+            // @tags: [requires_persistence]
+            assert(true);
+            """)
+        self.assertEqual(jscomment.get_tags(path), ["requires_persistence"])
+
+    def test_tags_after_code_are_ignored(self):
+        path = self.write_test(
+            "code.js", """\
+            /**
+             * A test without tags.
+             */
+            if (true) {
+                // @tags: [not_a_tag]
+            }
+            """)
+        self.assertEqual(jscomment.get_tags(path), [])
+
+
+class TestTagsCache(JSCommentTestCase):
+    def test_cache_persisted_across_instances(self):
+        test_path = self.write_test("test.js", "// @tags: [tag1]\n")
+        cache_file = os.path.join(self.temp_dir.name, "cache", "tags.json")
+
+        cache = jscomment.TagsCache(cache_file)
+        cache.prefetch([test_path])
+        self.assertTrue(os.path.exists(cache_file))
+        self.assertEqual(cache.get_tags(test_path), ["tag1"])
+
+        # A fresh cache reads the tags from the index rather than from the file.
+        cache = jscomment.TagsCache(cache_file)
+        self.assertEqual(cache._lookup(test_path)[0], ["tag1"])
+
+    def test_modified_file_is_reparsed(self):
+        test_path = self.write_test("test.js", "// @tags: [tag1]\n")
+        cache_file = os.path.join(self.temp_dir.name, "tags.json")
+
+        cache = jscomment.TagsCache(cache_file)
+        cache.prefetch([test_path])
+
+        self.write_test("test.js", "// @tags: [tag1, tag2]\n")
+        cache = jscomment.TagsCache(cache_file)
+        self.assertIsNone(cache._lookup(test_path)[0])
+        self.assertEqual(cache.get_tags(test_path), ["tag1", "tag2"])
+
+    def test_prefetch_many_files(self):
+        test_paths = [
+            self.write_test("test%d.js" % i, "// @tags: [tag%d]\n" % i) for i in range(20)
+        ]
+
+        cache = jscomment.TagsCache(num_threads=4)
+        cache.prefetch(test_paths)
+        for i, test_path in enumerate(test_paths):
+            self.assertEqual(cache._lookup(test_path)[0], ["tag%d" % i])
+
+    def test_invalid_tags_raise(self):
+        test_path = self.write_test("test.js", "// @tags: [tag1, {]\n")
+
+        cache = jscomment.TagsCache()
+        with self.assertRaises(ValueError):
+            cache.prefetch([test_path])
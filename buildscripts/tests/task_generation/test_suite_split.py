@@ -34,7 +34,7 @@ def tst_stat_mock(file, duration, pass_count):
     return MagicMock(test_file=file, avg_duration_pass=duration, num_pass=pass_count)
 
 
-def build_mock_split_config(target_resmoke_time=None, max_sub_suites=None):
+def build_mock_split_config(target_resmoke_time=None, max_sub_suites=None, split_strategy=None):
     return under_test.SuiteSplitConfig(
         evg_project="project",
         target_resmoke_time=target_resmoke_time if target_resmoke_time else 60,
@@ -42,6 +42,7 @@ def build_mock_split_config(target_resmoke_time=None, max_sub_suites=None):
         max_tests_per_suite=100,
         start_date=datetime.utcnow(),
         end_date=datetime.utcnow(),
+        split_strategy=split_strategy,
     )
 
 
@@ -108,6 +109,29 @@ class TestSplitSuite(unittest.TestCase):
         for sub_suite in suite.sub_suites:
             self.assertEqual(10, len(sub_suite.test_list))
 
+    def test_calculate_suites_with_configured_split_strategy(self):
+        mock_test_stats = [tst_stat_mock(f"test{i}.js", 60 * (i % 7 + 1), 1) for i in range(50)]
+        split_config = build_mock_split_config(target_resmoke_time=30, max_sub_suites=5,
+                                               split_strategy="lpt")
+        split_params = build_mock_split_params()
+
+        suite_split_service = build_mock_service(split_config=split_config)
+        suite_split_service.evg_api.test_stats_by_project.return_value = mock_test_stats
+        suite_split_service.resmoke_proxy.list_tests.return_value = [
+            stat.test_file for stat in mock_test_stats
+        ]
+        suite_split_service.resmoke_proxy.read_suite_config.return_value = {}
+
+        with patch("os.path.exists") as exists_mock:
+            exists_mock.return_value = True
+
+            suite = suite_split_service.split_suite(split_params)
+
+        # 50 tests with a total runtime of 197 minutes split into 5 suites of 39 or 40 minutes.
+        self.assertEqual(5, len(suite))
+        for sub_suite in suite.sub_suites:
+            self.assertIn(sub_suite.get_runtime(), [39 * 60, 40 * 60])
+
     def test_calculate_suites_fallback_on_error(self):
         n_tests = 100
         max_sub_suites = 4
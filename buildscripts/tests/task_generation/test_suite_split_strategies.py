@@ -126,3 +126,112 @@ class TestGreedyDivision(unittest.TestCase):
                                             max_tests_per_suite=2)
 
         self.assertEqual(len(suites), max_suites)
+
+
+class TestLongestProcessingTimeDivision(unittest.TestCase):
+    def test_if_less_total_than_max_only_one_suite_created(self):
+        tests_runtimes = [
+            TestRuntime("test1", 5),
+            TestRuntime("test2", 4),
+            TestRuntime("test3", 3),
+        ]
+
+        suites = under_test.longest_processing_time_division(tests_runtimes, 20)
+
+        self.assertEqual(suites, [["test1", "test2", "test3"]])
+
+    def test_suites_are_balanced(self):
+        # A greedy split of these 50 seconds of tests into 20 second suites gives runtimes of 20,
+        # 14 and 16. Assigning the longest tests first gives 17, 16 and 17.
+        tests_runtimes = [
+            TestRuntime("test1", 10),
+            TestRuntime("test2", 10),
+            TestRuntime("test3", 7),
+            TestRuntime("test4", 7),
+            TestRuntime("test5", 7),
+            TestRuntime("test6", 3),
+            TestRuntime("test7", 3),
+            TestRuntime("test8", 3),
+        ]
+        runtimes = {test.test_name: test.runtime for test in tests_runtimes}
+
+        suites = under_test.longest_processing_time_division(tests_runtimes, 20, max_suites=3)
+
+        self.assertEqual(len(suites), 3)
+        self.assertCountEqual([test for suite in suites for test in suite], runtimes)
+        self.assertLessEqual(max(sum(runtimes[test] for test in suite) for suite in suites), 20)
+
+    def test_suites_are_added_until_runtime_fits(self):
+        # 3 tests of 6 seconds cannot be packed into ceil(18 / 10) = 2 suites of 10 seconds.
+        tests_runtimes = [TestRuntime(f"test_{i}", 6) for i in range(3)]
+
+        suites = under_test.longest_processing_time_division(tests_runtimes, 10)
+
+        self.assertEqual(len(suites), 3)
+
+    def test_if_test_is_greater_than_max_it_goes_alone(self):
+        tests_runtimes = [
+            TestRuntime("test1", 15),
+            TestRuntime("test2", 4),
+            TestRuntime("test3", 3),
+        ]
+
+        suites = under_test.longest_processing_time_division(tests_runtimes, 7)
+
+        self.assertIn(["test1"], suites)
+        self.assertEqual(len(suites), 2)
+
+    def test_max_tests_per_suite_is_respected(self):
+        tests_runtimes = [TestRuntime("long", 50)]
+        tests_runtimes.extend(TestRuntime(f"test_{i}", 1) for i in range(10))
+
+        suites = under_test.longest_processing_time_division(tests_runtimes, 100,
+                                                             max_tests_per_suite=4)
+
+        self.assertEqual(len(suites), 3)
+        for suite in suites:
+            self.assertLessEqual(len(suite), 4)
+
+    def test_max_suites_overrides_max_tests_per_suite(self):
+        tests_runtimes = [TestRuntime(f"tests_{i}", 1) for i in range(10)]
+
+        suites = under_test.longest_processing_time_division(tests_runtimes, 100, max_suites=2,
+                                                             max_tests_per_suite=2)
+
+        self.assertEqual(len(suites), 2)
+        self.assertEqual([len(suite) for suite in suites], [5, 5])
+
+    def test_empty_test_list(self):
+        self.assertEqual(under_test.longest_processing_time_division([], 100), [])
+
+    def test_karmarkar_karp_refinement(self):
+        # LPT packs these into [8, 5, 4] and [7, 6] with runtimes of 17 and 13, differencing
+        # packs them into [8, 6] and [7, 5, 4] with runtimes of 14 and 16.
+        tests_runtimes = [
+            TestRuntime("test1", 8),
+            TestRuntime("test2", 7),
+            TestRuntime("test3", 6),
+            TestRuntime("test4", 5),
+            TestRuntime("test5", 4),
+        ]
+        runtimes = {test.test_name: test.runtime for test in tests_runtimes}
+
+        lpt_suites = under_test.longest_processing_time_division(tests_runtimes, 15, max_suites=2)
+        kk_suites = under_test.karmarkar_karp_division(tests_runtimes, 15, max_suites=2)
+
+        def makespan(suites):
+            return max(sum(runtimes[test] for test in suite) for suite in suites)
+
+        self.assertEqual(makespan(lpt_suites), 17)
+        self.assertEqual(makespan(kk_suites), 16)
+        self.assertCountEqual([test for suite in kk_suites for test in suite], runtimes)
+
+
+class TestGetSplitStrategy(unittest.TestCase):
+    def test_known_strategy(self):
+        self.assertIs(under_test.get_split_strategy("lpt"),
+                      under_test.longest_processing_time_division)
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            under_test.get_split_strategy("unknown")
@@ -1,7 +1,11 @@
 """Unit tests for the selected_tests script."""
 import json
 import os
+import shutil
 import unittest
+from tempfile import TemporaryDirectory
+
+from mock import patch
 
 from buildscripts import errorcodes
 
@@ -64,3 +68,48 @@ class TestErrorcodes(unittest.TestCase):
         self.assertEqual(1234, errorcodes.coerce_to_number('server-1234'))
         self.assertEqual(1234, errorcodes.coerce_to_number('SERVER-1234'))
         self.assertEqual(-1, errorcodes.coerce_to_number('not a ticket'))
+
+
+class TestErrorcodesIndex(unittest.TestCase):
+    """Test the index of the assertions in each source file."""
+
+    def setUp(self):
+        errorcodes.codes = []
+        self.tmpdir = TemporaryDirectory()
+        self.src_root = os.path.join(self.tmpdir.name, 'src')
+        shutil.copytree(TESTDATA_DIR + 'dup_checking/', self.src_root)
+        patcher = patch.object(errorcodes, 'index_file', os.path.join(self.tmpdir.name, 'index'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def read_error_codes(self):
+        errorcodes.codes = []
+        with patch.object(errorcodes, '_scan_file', wraps=errorcodes._scan_file) as scan_mock:
+            result = errorcodes.read_error_codes(self.src_root)
+        return (result, [call[0][0][0] for call in scan_mock.call_args_list])
+
+    def test_unchanged_files_are_not_scanned(self):
+        ((assertions, errors, _), scanned) = self.read_error_codes()
+        self.assertEqual(4, len(assertions))
+        self.assertEqual(2, len(errors))
+        self.assertNotEqual([], scanned)
+
+        ((assertions_again, errors_again, _), scanned) = self.read_error_codes()
+        self.assertEqual(assertions, assertions_again)
+        self.assertEqual(errors, errors_again)
+        self.assertEqual([], scanned)
+
+    def test_changed_files_are_scanned(self):
+        self.read_error_codes()
+
+        changed_file = os.path.join(self.src_root, 'new.cpp')
+        with open(changed_file, 'w') as fh:
+            fh.write('uassert(3, "duplicate");\n')
+
+        ((assertions, errors, _), scanned) = self.read_error_codes()
+        self.assertEqual([changed_file], scanned)
+        self.assertEqual(5, len(assertions))
+        self.assertEqual(['2', '2', '3', '3'], sorted(loc.code for loc in errors))
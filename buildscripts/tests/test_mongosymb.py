@@ -0,0 +1,107 @@
+"""Unit tests for mongosymb.py."""
+
+import os
+import stat
+import sys
+import textwrap
+import unittest
+from tempfile import TemporaryDirectory
+
+import buildscripts.mongosymb as under_test
+
+# pylint: disable=missing-docstring,protected-access
+
+FAKE_SYMBOLIZER = textwrap.dedent("""\
+    #!{python}
+    import sys
+
+    with open({log!r}, "a") as log:
+        for line in sys.stdin:
+            (_, path, addr) = line.split()
+            log.write(addr + "\\n")
+            if path.endswith("nosyms"):
+                sys.stdout.write("??\\n??:0:0\\n\\n")
+            else:
+                sys.stdout.write("fn_{{0}}\\nsrc/{{0}}.cpp:{{1}}:7\\n\\n".format(addr, int(addr, 16)))
+            sys.stdout.flush()
+    """)
+
+
+def make_frame(addr, path="mongod", build_id="abc123"):
+    return {"path": path, "buildId": build_id, "addr": addr}
+
+
+class TestSymbolizer(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.log_path = os.path.join(self.tmpdir.name, "requests.log")
+        self.symbolizer_path = os.path.join(self.tmpdir.name, "llvm-symbolizer")
+        with open(self.symbolizer_path, "w") as fh:
+            fh.write(FAKE_SYMBOLIZER.format(python=sys.executable, log=self.log_path))
+        os.chmod(self.symbolizer_path, stat.S_IRWXU)
+        self.cache_dir = os.path.join(self.tmpdir.name, "cache")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def requested(self):
+        if not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path) as fh:
+            return sorted(fh.read().split())
+
+    def symbolize(self, frames, jobs=1, cache=True):
+        with under_test.make_symbolizer(self.symbolizer_path, [], symbolizer_jobs=jobs,
+                                        symbol_cache_dir=self.cache_dir,
+                                        no_symbol_cache=not cache) as symbolizer:
+            return symbolizer.symbolize(frames)
+
+    def test_symbolizes_frames(self):
+        frames = self.symbolize([make_frame("0x10"), make_frame("0x20", path=None)])
+
+        self.assertEqual(frames[0]["symbinfo"], [{
+            "fn": "fn_0x10", "file": "src/0x10.cpp", "line": 16, "column": 7
+        }])
+        self.assertNotIn("symbinfo", frames[1])
+
+    def test_repeated_addresses_are_resolved_once(self):
+        frames = self.symbolize([make_frame("0x10"), make_frame("0x20"), make_frame("0x10")])
+
+        self.assertEqual(self.requested(), ["0x10", "0x20"])
+        self.assertEqual(frames[0]["symbinfo"], frames[2]["symbinfo"])
+
+    def test_multiple_jobs(self):
+        addrs = ["0x{:x}".format(i) for i in range(1, 500)]
+        frames = self.symbolize([make_frame(addr) for addr in addrs], jobs=4)
+
+        self.assertEqual(self.requested(), sorted(addrs))
+        for addr, frame in zip(addrs, frames):
+            self.assertEqual(frame["symbinfo"][0]["fn"], "fn_" + addr)
+
+    def test_cache_is_reused(self):
+        self.symbolize([make_frame("0x10"), make_frame("0x20")])
+        frames = self.symbolize([make_frame("0x10"), make_frame("0x30")])
+
+        self.assertEqual(self.requested(), ["0x10", "0x20", "0x30"])
+        self.assertEqual(frames[0]["symbinfo"][0]["fn"], "fn_0x10")
+        self.assertEqual(os.listdir(self.cache_dir), ["abc123.json"])
+
+    def test_cache_is_per_build_id(self):
+        self.symbolize([make_frame("0x10")])
+        self.symbolize([make_frame("0x10", build_id="def456")])
+
+        self.assertEqual(self.requested(), ["0x10", "0x10"])
+
+    def test_failures_are_not_cached(self):
+        self.symbolize([make_frame("0x10", path="nosyms")])
+        frames = self.symbolize([make_frame("0x10", path="nosyms")])
+
+        self.assertEqual(self.requested(), ["0x10", "0x10"])
+        self.assertEqual(frames[0]["symbinfo"][0]["fn"], "??")
+
+    def test_no_cache(self):
+        self.symbolize([make_frame("0x10")], cache=False)
+        self.symbolize([make_frame("0x10")], cache=False)
+
+        self.assertEqual(self.requested(), ["0x10", "0x10"])
+        self.assertFalse(os.path.exists(self.cache_dir))
@@ -0,0 +1,98 @@
+"""Unit tests for quickcpplint.py."""
+
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from mock import patch
+
+import buildscripts.quickcpplint as under_test
+
+# pylint: disable=missing-docstring,protected-access
+
+LICENSE = "\n".join(under_test.simplecpplint.Linter._license_header).format(year=2021) + "\n"
+
+
+class TestLintFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.cache_file = os.path.join(self.tmpdir.name, "cache", "lint.json")
+        patcher = patch.object(under_test, "_cache_file", self.cache_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_file(self, name, body):
+        file_name = os.path.join(self.tmpdir.name, name)
+        with open(file_name, "w") as fh:
+            fh.write(LICENSE + body)
+        return file_name
+
+    def lint(self, file_names):
+        with patch.object(under_test.simplecpplint, "lint_file",
+                          wraps=under_test.simplecpplint.lint_file) as lint_file_mock, \
+             patch.object(under_test.parallel, "parallel_process_pool",
+                          side_effect=self.run_in_process):
+            try:
+                under_test._lint_files(file_names)
+                passed = True
+            except SystemExit:
+                passed = False
+        return (passed, sorted(call[0][0] for call in lint_file_mock.call_args_list))
+
+    @staticmethod
+    def run_in_process(items, func, initializer, initargs):
+        # Run the workers in this process so that the calls to the linter can be observed.
+        initializer(*initargs)
+        return [func(item) for item in items]
+
+    def test_clean_files_are_cached(self):
+        good = self.write_file("good.cpp", "int x;\n")
+
+        self.assertEqual(self.lint([good]), (True, [good]))
+        self.assertEqual(self.lint([good]), (True, []))
+
+    def test_changed_files_are_linted(self):
+        good = self.write_file("good.cpp", "int x;\n")
+        self.lint([good])
+
+        self.write_file("good.cpp", "int y;\n")
+
+        self.assertEqual(self.lint([good]), (True, [good]))
+
+    def test_failing_files_are_not_cached(self):
+        bad = self.write_file("bad.cpp", "std::atomic<int> x;\n")
+
+        self.assertEqual(self.lint([bad]), (False, [bad]))
+        self.assertEqual(self.lint([bad]), (False, [bad]))
+
+    def test_linter_changes_invalidate_the_cache(self):
+        good = self.write_file("good.cpp", "int x;\n")
+        self.lint([good])
+
+        with patch.object(under_test, "_get_linter_version", return_value="new"):
+            self.assertEqual(self.lint([good]), (True, [good]))
+
+    def test_no_cache(self):
+        good = self.write_file("good.cpp", "int x;\n")
+
+        with patch.object(under_test, "_cache_file", None):
+            self.lint([good])
+            self.assertEqual(self.lint([good]), (True, [good]))
+        self.assertFalse(os.path.exists(self.cache_file))
+
+
+def _square(value):
+    return value * value
+
+
+class TestParallelProcessPool(unittest.TestCase):
+    def test_results_are_in_order(self):
+        self.assertEqual(
+            under_test.parallel.parallel_process_pool(list(range(100)), _square),
+            [value * value for value in range(100)])
+
+    def test_no_items(self):
+        self.assertEqual(under_test.parallel.parallel_process_pool([], _square), [])
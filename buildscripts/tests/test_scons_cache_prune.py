@@ -0,0 +1,130 @@
+"""Unit tests for scons_cache_prune.py."""
+
+import json
+import os
+import time
+import unittest
+from tempfile import TemporaryDirectory
+
+import buildscripts.scons_cache_prune as under_test
+
+# pylint: disable=missing-docstring,invalid-name,protected-access
+
+GIGBYTES = under_test.GIGBYTES
+
+
+def create_cache_item(cache_path, name, size, access_time):
+    item_dir = os.path.join(cache_path, name[:2], name + ".cksum")
+    os.makedirs(item_dir)
+    with open(os.path.join(item_dir, name), "wb") as fh:
+        fh.truncate(size)
+    os.utime(os.path.join(item_dir, name), (access_time, access_time))
+    os.utime(item_dir, (access_time, access_time))
+    return item_dir
+
+
+def write_journal(cache_path, name, entries):
+    journal_dir = os.path.join(cache_path, under_test.INDEX_DIR_NAME, "journal")
+    os.makedirs(journal_dir, exist_ok=True)
+    with open(os.path.join(journal_dir, name), "w") as fh:
+        for entry in entries:
+            fh.write(json.dumps(entry) + "\n")
+
+
+class TestPruneCacheWithIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.cache_path = self.tmpdir.name
+        self.now = time.time()
+        # Sizes are in units of 1/1000 GB so that the quotas below stay readable.
+        self.unit = GIGBYTES // 1000
+        self.items = {
+            name: create_cache_item(self.cache_path, name, self.unit, self.now - 100 * (5 - i))
+            for i, name in enumerate(["aa01", "bb02", "cc03", "dd04", "ee05"])
+        }
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def remaining(self):
+        return sorted(name for name, path in self.items.items() if os.path.exists(path))
+
+    def test_full_scan_prunes_least_recently_used(self):
+        self.assertTrue(
+            under_test.prune_cache_with_index(self.cache_path, 0.004, 0.8, rescan_interval_hours=0))
+
+        self.assertEqual(self.remaining(), ["cc03", "dd04", "ee05"])
+
+    def test_within_quota_is_not_pruned(self):
+        self.assertTrue(
+            under_test.prune_cache_with_index(self.cache_path, 1, 0.8, rescan_interval_hours=24))
+
+        self.assertEqual(len(self.remaining()), 5)
+
+    def test_journals_update_the_index(self):
+        under_test.prune_cache_with_index(self.cache_path, 1, 0.8, rescan_interval_hours=24)
+
+        # aa01 was used by SCons and a new item was pushed since the last scan.
+        new_item = create_cache_item(self.cache_path, "ff06", self.unit, self.now - 1000)
+        self.items["ff06"] = new_item
+        write_journal(self.cache_path, "host-1-abc.log", [
+            {"path": "aa/aa01.cksum", "size": self.unit, "time": self.now},
+            {"path": "ff/ff06.cksum", "size": self.unit, "time": self.now - 50},
+        ])
+
+        self.assertTrue(
+            under_test.prune_cache_with_index(self.cache_path, 0.005, 0.8, rescan_interval_hours=24))
+
+        self.assertEqual(self.remaining(), ["aa01", "dd04", "ee05", "ff06"])
+        self.assertEqual(os.listdir(os.path.join(self.cache_path, under_test.INDEX_DIR_NAME,
+                                                 "journal")), [])
+
+    def test_open_journals_are_not_merged(self):
+        under_test.prune_cache_with_index(self.cache_path, 1, 0.8, rescan_interval_hours=24)
+        write_journal(self.cache_path, "host-1-abc.open", [
+            {"path": "aa/aa01.cksum", "size": self.unit, "time": self.now},
+        ])
+
+        under_test.prune_cache_with_index(self.cache_path, 0.004, 0.8, rescan_interval_hours=24)
+
+        self.assertEqual(self.remaining(), ["cc03", "dd04", "ee05"])
+
+    def test_items_removed_outside_the_index(self):
+        under_test.prune_cache_with_index(self.cache_path, 1, 0.8, rescan_interval_hours=24)
+        os.rename(self.items["aa01"], self.items["aa01"] + ".gone")
+
+        self.assertTrue(
+            under_test.prune_cache_with_index(self.cache_path, 0.004, 0.8, rescan_interval_hours=24))
+
+        # The missing item counts towards the space freed.
+        self.assertEqual(self.remaining(), ["cc03", "dd04", "ee05"])
+
+    def test_items_used_outside_the_journals_are_kept(self):
+        under_test.prune_cache_with_index(self.cache_path, 1, 0.8, rescan_interval_hours=24)
+        aa01_file = os.path.join(self.items["aa01"], "aa01")
+        os.utime(aa01_file, (self.now, self.now))
+
+        under_test.prune_cache_with_index(self.cache_path, 0.004, 0.8, rescan_interval_hours=24)
+
+        self.assertEqual(self.remaining(), ["aa01", "dd04", "ee05"])
+
+    def test_index_is_not_part_of_the_cache(self):
+        under_test.prune_cache_with_index(self.cache_path, 1, 0.8, rescan_interval_hours=24)
+
+        (total, contents) = under_test.collect_cache_contents(self.cache_path)
+
+        self.assertEqual(total, 5 * self.unit)
+        self.assertEqual(len(contents), 5)
+
+
+class TestPruneCache(unittest.TestCase):
+    def test_prunes_least_recently_used(self):
+        with TemporaryDirectory() as cache_path:
+            now = time.time()
+            old = create_cache_item(cache_path, "aa01", GIGBYTES // 1000, now - 100)
+            new = create_cache_item(cache_path, "bb02", GIGBYTES // 1000, now)
+
+            self.assertTrue(under_test.prune_cache(cache_path, 0.0015, 0.8))
+
+            self.assertFalse(os.path.exists(old))
+            self.assertTrue(os.path.exists(new))
@@ -0,0 +1,41 @@
+"""Unit tests for the util.fileops module."""
+
+import os
+import tempfile
+import unittest
+
+from buildscripts.util import fileops
+
+#pylint: disable=missing-docstring
+
+
+class WriteFileAtomicallyTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_creates_directory_and_writes_text(self):
+        path = os.path.join(self.tmp_dir.name, "dir", "file.json")
+
+        fileops.write_file_atomically(path, "contents")
+
+        with open(path) as file_handle:
+            self.assertEqual("contents", file_handle.read())
+
+    def test_replaces_existing_file_with_bytes(self):
+        path = os.path.join(self.tmp_dir.name, "file.bin")
+        fileops.write_file(path, "old contents")
+
+        fileops.write_file_atomically(path, b"\x00new")
+
+        with open(path, "rb") as file_handle:
+            self.assertEqual(b"\x00new", file_handle.read())
+        self.assertEqual(["file.bin"], os.listdir(self.tmp_dir.name))
+
+    def test_removes_temporary_file_on_error(self):
+        path = os.path.join(self.tmp_dir.name, "file.txt")
+
+        with self.assertRaises(TypeError):
+            fileops.write_file_atomically(path, 1234)
+
+        self.assertEqual([], os.listdir(self.tmp_dir.name))
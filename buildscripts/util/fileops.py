@@ -1,6 +1,7 @@
 """Utility to support file operations."""
 import os
-from typing import Dict, Any
+import tempfile
+from typing import Dict, Any, Union
 
 import yaml
 
@@ -40,6 +41,29 @@ def write_file(path: str, contents: str) -> None:
         file_handle.write(contents)
 
 
+def write_file_atomically(path: str, contents: Union[str, bytes]) -> None:
+    """
+    Write the contents provided to the file in the specified path, replacing it atomically.
+
+    The contents are written to a temporary file in the same directory, which is then renamed to
+    'path'. Concurrent readers see either the previous file or the new one, never a partially
+    written file. The directory will be created if it does not exist.
+
+    :param path: Path of file to write.
+    :param contents: Contents to write to file, as text or bytes.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    (fd, temp_path) = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb" if isinstance(contents, bytes) else "w") as file_handle:
+            file_handle.write(contents)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
 def write_file_to_dir(directory: str, file: str, contents: str) -> None:
     """
     Write the contents provided to the file in the given directory.
@@ -8,6 +8,7 @@ set -o verbose
 
 activate_venv
 GRAPH_FILE=$(find build -name "libdeps.graphml")
-python buildscripts/libdeps/gacli.py --graph-file $GRAPH_FILE > results.txt
+BINARY_GRAPH_FILE=$(find build -name "libdeps.graph")
+python buildscripts/libdeps/gacli.py --graph-file $BINARY_GRAPH_FILE > results.txt
 gzip $GRAPH_FILE
 mv $GRAPH_FILE.gz .
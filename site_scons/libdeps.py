@@ -51,7 +51,6 @@ automatically added when missing.
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
-from collections import defaultdict
 from functools import partial
 import enum
 import copy
@@ -62,11 +61,10 @@ import glob
 import textwrap
 import hashlib
 import json
-import fileinput
 
 try:
     import networkx
-    from buildscripts.libdeps.libdeps.graph import EdgeProps, NodeProps, LibdepsGraph
+    from buildscripts.libdeps.libdeps.graph import EdgeProps, NodeProps, LibdepsGraph, save_libdeps_graph
 except ImportError:
     pass
 
@@ -81,11 +79,13 @@ from SCons.Script import COMMAND_LINE_TARGETS
 class Constants:
     Libdeps = "LIBDEPS"
     LibdepsCached = "LIBDEPS_cached"
+    LibdepsCycleChecked = "LIBDEPS_cycle_checked"
     LibdepsDependents = "LIBDEPS_DEPENDENTS"
     LibdepsGlobal = "LIBDEPS_GLOBAL"
     LibdepsNoInherit = "LIBDEPS_NO_INHERIT"
     LibdepsInterface ="LIBDEPS_INTERFACE"
     LibdepsPrivate = "LIBDEPS_PRIVATE"
+    LibdepsPublicClosure = "LIBDEPS_public_closure"
     LibdepsTags = "LIBDEPS_TAGS"
     LibdepsTagExpansion = "LIBDEPS_TAG_EXPANSIONS"
     MissingLibdep = "MISSING_LIBDEP_"
@@ -288,6 +288,10 @@ class LibdepLinter:
             def print_linting_time():
                 print(f"Spent {self.__class__.linting_time} seconds linting libdeps.")
                 print(f"Found {self.__class__.linting_infractions} issues out of {self.__class__.linting_rules_run} libdeps rules checked.")
+                print(f"Spent {_LibdepsClosureStats.time} seconds computing transitive libdeps "
+                      f"for {_LibdepsClosureStats.queries - _LibdepsClosureStats.cache_hits} targets "
+                      f"({_LibdepsClosureStats.nodes_computed} library closures, "
+                      f"{_LibdepsClosureStats.cache_hits} cached lookups).")
             atexit.register(print_linting_time)
             self.__class__.registered_linting_time = True
 
@@ -642,103 +646,111 @@ def _get_sorted_direct_libdeps(node):
     return direct_sorted
 
 
-class LibdepsVisitationMark(enum.IntEnum):
-    UNMARKED = 0
-    MARKED_PRIVATE = 1
-    MARKED_PUBLIC = 2
+def _get_public_libdeps_closure(node, walking):
+    """Return the node and its public transitive libdeps, in depth-first post-order.
 
+    The closure of each node is computed once, from the closures of its
+    public (and interface) dependencies, and cached on the node so that
+    every dependent reuses it instead of walking the same subgraph again.
+    Nodes only reachable through LIBDEPS_PRIVATE edges are not part of the
+    closure, but are still walked to look for cycles.
+    """
 
-def _libdeps_visit_private(n, marked, walking, debug=False):
-    if marked[n.target_node] >= LibdepsVisitationMark.MARKED_PRIVATE:
-        return
+    closure = getattr(node.attributes, Constants.LibdepsPublicClosure, None)
+    if closure is not None:
+        return closure
 
-    if n.target_node in walking:
-        raise DependencyCycleError(n.target_node)
+    # The walking set is used for cycle detection. We record all our
+    # predecessors in our depth-first search, and if we observe one of
+    # our predecessors as a child, we know we have a cycle.
+    if node in walking:
+        raise DependencyCycleError(node)
 
-    walking.add(n.target_node)
+    walking.add(node)
 
     try:
-        for child in _get_sorted_direct_libdeps(n.target_node):
-            _libdeps_visit_private(child, marked, walking)
+        children = _get_sorted_direct_libdeps(node)
+
+        # Merging the closures of the children in order, keeping the first
+        # occurrence of each node, yields the same order as a single
+        # depth-first walk that skips already visited nodes.
+        closure = []
+        seen = set()
+        for child in children:
+            if child.dependency_type != deptype.Private:
+                for dep in _get_public_libdeps_closure(child.target_node, walking):
+                    if dep not in seen:
+                        seen.add(dep)
+                        closure.append(dep)
+
+        for child in children:
+            if child.dependency_type == deptype.Private:
+                _check_private_libdeps_cycles(child.target_node, walking)
 
-        marked[n.target_node] = LibdepsVisitationMark.MARKED_PRIVATE
+        closure.append(node)
+        setattr(node.attributes, Constants.LibdepsPublicClosure, closure)
+        _LibdepsClosureStats.nodes_computed += 1
+        return closure
 
     except DependencyCycleError as e:
         if len(e.cycle_nodes) == 1 or e.cycle_nodes[0] != e.cycle_nodes[-1]:
-            e.cycle_nodes.insert(0, n.target_node)
+            e.cycle_nodes.insert(0, node)
         raise
 
     finally:
-        walking.remove(n.target_node)
-
-
-def _libdeps_visit(n, tsorted, marked, walking, debug=False):
-    # The marked dictionary tracks which sorts of visitation a node
-    # has received. Values for a given node can be UNMARKED/absent,
-    # MARKED_PRIVATE, or MARKED_PUBLIC. These are to be interpreted as
-    # follows:
-    #
-    # 0/UNMARKED: Node is not not marked.
-    #
-    # MARKED_PRIVATE: Node has only been explored as part of looking
-    # for cycles under a LIBDEPS_PRIVATE edge.
-    #
-    # MARKED_PUBLIC: Node has been explored and any of its transiive
-    # dependencies have been incorporated into `tsorted`.
-    #
-    # The __libdeps_visit_private function above will only mark things
-    # at with MARKED_PRIVATE, while __libdeps_visit will mark things
-    # MARKED_PUBLIC.
-    if marked[n.target_node] == LibdepsVisitationMark.MARKED_PUBLIC:
-        return
+        walking.remove(node)
 
-    # The walking set is used for cycle detection. We record all our
-    # predecessors in our depth-first search, and if we observe one of
-    # our predecessors as a child, we know we have a cycle.
-    if n.target_node in walking:
-        raise DependencyCycleError(n.target_node)
 
-    walking.add(n.target_node)
+def _check_private_libdeps_cycles(node, walking):
+    """Raise a DependencyCycleError if there is a cycle below the given node.
 
-    if debug:
-        print(f"    * {n.dependency_type} => {n.listed_name}")
+    Nodes whose dependencies have already been checked, either here or by
+    computing their public closure, are not walked again.
+    """
 
-    try:
-        children = _get_sorted_direct_libdeps(n.target_node)
-
-        # We first walk all of our public dependencies so that we can
-        # put full marks on anything that is in our public transitive
-        # graph. We then do a second walk into any private nodes to
-        # look for cycles. While we could do just one walk over the
-        # children, it is slightly faster to do two passes, since if
-        # the algorithm walks into a private edge early, it would do a
-        # lot of non-productive (except for cycle checking) walking
-        # and marking, but if another public path gets into that same
-        # subtree, then it must walk and mark it again to raise it to
-        # the public mark level. Whereas, if the algorithm first walks
-        # the whole public tree, then those are all productive marks
-        # and add to tsorted, and then the private walk will only need
-        # to examine those things that are only reachable via private
-        # edges.
+    if (getattr(node.attributes, Constants.LibdepsPublicClosure, None) is not None
+            or getattr(node.attributes, Constants.LibdepsCycleChecked, False)):
+        return
 
-        for child in children:
-            if child.dependency_type != deptype.Private:
-                _libdeps_visit(child, tsorted, marked, walking, debug)
+    if node in walking:
+        raise DependencyCycleError(node)
 
-        for child in children:
-            if child.dependency_type == deptype.Private:
-                _libdeps_visit_private(child, marked, walking, debug)
+    walking.add(node)
+
+    try:
+        for child in _get_sorted_direct_libdeps(node):
+            _check_private_libdeps_cycles(child.target_node, walking)
 
-        marked[n.target_node] = LibdepsVisitationMark.MARKED_PUBLIC
-        tsorted.append(n.target_node)
+        setattr(node.attributes, Constants.LibdepsCycleChecked, True)
 
     except DependencyCycleError as e:
         if len(e.cycle_nodes) == 1 or e.cycle_nodes[0] != e.cycle_nodes[-1]:
-            e.cycle_nodes.insert(0, n.target_node)
+            e.cycle_nodes.insert(0, node)
         raise
 
     finally:
-        walking.remove(n.target_node)
+        walking.remove(node)
+
+
+class _LibdepsClosureStats:
+    """Metrics about computing transitive libdeps, reported with the linting time."""
+
+    time = 0
+    nodes_computed = 0
+    queries = 0
+    cache_hits = 0
+
+    @classmethod
+    def start_timer(cls):
+        if LibdepLinter.print_linter_errors:
+            from timeit import default_timer as timer
+            return timer()
+
+    @classmethod
+    def stop_timer(cls, start):
+        if LibdepLinter.print_linter_errors:
+            from timeit import default_timer as timer
+            cls.time += timer() - start
 
 
 def _get_libdeps(node, debug=False):
@@ -747,28 +759,38 @@ def _get_libdeps(node, debug=False):
     Computes the dependencies if they're not already cached.
     """
 
+    _LibdepsClosureStats.queries += 1
+
     cache = getattr(node.attributes, Constants.LibdepsCached, None)
     if cache is not None:
+        _LibdepsClosureStats.cache_hits += 1
         if debug:
             print("  Cache:")
             for dep in cache:
                 print(f"    * {str(dep)}")
         return cache
 
+    start = _LibdepsClosureStats.start_timer()
+
     if debug:
         print(f"  Edges:")
 
     tsorted = []
-
-    marked = defaultdict(lambda: LibdepsVisitationMark.UNMARKED)
+    seen = set()
     walking = set()
 
     for child in _get_sorted_direct_libdeps(node):
         if child.dependency_type != deptype.Interface:
-            _libdeps_visit(child, tsorted, marked, walking, debug=debug)
+            if debug:
+                print(f"    * {child.dependency_type} => {child.listed_name}")
+            for dep in _get_public_libdeps_closure(child.target_node, walking):
+                if dep not in seen:
+                    seen.add(dep)
+                    tsorted.append(dep)
     tsorted.reverse()
 
     setattr(node.attributes, Constants.LibdepsCached, tsorted)
+    _LibdepsClosureStats.stop_timer(start)
     return tsorted
 
 
@@ -1234,7 +1256,7 @@ def generate_libdeps_graph(env):
                         env.File('$BUILD_DIR/mongo/util/version_constants.h')])
 
         graph_node = env.Command(
-            target=env.get('LIBDEPS_GRAPH_FILE', None),
+            target=[env.get('LIBDEPS_GRAPH_FILE', None), env.get('LIBDEPS_BINARY_GRAPH_FILE', None)],
             source=symbol_deps,
             action=SCons.Action.FunctionAction(
                 generate_graph,
@@ -1270,11 +1292,27 @@ def generate_graph(env, target, source):
                 node = env.File(str(symbol_deps_file)[:-len(env['SYMBOLDEPSSUFFIX'])])
                 add_node_from(env, node)
 
-    libdeps_graph_file = f"{env.Dir('$BUILD_DIR').path}/libdeps/libdeps.graphml"
-    networkx.write_graphml(libdeps_graph, libdeps_graph_file, named_key_ids=True)
-    with fileinput.FileInput(libdeps_graph_file, inplace=True) as file:
-        for line in file:
-            print(line.replace(str(env.Dir("$BUILD_DIR").abspath + os.sep), ''), end='')
+    # Make the node paths relative to the build dir while copying the graph, rather
+    # than rewriting the written file.
+    build_dir = str(env.Dir("$BUILD_DIR").abspath + os.sep)
+
+    def strip_build_dir(value):
+        return value.replace(build_dir, '') if isinstance(value, str) else value
+
+    def strip_build_dir_from_attrs(attrs):
+        return {key: strip_build_dir(value) for key, value in attrs.items()}
+
+    stripped_graph = LibdepsGraph()
+    stripped_graph.graph.update(strip_build_dir_from_attrs(libdeps_graph.graph))
+    stripped_graph.add_nodes_from(
+        (strip_build_dir(node), strip_build_dir_from_attrs(attrs))
+        for node, attrs in libdeps_graph.nodes(data=True))
+    stripped_graph.add_edges_from(
+        (strip_build_dir(from_node), strip_build_dir(to_node), strip_build_dir_from_attrs(attrs))
+        for from_node, to_node, attrs in libdeps_graph.edges(data=True))
+
+    networkx.write_graphml(stripped_graph, str(target[0]), named_key_ids=True)
+    save_libdeps_graph(stripped_graph, str(target[1]))
 
 
 def setup_environment(env, emitting_shared=False, debug='off', linting='on'):
@@ -1341,6 +1379,7 @@ def setup_environment(env, emitting_shared=False, debug='off', linting='on'):
 
         env['LIBDEPS_SYMBOL_DEP_FILES'] = symbol_deps
         env['LIBDEPS_GRAPH_FILE'] = env.File("${BUILD_DIR}/libdeps/libdeps.graphml")
+        env['LIBDEPS_BINARY_GRAPH_FILE'] = env.File("${BUILD_DIR}/libdeps/libdeps.graph")
         env['LIBDEPS_GRAPH_SCHEMA_VERSION'] = 3
         env["SYMBOLDEPSSUFFIX"] = '.symbol_deps'
 
@@ -22,7 +22,11 @@
 
 """IDL Compiler Scons Tool."""
 
+import atexit
+import json
 import os.path
+import queue
+import shlex
 import subprocess
 import sys
 
@@ -31,6 +35,9 @@ import SCons
 # We lazily import this at generate time.
 idlc = None
 
+# Shared by all invocations of the scanner so that common imports are only parsed once.
+idl_parse_cache = None
+
 IDL_GLOBAL_DEPS = []
 
 
@@ -55,6 +62,85 @@ def idlc_emitter(target, source, env):
 IDLCAction = SCons.Action.Action("$IDLCCOM", "$IDLCCOMSTR")
 
 
+class IdlcServerPool:
+    """A pool of long-running 'idlc.py --batch -' processes shared by concurrent build jobs.
+
+    Keeping the IDL compiler warm avoids paying for interpreter startup, module imports and the
+    parsing of common imports for every generated file.
+    """
+
+    def __init__(self):
+        self._idle = queue.SimpleQueue()
+        self._all = []
+        atexit.register(self.shutdown)
+
+    def _acquire(self, env):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        command = shlex.split(env.subst("$IDLC")) + ["--batch", "-"]
+        parse_cache_dir = env.get("IDLC_PARSE_CACHE_DIR")
+        if parse_cache_dir:
+            command += ["--parse-cache-dir", env.subst(parse_cache_dir)]
+
+        server = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+            cwd=env.Dir("#").get_abspath(),
+        )
+        self._all.append(server)
+        return server
+
+    def compile(self, env, argv):
+        """Compile one IDL file, returns a (success, output) tuple."""
+        server = self._acquire(env)
+        try:
+            server.stdin.write(json.dumps(argv) + "\n")
+            server.stdin.flush()
+            reply = server.stdout.readline()
+        except OSError as err:
+            return False, "idlc server failed: %s" % err
+
+        if not reply:
+            return False, "idlc server exited unexpectedly with code %s" % server.wait()
+
+        self._idle.put(server)
+        result = json.loads(reply)
+        return result["success"], result["output"]
+
+    def shutdown(self):
+        for server in self._all:
+            if server.poll() is None:
+                server.stdin.close()
+                server.wait()
+        self._all = []
+
+
+idlc_server_pool = None
+
+
+def idlc_server_action(target, source, env):
+    argv = [
+        str(arg)
+        for arg in env.subst_list(
+            "$IDLCFLAGS --header ${TARGETS[1]} --output ${TARGETS[0]} $SOURCES",
+            target=target,
+            source=source,
+        )[0]
+    ]
+    success, output = idlc_server_pool.compile(env, argv)
+    if output:
+        sys.stdout.write(output)
+    return 0 if success else 1
+
+
+IDLCServerAction = SCons.Action.Action(idlc_server_action, "$IDLCCOMSTR")
+
+
 def idl_scanner(node, env, path):
 
     # When generating ninja we only need to add the IDL_GLOBAL_DEPS
@@ -80,7 +166,7 @@ def idl_scanner(node, env, path):
     try:
         with open(str(node), encoding="utf-8") as file_stream:
             parsed_doc = idlc.parser.parse(
-                file_stream, str(node), resolver
+                file_stream, str(node), resolver, idl_parse_cache
             )
     except OSError:
         return nodes_deps_list
@@ -109,6 +195,19 @@ IDLCBuilder = SCons.Builder.Builder(
 def generate(env):
     bld = IDLCBuilder
 
+    # The server pool is opt-in, and ninja needs a plain command line to generate its rules.
+    use_server = str(env.get("IDLC_SERVER", "")).lower() in ["true", "1", "on"]
+    if use_server and not env.get("GENERATING_NINJA", False):
+        global idlc_server_pool
+        idlc_server_pool = IdlcServerPool()
+        bld = SCons.Builder.Builder(
+            action=IDLCServerAction,
+            emitter=idlc_emitter,
+            src_suffix=".idl",
+            suffix=".cpp",
+            source_scanner=idl_scanner,
+        )
+
     env.Append(SCANNERS=idl_scanner)
 
     env["BUILDERS"]["Idlc"] = bld
@@ -121,11 +220,17 @@ def generate(env):
 
     env["IDLC"] = "$PYTHON buildscripts/idl/idlc.py"
     base_dir = env.Dir("$BUILD_DIR").path
+    parse_cache_dir = os.path.join(base_dir, "idl_parse_cache")
+    env["IDLC_PARSE_CACHE_DIR"] = parse_cache_dir
     env["IDLCFLAGS"] = [
         "--include", "src",
         "--base_dir", base_dir,
+        "--parse-cache-dir", parse_cache_dir,
         "--target_arch", "$TARGET_ARCH",
     ]
+
+    global idl_parse_cache
+    idl_parse_cache = idlc.parser_cache.ParsedSpecCache()
     env["IDLCCOM"] = "$IDLC $IDLCFLAGS --header ${TARGETS[1]} --output ${TARGETS[0]} $SOURCES"
     env["IDLCCOMSTR"] = ("Generating ${TARGETS[0]}"
         if not env.get("VERBOSE", "").lower() in ['true', '1']
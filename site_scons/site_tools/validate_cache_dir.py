@@ -20,12 +20,16 @@
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 #
 
+import atexit
 import datetime
 import json
 import logging
 import os
 import pathlib
 import shutil
+import socket
+import threading
+import time
 import traceback
 
 
@@ -55,6 +59,86 @@ class UnsupportedError(SCons.Errors.BuildError):
     def __str__(self):
         return self.message
 
+class CacheIndexJournal:
+    """
+    Records the size and access time of the cachefiles pushed to and retrieved from the cache,
+    so the cache prune script can keep an index of the cache contents up to date without
+    walking the whole cache.
+
+    Each SCons invocation appends to its own journal file, which is renamed to mark it complete
+    when SCons exits. The layout must match the one read by buildscripts/scons_cache_prune.py,
+    if this is changed, cache prune script should also be updated.
+    """
+
+    index_dir_name = '.prune_index'
+    open_ext = '.open'
+    complete_ext = '.log'
+
+    _journals = {}
+    _lock = threading.Lock()
+
+    def __init__(self, cache_root):
+        journal_dir = pathlib.Path(cache_root) / self.index_dir_name / 'journal'
+        name = f"{socket.gethostname()}-{os.getpid()}-{SCons.CacheDir.cache_tmp_uuid}"
+        self.path = journal_dir / (name + self.open_ext)
+        self.file = None
+        try:
+            os.makedirs(journal_dir, exist_ok=True)
+            self.file = open(self.path, 'a')
+        except OSError as ex:
+            logging.warning(f"Unable to open cache index journal {self.path}, the cache "
+                            f"will be fully scanned when pruned: {ex}")
+        else:
+            atexit.register(self.close)
+
+    @classmethod
+    def record(cls, cksum_cachefile_dir):
+        """Record an access to the given cachefile directory."""
+        try:
+            size = sum(entry.stat().st_size for entry in os.scandir(cksum_cachefile_dir))
+        except OSError:
+            return
+
+        # Files are pushed to a temporary directory which is renamed into place
+        # once complete, record the final name.
+        cksum_cachefile_dir = pathlib.Path(cksum_cachefile_dir)
+        tmp_suffix = f".tmp{SCons.CacheDir.cache_tmp_uuid}"
+        if cksum_cachefile_dir.name.endswith(tmp_suffix):
+            cksum_cachefile_dir = cksum_cachefile_dir.with_name(
+                cksum_cachefile_dir.name[:-len(tmp_suffix)])
+        cache_root = cksum_cachefile_dir.parent.parent
+
+        with cls._lock:
+            journal = cls._journals.get(cache_root)
+            if journal is None:
+                journal = cls._journals[cache_root] = cls(cache_root)
+            journal.write({
+                'path': str(cksum_cachefile_dir.relative_to(cache_root)),
+                'size': size,
+                'time': time.time(),
+            })
+
+    def write(self, entry):
+        if self.file is None:
+            return
+        try:
+            self.file.write(json.dumps(entry) + '\n')
+            self.file.flush()
+        except OSError as ex:
+            logging.warning(f"Failed writing to cache index journal {self.path}: {ex}")
+            self.close()
+
+    def close(self):
+        if self.file is None:
+            return
+        try:
+            self.file.close()
+            self.path.replace(self.path.with_suffix(self.complete_ext))
+        except OSError:
+            pass
+        self.file = None
+
+
 class CacheDirValidate(SCons.CacheDir.CacheDir):
 
     def __init__(self, path):
@@ -119,6 +203,8 @@ class CacheDirValidate(SCons.CacheDir.CacheDir):
             raise InvalidChecksum(
                 cls.get_hash_path(src_file), dst, f"checksums don't match {csig} != {new_csig}", cache_csig=csig, computed_csig=new_csig)
 
+        CacheIndexJournal.record(src)
+
     @classmethod
     def copy_to_cache(cls, env, src, dst):
 
@@ -139,6 +225,8 @@ class CacheDirValidate(SCons.CacheDir.CacheDir):
         except OSError as ex:
             raise CacheTransferFailed(src, dst_file, f"failed to create hash file: {ex}") from ex
 
+        CacheIndexJournal.record(dst)
+
     def log_json_cachedebug(self, node, pushing=False):
         if (pushing
             and (node.nocache or SCons.CacheDir.cache_readonly or 'conftest' in str(node))):
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+#
+# Public Domain 2014-present MongoDB, Inc.
+# Public Domain 2008-2014 WiredTiger, Inc.
+#
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# cursor_batch.py
+#   Micro-benchmark of the batched Python cursor methods, Cursor.insert_many
+# and Cursor.scan, against loading and reading rows one at a time.
+#
+# Run it with the WiredTiger Python module in PYTHONPATH, or from a tree built
+# in build_posix.
+from __future__ import print_function
+
+import argparse, os, shutil, sys, tempfile, time
+
+try:
+    import wiredtiger
+except ImportError:
+    wt_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+        os.pardir, os.pardir)
+    sys.path.insert(0, os.path.join(wt_dir, 'lang', 'python'))
+    sys.path.insert(0, os.path.join(wt_dir, 'build_posix', 'lang', 'python'))
+    import wiredtiger
+
+FORMATS = {
+    'int': ('q', 'Q'),
+    'string': ('S', 'S'),
+    'composite': ('iS', 'SiS'),
+}
+
+def make_rows(name, count):
+    if name == 'int':
+        return [(i, i * 7) for i in range(count)]
+    if name == 'string':
+        return [('key%012d' % i, 'value%d' % i * 4) for i in range(count)]
+    return [((i // 100, 'k%010d' % i), ('a' * (i % 31), i, 'b' * (i % 17)))
+        for i in range(count)]
+
+def timed(fn):
+    start = time.time()
+    result = fn()
+    return time.time() - start, result
+
+def load_rows(cursor, rows):
+    for key, value in rows:
+        cursor[key] = value
+    return len(rows)
+
+def read_rows(cursor):
+    return sum(1 for row in cursor)
+
+def read_scan(cursor, batch_size):
+    return sum(1 for row in cursor.scan(batch_size))
+
+def run(session, name, rows, batch_size, bulk):
+    key_format, value_format = FORMATS[name]
+    config = 'bulk' if bulk else None
+    results = []
+    for method in ('per-row', 'batched'):
+        uri = 'table:%s_%s' % (name, method.replace('-', '_'))
+        session.create(uri,
+            'key_format=%s,value_format=%s' % (key_format, value_format))
+        cursor = session.open_cursor(uri, None, config)
+        if method == 'per-row':
+            elapsed, count = timed(lambda: load_rows(cursor, rows))
+        else:
+            elapsed, count = timed(
+                lambda: cursor.insert_many(rows, batch_size))
+        cursor.close()
+        assert count == len(rows)
+        results.append(('insert', method, elapsed))
+
+        cursor = session.open_cursor(uri)
+        if method == 'per-row':
+            elapsed, count = timed(lambda: read_rows(cursor))
+        else:
+            elapsed, count = timed(lambda: read_scan(cursor, batch_size))
+        cursor.close()
+        assert count == len(rows)
+        results.append(('scan', method, elapsed))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=
+        'Compare the batched Python cursor methods to the per-row path.')
+    parser.add_argument('--rows', type=int, default=200000,
+        help='number of rows to load and read (default: %(default)s)')
+    parser.add_argument('--batch-size', type=int, default=1000,
+        help='rows per batch (default: %(default)s)')
+    parser.add_argument('--bulk', action='store_true',
+        help='load the tables with bulk cursors')
+    parser.add_argument('--format', choices=sorted(FORMATS),
+        action='append', help='formats to test (default: all)')
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp(prefix='cursor_batch.')
+    try:
+        conn = wiredtiger.wiredtiger_open(home, 'create,cache_size=1GB')
+        session = conn.open_session()
+        print('%-10s %-7s %-8s %10s %12s' %
+            ('format', 'op', 'method', 'seconds', 'rows/sec'))
+        for name in args.format or sorted(FORMATS):
+            rows = make_rows(name, args.rows)
+            for op, method, elapsed in run(
+                session, name, rows, args.batch_size, args.bulk):
+                print('%-10s %-7s %-8s %10.3f %12.0f' % (name, op, method,
+                    elapsed, args.rows / elapsed if elapsed else 0))
+        conn.close()
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
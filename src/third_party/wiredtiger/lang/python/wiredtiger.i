@@ -51,7 +51,7 @@ This provides an API similar to the C API, with the following modifications:
 %feature("autodoc", "0");
 
 %pythoncode %{
-from packing import pack, unpack
+from packing import field_types, pack, unpack, unpack_from
 ## @endcond
 %}
 
@@ -436,7 +436,7 @@ static int unpackBytesOrString(PyObject *obj, void **data, size_t *size);
 WiredTigerError = _wiredtiger.WiredTigerError
 
 # Python3 has no explicit long type, recnos work as ints
-import sys
+import array, struct, sys
 if sys.version_info >= (3, 0, 0):
 	def _wt_recno(i):
 		return i
@@ -460,6 +460,19 @@ class IterableCursor:
 
 	def next(self):
 		return self.__next__()
+
+# Array type codes used for the columns returned by Cursor.next_batch with
+# columnar=True, for the conversions that always unpack to bounded integers.
+try:
+	_wt_array_typecodes = array.typecodes
+except AttributeError:
+	_wt_array_typecodes = 'cbBuhHiIlLfd'
+_wt_column_typecodes = {}
+for _f, _t in (('b', 'b'), ('B', 'B'), ('h', 'h'), ('H', 'H'), ('i', 'i'),
+    ('I', 'I'), ('l', 'i'), ('L', 'I'), ('q', 'q'), ('Q', 'Q'), ('r', 'Q'),
+    ('t', 'B')):
+	if _t in _wt_array_typecodes:
+		_wt_column_typecodes[_f] = _t
 ## @endcond
 
 def wiredtiger_calc_modify(session, oldv, newv, maxdiff, nmod):
@@ -582,6 +595,18 @@ NOTFOUND_OK(__wt_cursor::remove)
 NOTFOUND_OK(__wt_cursor::search)
 NOTFOUND_OK(__wt_cursor::update)
 NOTFOUND_OK(__wt_cursor::_modify)
+
+/* Batched cursor methods set their own exception and return NULL on error. */
+%exception __wt_cursor::_next_batch {
+	$action
+	if (result == NULL)
+		SWIG_fail;
+}
+%exception __wt_cursor::_apply_batch {
+	$action
+	if (result < 0)
+		SWIG_fail;
+}
 ANY_OK(__wt_modify::__wt_modify)
 ANY_OK(__wt_modify::~__wt_modify)
 
@@ -624,6 +649,7 @@ OVERRIDE_METHOD(__wt_cursor, WT_CURSOR, search_near, (self))
 
 /* SWIG magic to turn Python byte strings into data / size. */
 %apply (char *STRING, int LENGTH) { (char *data, int size) };
+%apply (char *STRING, size_t LENGTH) { (char *batch, size_t batch_size) };
 
 /* Handle binary data returns from get_key/value -- avoid cstring.i: it creates a list of returns. */
 %typemap(in,numinputs=0) (char **datap, int *sizep) (char *data, int size) { $1 = &data; $2 = &size; }
@@ -768,6 +794,153 @@ typedef int int_void;
 		return (ret);
 	}
 
+	/*
+	 * next_batch: step the cursor forward up to n times, copying the raw
+	 * keys and values into a single buffer so Python can decode the whole
+	 * batch from one call.  Returns a tuple of the buffer and the offsets
+	 * where each key and value end in it, as native 64-bit integers.
+	 *
+	 * The bindings are built with -threads, so this runs without the
+	 * Python Global Interpreter Lock: the cursor is stepped without it,
+	 * and it is only acquired to build the result or raise an error.
+	 */
+	PyObject *_next_batch(int n) {
+		WT_ITEM k, v;
+		PyObject *data, *ends, *result;
+		uint64_t *endbuf;
+		size_t bufsize, len, need;
+		char *buf, *newbuf;
+		int count, ret;
+
+		buf = NULL;
+		bufsize = len = 0;
+		endbuf = NULL;
+		result = NULL;
+		count = ret = 0;
+		if (n < 0)
+			n = 0;
+		if ((size_t)n >= SIZE_MAX / (2 * sizeof(uint64_t)) ||
+		    (endbuf = malloc(
+		    2 * sizeof(uint64_t) * ((size_t)n + 1))) == NULL)
+			ret = ENOMEM;
+
+		for (; ret == 0 && count < n; count++) {
+			if ((ret = $self->next($self)) != 0 ||
+			    (ret = $self->get_key($self, &k)) != 0 ||
+			    (ret = $self->get_value($self, &v)) != 0)
+				break;
+			if ((need = len + k.size + v.size) > bufsize) {
+				if (bufsize == 0)
+					bufsize = 4096;
+				while (bufsize < need)
+					bufsize *= 2;
+				if ((newbuf = realloc(buf, bufsize)) == NULL) {
+					ret = ENOMEM;
+					break;
+				}
+				buf = newbuf;
+			}
+			if (k.size != 0)
+				memcpy(buf + len, k.data, k.size);
+			len += k.size;
+			endbuf[2 * count] = len;
+			if (v.size != 0)
+				memcpy(buf + len, v.data, v.size);
+			len += v.size;
+			endbuf[2 * count + 1] = len;
+		}
+
+		{
+		/* Acquire python Global Interpreter Lock. */
+		SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+
+		if (ret == ENOMEM)
+			PyErr_NoMemory();
+		else if (ret != 0 && ret != WT_NOTFOUND)
+			SWIG_SetErrorMsg(wtError, wiredtiger_strerror(ret));
+		else {
+			data = PyBytes_FromStringAndSize(buf, (Py_ssize_t)len);
+			ends = PyBytes_FromStringAndSize((char *)endbuf,
+			    (Py_ssize_t)(2 * sizeof(uint64_t) * (size_t)count));
+			if (data != NULL && ends != NULL)
+				result = PyTuple_Pack(2, data, ends);
+			Py_XDECREF(data);
+			Py_XDECREF(ends);
+		}
+
+		/* Release python Global Interpreter Lock */
+		SWIG_PYTHON_THREAD_END_BLOCK;
+		}
+		free(buf);
+		free(endbuf);
+		return (result);
+	}
+
+	/*
+	 * apply_batch: insert or update count rows.  The data starts with the
+	 * offsets where each key and value end as native 64-bit integers, in
+	 * the layout returned by next_batch, followed by the packed keys and
+	 * values.  Returns the number of rows applied, which is less than
+	 * count if an operation returned WT_NOTFOUND, or -1 on error.
+	 *
+	 * Like _next_batch, this runs without the Python Global Interpreter
+	 * Lock, which is only acquired to raise an error.
+	 */
+	int _apply_batch(char *batch, size_t batch_size, int count, int update) {
+		WT_ITEM k, v;
+		uint64_t ends[2], prev;
+		size_t header;
+		char *base;
+		int i, invalid, ret;
+
+		invalid = ret = 0;
+		header = 2 * sizeof(uint64_t) * (size_t)(count < 0 ? 0 : count);
+		if (count < 0 || batch_size < header) {
+			invalid = 1;
+			goto err;
+		}
+		base = batch + header;
+		prev = 0;
+		for (i = 0; i < count; i++) {
+			memcpy(ends, batch + 2 * sizeof(uint64_t) * (size_t)i,
+			    sizeof(ends));
+			if (ends[0] < prev || ends[1] < ends[0] ||
+			    ends[1] > batch_size - header) {
+				invalid = 1;
+				goto err;
+			}
+			k.data = base + prev;
+			k.size = (size_t)(ends[0] - prev);
+			v.data = base + ends[0];
+			v.size = (size_t)(ends[1] - ends[0]);
+			prev = ends[1];
+
+			$self->set_key($self, &k);
+			$self->set_value($self, &v);
+			ret = update ? $self->update($self) : $self->insert($self);
+			if (ret == WT_NOTFOUND)
+				break;
+			if (ret != 0)
+				goto err;
+		}
+		return (i);
+
+err:		{
+		/* Acquire python Global Interpreter Lock. */
+		SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+
+		if (invalid)
+			SWIG_Error(SWIG_ValueError,
+			    "in method 'Cursor_apply_batch', invalid batch");
+		else
+			SWIG_SetErrorMsg(wtError, wiredtiger_strerror(ret));
+
+		/* Release python Global Interpreter Lock */
+		SWIG_PYTHON_THREAD_END_BLOCK;
+		}
+		return (-1);
+	}
+
 	/* compare: special handling. */
 	int _compare(WT_CURSOR *other) {
 		int cmp = 0;
@@ -904,6 +1077,153 @@ typedef int int_void;
 			self._value = pack(self.value_format, *args)
 			self._set_value(self._value)
 
+	def next_batch(self, n, columnar=False):
+		'''next_batch(self, n, columnar=False) -> [[object, ...], ...]
+		
+		Move the cursor forward up to \c n times, returning the rows it
+		passes as lists of key columns followed by value columns, as
+		returned by iterating the cursor.  Returns fewer than \c n rows
+		when WT_CURSOR::next returns ::WT_NOTFOUND, leaving the cursor
+		reset, and an empty list if it is returned immediately.
+		
+		The rows are copied and decoded in bulk, which is much faster
+		than calling WT_CURSOR::next for each of them.  With \c columnar
+		set, one sequence is returned per column instead; columns of
+		integral types are returned as array.array objects.'''
+		if self.is_json:
+			rows = []
+			while len(rows) < n and self.next() == 0:
+				rows.append(self.get_keys() + self.get_values())
+		else:
+			data, ends = self._next_batch(n)
+			ends = struct.unpack('=%dQ' % (len(ends) // 8), ends)
+			key_format = self.key_format
+			value_format = self.value_format
+			rows = []
+			start = 0
+			for i in range(0, len(ends), 2):
+				key_end = ends[i]
+				end = ends[i + 1]
+				rows.append(
+				    unpack_from(key_format, data, start, key_end) +
+				    unpack_from(value_format, data, key_end, end))
+				start = end
+		if not columnar:
+			return rows
+		if self.is_json:
+			types = ['S', 'S']
+		else:
+			types = field_types(self.key_format) + \
+			    field_types(self.value_format)
+		columns = []
+		for i, f in enumerate(types):
+			column = [row[i] for row in rows]
+			if f in _wt_column_typecodes:
+				column = array.array(_wt_column_typecodes[f], column)
+			columns.append(column)
+		return columns
+
+	def scan(self, batch_size=1000, columnar=False):
+		'''scan(self, batch_size=1000, columnar=False) -> iterator
+		
+		Iterate over the rows from the cursor position to the end of the
+		cursor, in the same way as iterating the cursor, but fetching and
+		decoding \c batch_size rows at a time with next_batch.  The cursor
+		is positioned up to \c batch_size rows ahead of the rows returned,
+		so it should not be used for anything else while scanning.  With
+		\c columnar set, yields the columns of each batch instead.'''
+		if batch_size < 1:
+			raise ValueError('batch_size must be positive')
+		while True:
+			batch = self.next_batch(batch_size, columnar)
+			count = len(batch[0]) if columnar and batch else len(batch)
+			if columnar:
+				if count != 0:
+					yield batch
+			else:
+				for row in batch:
+					yield row
+			# A short batch means the cursor has already reached the end
+			# and been reset: calling next again would start over.
+			if count < batch_size:
+				return
+
+	def _pack_item(self, fmt, item):
+		if type(item) is tuple:
+			return pack(fmt, *item)
+		return pack(fmt, item)
+
+	def _apply_many(self, items, batch_size, update):
+		if batch_size < 1:
+			raise ValueError('batch_size must be positive')
+		count = 0
+		if self.is_json:
+			for key, value in items:
+				self.set_key(key)
+				self.set_value(value)
+				if (self.update() if update else self.insert()) != 0:
+					raise KeyError(key)
+				count += 1
+			return count
+
+		key_format = 'r' if self.is_column else self.key_format
+		value_format = self.value_format
+		keys = []
+		ends = []
+		parts = []
+		end = 0
+		items = iter(items)
+		while True:
+			for key, value in items:
+				if self.is_column:
+					key = _wt_recno(key[0] if type(key) is tuple else key)
+				k = self._pack_item(key_format, key)
+				v = self._pack_item(value_format, value)
+				parts.append(k)
+				parts.append(v)
+				end += len(k)
+				ends.append(end)
+				end += len(v)
+				ends.append(end)
+				keys.append(key)
+				if len(keys) == batch_size:
+					break
+			if not keys:
+				return count
+			# Keep the batch pinned, the cursor may still refer to the
+			# last key and value in it.
+			self._key = self._value = \
+			    struct.pack('=%dQ' % len(ends), *ends) + b''.join(parts)
+			applied = self._apply_batch(self._key, len(keys), update)
+			count += applied
+			if applied < len(keys):
+				raise KeyError(keys[applied])
+			del keys[:], ends[:], parts[:]
+			end = 0
+
+	def insert_many(self, items, batch_size=1000):
+		'''insert_many(self, items, batch_size=1000) -> int
+		
+		Insert each (key, value) pair from \c items, as with
+		<code>cursor[key] = value</code>, returning the number of rows
+		inserted.  Rows are packed and inserted \c batch_size at a time,
+		with a single call into WiredTiger per batch.  This works with
+		cursors opened with the \c bulk configuration, in which case the
+		keys must be in order.  If an insert fails, the rows before it
+		stay inserted.'''
+		return self._apply_many(items, batch_size, 0)
+
+	def update_many(self, items, batch_size=1000):
+		'''update_many(self, items, batch_size=1000) -> int
+		
+		Update each (key, value) pair from \c items, as with calling
+		WT_CURSOR::update for each of them, returning the number of rows
+		updated.  Rows are packed and updated \c batch_size at a time,
+		with a single call into WiredTiger per batch.  Raises KeyError if
+		the cursor is not configured to overwrite and a key does not
+		exist, in which case the rows before it stay updated.'''
+		return self._apply_many(items, batch_size, 1)
+
 	def __iter__(self):
 		'''Cursor objects support iteration, equivalent to calling
 		WT_CURSOR::next until it returns ::WT_NOTFOUND.'''
@@ -102,23 +102,36 @@ def pack_int(x):
             packed = packed[1:]
         return _chr(POS_MULTI_MARKER | getbits(len(packed), 4)) + packed
 
-def unpack_int(b):
-    marker = _ord(b[0])
+def get_int_at(b, pos, size):
+    r = 0
+    for i in range(pos, pos + size):
+        r = (r << 8) | _ord(b[i])
+    return r
+
+def unpack_int_at(b, pos):
+    '''unpack the integer starting at offset pos of b, return it and the
+       offset of the following byte, without copying the buffer'''
+    marker = _ord(b[pos])
     if marker < NEG_2BYTE_MARKER:
         sz = 8 - getbits(marker, 4)
-        return ((-1 << (sz << 3)) | get_int(b[1:], sz), b[sz+1:])
+        return ((-1 << (sz << 3)) | get_int_at(b, pos + 1, sz), pos + sz + 1)
     elif marker < NEG_1BYTE_MARKER:
-        return (NEG_2BYTE_MIN + ((getbits(marker, 5) << 8) | _ord(b[1])), b[2:])
+        return (NEG_2BYTE_MIN + ((getbits(marker, 5) << 8) | _ord(b[pos + 1])),
+                pos + 2)
     elif marker < POS_1BYTE_MARKER:
-        return (NEG_1BYTE_MIN + getbits(marker, 6), b[1:])
+        return (NEG_1BYTE_MIN + getbits(marker, 6), pos + 1)
     elif marker < POS_2BYTE_MARKER:
-        return (getbits(marker, 6), b[1:])
+        return (getbits(marker, 6), pos + 1)
     elif marker < POS_MULTI_MARKER:
         return (POS_1BYTE_MAX + 1 +
-               ((getbits(marker, 5) << 8) | _ord(b[1])), b[2:])
+               ((getbits(marker, 5) << 8) | _ord(b[pos + 1])), pos + 2)
     else:
         sz = getbits(marker, 4)
-        return (POS_2BYTE_MAX + 1 + get_int(b[1:], sz), b[sz+1:])
+        return (POS_2BYTE_MAX + 1 + get_int_at(b, pos + 1, sz), pos + sz + 1)
+
+def unpack_int(b):
+    v, pos = unpack_int_at(b, 0)
+    return (v, b[pos:])
 
 # Sanity testing
 if __name__ == '__main__':
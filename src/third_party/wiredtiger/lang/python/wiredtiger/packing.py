@@ -51,7 +51,8 @@ Format  Python  Notes
 
 from wiredtiger.packutil import _chr, _is_string, _ord, _string_result, \
     empty_pack, x00
-from wiredtiger.intpacking import pack_int, unpack_int
+from wiredtiger.intpacking import pack_int, unpack_int_at, POS_1BYTE_MARKER, \
+    POS_1BYTE_MAX
 
 def __get_type(fmt):
     if not fmt:
@@ -78,90 +79,146 @@ def __unpack_iter_fmt(fmt):
             size = 0
             havesize = 0
 
+# Format strings are parsed once into a list of (conversion, havesize, size,
+# is_last) tuples, cached by format string.  Tables and cursors only use a
+# handful of formats, so the cache does not need to be bounded.
+__plans = {}
+
+# Encodings of the integers that fit in a single byte.
+_small_ints = [_chr(POS_1BYTE_MARKER | i) for i in range(POS_1BYTE_MAX + 1)]
+
+def __get_plan(fmt):
+    try:
+        return __plans[fmt]
+    except KeyError:
+        pass
+    tfmt, body = __get_type(fmt)
+    if not body:
+        plan = None
+    elif tfmt != '.':
+        raise ValueError('Only variable-length encoding is currently supported')
+    else:
+        last = len(body) - 1
+        plan = tuple((char, havesize, size, offset == last)
+            for offset, havesize, size, char in __unpack_iter_fmt(body))
+    __plans[fmt] = plan
+    return plan
+
+def field_types(fmt):
+    """Return the conversion of each of the values unpack returns for fmt"""
+    plan = __get_plan(fmt)
+    if plan is None:
+        return []
+    result = []
+    for f, havesize, size, is_last in plan:
+        if f == 'x':
+            continue
+        elif f in 'SsUut':
+            result.append(f)
+        else:
+            result.extend(f * size)
+    return result
+
 def unpack(fmt, s):
-    tfmt, fmt = __get_type(fmt)
-    if not fmt:
+    return unpack_from(fmt, s)
+
+def unpack_from(fmt, s, offset=0, end=None):
+    """Unpack the bytes of s from offset up to end (by default, the end of s)
+
+    This lets many packed items stored back to back in a single buffer be
+    unpacked without first slicing each of them out of the buffer."""
+    plan = __get_plan(fmt)
+    if plan is None:
         return ()
-    if tfmt != '.':
-        raise ValueError('Only variable-length encoding is currently supported')
+    # A WT_ITEM with a NULL data field will be appear as None.
+    if s is None:
+        s = empty_pack
+    # Walk the buffer with an offset rather than slicing off each field, so
+    # only the bytes of the fields returned are copied.  Other buffer types
+    # (bytearray, memoryview...) are accessed through a memoryview.
+    isbytes = type(s) is bytes
+    buf = s if isbytes else memoryview(s)
+    if end is None:
+        end = len(buf)
+    searchable = None
+    pos = offset
     result = []
-    for offset, havesize, size, f in __unpack_iter_fmt(fmt):
+    for f, havesize, size, is_last in plan:
         if f == 'x':
-            s = s[size:]
+            pos += size
             # Note: no value, don't increment i
         elif f in 'SsUu':
             if not havesize:
                 if f == 's':
                     pass
                 elif f == 'S':
-                    size = s.find(x00)
-                elif f == 'u' and offset == len(fmt) - 1:
-                    # A WT_ITEM with a NULL data field will be appear as None.
-                    if s == None:
-                        s = empty_pack
-                    size = len(s)
+                    if searchable is None:
+                        searchable = s if isbytes or type(s) is bytearray \
+                            else buf.tobytes()
+                    nul = searchable.find(x00, pos, end)
+                    # Without a terminating nul, the field stops one byte
+                    # short of the end of the buffer and nothing is consumed.
+                    size = nul - pos if nul >= 0 else end - pos - 1
+                    if nul < 0:
+                        field = buf[pos:pos + size]
+                        result.append(_string_result(
+                            field if isbytes else field.tobytes()))
+                        continue
+                elif f == 'u' and is_last:
+                    size = end - pos
                 else:
                     # Note: 'U' is used internally, and may be exposed to us.
                     # It indicates that the size is always stored unless there
                     # is a size in the format.
-                    size, s = unpack_int(s)
+                    size, pos = unpack_int_at(buf, pos)
+                    if size < 0:
+                        # A corrupt size, consume the buffer the same way as
+                        # slicing it with a negative index would.
+                        size = max(0, end - pos + size)
+            field = buf[pos:min(pos + size, end)]
+            if not isbytes:
+                field = field.tobytes()
             if f in 'Ss':
-                result.append(_string_result(s[:size]))
+                result.append(_string_result(field))
                 if f == 'S' and not havesize:
                     size += 1
             else:
-                result.append(s[:size])
-            s = s[size:]
-        elif f in 't':
+                result.append(field)
+            pos += size
+        elif f == 't':
             # bit type, size is number of bits
-            result.append(_ord(s[0]))
-            s = s[1:]
+            result.append(_ord(buf[pos]))
+            pos += 1
         elif f in 'Bb':
             # byte type
             for i in range(size):
-                v = _ord(s[0])
+                v = _ord(buf[pos])
                 if f != 'B':
                     v -= 0x80
                 result.append(v)
-                s = s[1:]
+                pos += 1
         else:
             # integral type
             for j in range(size):
-                v, s = unpack_int(s)
+                v, pos = unpack_int_at(buf, pos)
                 result.append(v)
     return result
 
-def __pack_iter_fmt(fmt, values):
-    index = 0
-    for offset, havesize, size, char in __unpack_iter_fmt(fmt):
-        if char == 'x':  # padding no value
-            yield offset, havesize, size, char, None
-        elif char in 'SsUut':
-            yield offset, havesize, size, char, values[index]
-            index += 1
-        else:            # integral type
-            size = size if havesize else 1
-            for i in range(size):
-                value = values[index]
-                yield offset, havesize, 1, char, value
-                index = index + 1
-
 def pack(fmt, *values):
-    tfmt, fmt = __get_type(fmt)
-    if not fmt:
+    plan = __get_plan(fmt)
+    if plan is None:
         return ()
-    if tfmt != '.':
-        raise ValueError('Only variable-length encoding is currently supported')
-    result = empty_pack
-    i = 0
-    for offset, havesize, size, f, val in __pack_iter_fmt(fmt, values):
+    # Collect the encoded fields and join them once at the end rather than
+    # concatenating immutable bytes for each field.
+    result = []
+    index = 0
+    for f, havesize, size, is_last in plan:
         if f == 'x':
-            if not havesize:
-                result += x00
-            else:
-                result += x00 * size
-            # Note: no value, don't increment i
+            result.append(x00 * size)
+            # Note: no value, don't increment index
         elif f in 'SsUu':
+            val = values[index]
+            index += 1
             if f == 'S' and '\0' in val:
                 l = val.find('\0')
             else:
@@ -169,34 +226,34 @@ def pack(fmt, *values):
             if havesize or f == 's':
                 if l > size:
                     l = size
-            elif (f == 'u' and offset != len(fmt) - 1) or f == 'U':
-                result += pack_int(l)
+            elif (f == 'u' and not is_last) or f == 'U':
+                result.append(pack_int(l))
             if _is_string(val) and f in 'Ss':
-                result += str(val[:l]).encode()
+                result.append(str(val[:l]).encode())
             else:
                 if type(val) is bytes:
-                    result += val[:l]
+                    result.append(val[:l])
                 else:
-                    result += val[:l].encode()
+                    result.append(val[:l].encode())
             if f == 'S' and not havesize:
-                result += x00
+                result.append(x00)
             elif size > l and havesize:
-                result += x00 * (size - l)
-        elif f in 't':
+                result.append(x00 * (size - l))
+        elif f == 't':
             # bit type, size is number of bits
-            if not havesize:
-                size = 1
+            val = values[index]
+            index += 1
             if size > 8:
                 raise ValueError("bit count cannot be greater than 8 for 't' encoding")
             mask = (1 << size) - 1
             if (mask & val) != val:
                 raise ValueError("value out of range for 't' encoding")
-            result += _chr(val)
+            result.append(_chr(val))
         elif f in 'Bb':
             # byte type
-            if not havesize:
-                size = 1
             for i in range(size):
+                val = values[index]
+                index += 1
                 if f == 'B':
                     v = val
                 else:
@@ -204,8 +261,14 @@ def pack(fmt, *values):
                     v = val + 0x80
                 if v > 255 or v < 0:
                     raise ValueError("value out of range for 'B' encoding")
-                result += _chr(v)
+                result.append(_chr(v))
         else:
             # integral type
-            result += pack_int(val)
-    return result
+            for i in range(size):
+                val = values[index]
+                index += 1
+                if 0 <= val <= POS_1BYTE_MAX:
+                    result.append(_small_ints[val])
+                else:
+                    result.append(pack_int(val))
+    return empty_pack.join(result)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+#
+# Public Domain 2014-present MongoDB, Inc.
+# Public Domain 2008-2014 WiredTiger, Inc.
+#
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+import wiredtiger, wttest
+from wtdataset import SimpleDataSet, ComplexDataSet
+from wtscenario import make_scenarios
+
+# test_cursor18.py
+#    Test that Cursor.next_batch and Cursor.scan return the same rows as
+# iterating the cursor.
+class test_cursor18(wttest.WiredTigerTestCase):
+    nentries = 2503
+
+    types = [
+        ('row', dict(dataset=SimpleDataSet, key_format='S', value_format='S')),
+        ('row-int', dict(dataset=SimpleDataSet, key_format='i', value_format='u')),
+        ('var', dict(dataset=SimpleDataSet, key_format='r', value_format='S')),
+        ('fix', dict(dataset=SimpleDataSet, key_format='r', value_format='8t')),
+        ('complex', dict(dataset=ComplexDataSet, key_format='S', value_format='S')),
+    ]
+    batches = [
+        ('batch1', dict(batch_size=1)),
+        ('batch100', dict(batch_size=100)),
+        ('batch-all', dict(batch_size=nentries)),
+    ]
+    scenarios = make_scenarios(types, batches)
+
+    def populate(self):
+        uri = 'table:test_cursor18'
+        ds = self.dataset(self, uri, self.nentries,
+            key_format=self.key_format, value_format=self.value_format)
+        ds.populate()
+        return uri
+
+    def test_scan(self):
+        uri = self.populate()
+        cursor = self.session.open_cursor(uri)
+        expected = [row for row in cursor]
+        self.assertEqual(len(expected), self.nentries)
+
+        self.assertEqual(list(cursor.scan(self.batch_size)), expected)
+
+        # Scanning starts from the cursor position, like iteration.
+        cursor.reset()
+        self.assertEqual(cursor.next(), 0)
+        self.assertEqual(list(cursor.scan(self.batch_size)), expected[1:])
+        cursor.close()
+
+    def test_next_batch(self):
+        uri = self.populate()
+        cursor = self.session.open_cursor(uri)
+        expected = [row for row in cursor]
+
+        rows = []
+        while True:
+            batch = cursor.next_batch(self.batch_size)
+            self.assertLessEqual(len(batch), self.batch_size)
+            rows.extend(batch)
+            if len(batch) < self.batch_size:
+                break
+        self.assertEqual(rows, expected)
+
+        # A short batch leaves the cursor reset.
+        self.assertEqual(cursor.next(), 0)
+        self.assertEqual(cursor.get_keys() + cursor.get_values(), expected[0])
+        cursor.close()
+
+    def test_columnar(self):
+        uri = self.populate()
+        cursor = self.session.open_cursor(uri)
+        expected = [row for row in cursor]
+
+        columns = None
+        for batch in cursor.scan(self.batch_size, columnar=True):
+            if columns is None:
+                columns = [list(column) for column in batch]
+            else:
+                for column, values in zip(columns, batch):
+                    column.extend(values)
+        self.assertEqual([list(row) for row in zip(*columns)], expected)
+        cursor.close()
+
+if __name__ == '__main__':
+    wttest.run()
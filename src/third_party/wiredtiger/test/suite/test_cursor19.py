@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+#
+# Public Domain 2014-present MongoDB, Inc.
+# Public Domain 2008-2014 WiredTiger, Inc.
+#
+# This is free and unencumbered software released into the public domain.
+#
+# Anyone is free to copy, modify, publish, use, compile, sell, or
+# distribute this software, either in source code form or as a compiled
+# binary, for any purpose, commercial or non-commercial, and by any
+# means.
+#
+# In jurisdictions that recognize copyright laws, the author or authors
+# of this software dedicate any and all copyright interest in the
+# software to the public domain. We make this dedication for the benefit
+# of the public at large and to the detriment of our heirs and
+# successors. We intend this dedication to be an overt act of
+# relinquishment in perpetuity of all present and future rights to this
+# software under copyright law.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+import wiredtiger, wttest
+from wtdataset import simple_key, simple_value
+from wtscenario import make_scenarios
+
+# test_cursor19.py
+#    Test Cursor.insert_many and Cursor.update_many.
+class test_cursor19(wttest.WiredTigerTestCase):
+    uri = 'table:test_cursor19'
+    nentries = 2503
+
+    types = [
+        ('row', dict(key_format='S', value_format='S')),
+        ('row-composite', dict(key_format='iS', value_format='SiS')),
+        ('var', dict(key_format='r', value_format='S')),
+        ('fix', dict(key_format='r', value_format='8t')),
+    ]
+    batches = [
+        ('batch1', dict(batch_size=1)),
+        ('batch100', dict(batch_size=100)),
+    ]
+    scenarios = make_scenarios(types, batches)
+
+    def key(self, i):
+        if self.key_format == 'iS':
+            return (i // 10, str(i))
+        return simple_key(self.cursor, i)
+
+    def value(self, i):
+        if self.value_format == 'SiS':
+            return (str(i), i, 'abc' * (i % 5))
+        return simple_value(self.cursor, i)
+
+    def rows(self, start, stop):
+        return [(self.key(i), self.value(i)) for i in range(start, stop)]
+
+    def expected(self, rows):
+        return [list(k if type(k) is tuple else (k,)) +
+            list(v if type(v) is tuple else (v,)) for k, v in rows]
+
+    def open(self, config=None):
+        self.session.create(self.uri, 'key_format=' + self.key_format +
+            ',value_format=' + self.value_format)
+        self.cursor = self.session.open_cursor(self.uri, None, config)
+
+    def check(self, rows):
+        cursor = self.session.open_cursor(self.uri)
+        self.assertEqual([row for row in cursor], self.expected(rows))
+        cursor.close()
+
+    def test_insert_many(self):
+        self.open()
+        rows = self.rows(1, self.nentries)
+        # Any iterable of pairs can be inserted.
+        self.assertEqual(self.cursor.insert_many(iter(rows), self.batch_size),
+            len(rows))
+        self.assertEqual(self.cursor.insert_many([], self.batch_size), 0)
+        self.cursor.close()
+        self.check(rows)
+
+    def test_insert_many_bulk(self):
+        self.open('bulk')
+        rows = self.rows(1, self.nentries)
+        self.assertEqual(self.cursor.insert_many(rows, self.batch_size),
+            len(rows))
+        self.cursor.close()
+        self.check(rows)
+
+    def test_insert_many_duplicate(self):
+        self.open('overwrite=false')
+        rows = self.rows(1, 200)
+        self.cursor.insert_many(rows, self.batch_size)
+        # The rows before the duplicate key are inserted.
+        self.assertRaises(wiredtiger.WiredTigerError,
+            lambda: self.cursor.insert_many(
+                self.rows(200, 210) + rows[:1], self.batch_size))
+        self.check(self.rows(1, 210))
+
+    def test_update_many(self):
+        self.open()
+        self.cursor.insert_many(self.rows(1, self.nentries), self.batch_size)
+        rows = [(self.key(i), self.value(i + 1))
+            for i in range(1, self.nentries)]
+        self.assertEqual(self.cursor.update_many(rows, self.batch_size),
+            len(rows))
+        self.cursor.close()
+        self.check(rows)
+
+    def test_update_many_missing(self):
+        if self.value_format == '8t':
+            # Fixed-length column stores have an implicit value for every
+            # record up to the last one.
+            return
+        self.open('overwrite=false')
+        self.cursor.insert_many(self.rows(1, 100), self.batch_size)
+        rows = [(self.key(i), self.value(i + 1)) for i in range(1, 50)]
+        missing = self.key(self.nentries)
+        with self.assertRaises(KeyError) as cm:
+            self.cursor.update_many(rows + [(missing, self.value(1))],
+                self.batch_size)
+        self.assertEqual(cm.exception.args[0], missing)
+        self.cursor.close()
+        self.check(rows + self.rows(50, 100))
+
+if __name__ == '__main__':
+    wttest.run()
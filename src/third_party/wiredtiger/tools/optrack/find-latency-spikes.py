@@ -328,27 +328,19 @@ def assignStackDepths(dataframe):
 
     return df;
 
-def createCallstackSeries(data, logfilename):
-
-    global firstTimeStamp;
-    global lastTimeStamp;
+#
+# Match the operation begin and end records of a trace, which may be one
+# chunk of a larger trace. Begin records without a matching end record yet
+# are left on intervalBeginningsStack. Returns the begin and end timestamps
+# and the function of the intervals found, and whether an error has been
+# reported.
+#
+def matchIntervals(data, intervalBeginningsStack, logfile, logfilename,
+                   errorReported):
 
-    colors = [];
     beginIntervals = [];
-    dataFrame = None;
     endIntervals = [];
-    errorReported = False;
     functionNames = [];
-    intervalBeginningsStack = [];
-    largestStackDepth = 0;
-    logfile = None;
-    thisIsFirstRow = True;
-
-    # Let's open the log file.
-    try:
-        logfile = open(logfilename, "w");
-    except:
-        logfile = sys.stdout;
 
     for row in data.itertuples():
         # row[0] is the timestamp, row[1] is the event type,
@@ -367,12 +359,6 @@ def createCallstackSeries(data, logfilename):
                     errorReported = reportDataError(logfile, logfilename);
                 continue;
 
-            if (intervalBegin < firstTimeStamp):
-                firstTimeStamp =  intervalBegin;
-            if (intervalEnd > lastTimeStamp):
-                lastTimeStamp = intervalEnd;
-
-            colors.append(getColorForFunction(function));
             beginIntervals.append(intervalBegin);
             endIntervals.append(intervalEnd);
             functionNames.append(function);
@@ -382,6 +368,11 @@ def createCallstackSeries(data, logfilename):
             print(str(row[0]) + " " + str(row[1]) + " " + str(row[2]));
             continue;
 
+    return beginIntervals, endIntervals, functionNames, errorReported;
+
+def reportUnmatchedBeginnings(intervalBeginningsStack, logfile, logfilename,
+                              errorReported):
+
     if (len(intervalBeginningsStack) > 0):
         logfile.write(str(len(intervalBeginningsStack)) + " operations had a " +
                       "begin record, but no matching end records. " +
@@ -389,10 +380,37 @@ def createCallstackSeries(data, logfilename):
                       "are properly inserted.\n");
         if (not errorReported):
             errorReported = reportDataError(logfile, logfilename);
-        intervalBeginningsStack = [];
+        del intervalBeginningsStack[:];
+
+    return errorReported;
+
+def createCallstackSeries(data, logfilename):
+
+    global firstTimeStamp;
+    global lastTimeStamp;
+
+    intervalBeginningsStack = [];
+    logfile = None;
+
+    # Let's open the log file.
+    try:
+        logfile = open(logfilename, "w");
+    except:
+        logfile = sys.stdout;
+
+    beginIntervals, endIntervals, functionNames, errorReported = \
+        matchIntervals(data, intervalBeginningsStack, logfile, logfilename,
+                       False);
+    reportUnmatchedBeginnings(intervalBeginningsStack, logfile, logfilename,
+                              errorReported);
+
+    if (len(beginIntervals) > 0):
+        firstTimeStamp = min(firstTimeStamp, min(beginIntervals));
+        lastTimeStamp = max(lastTimeStamp, max(endIntervals));
 
     dict = {};
-    dict['color'] = colors;
+    dict['color'] = [getColorForFunction(function)
+                     for function in functionNames];
     dict['start'] = beginIntervals;
     dict['end'] = endIntervals;
     dict['function'] = functionNames;
@@ -930,19 +948,74 @@ def checkForTimestampAndGetRowSkip(fname):
         else:
             return 0;
 
+#
+# Load a file written by wt_optrack_decode.py in the npz format. Returns the
+# seconds since the Epoch when logging began, and the same dataframe as
+# reading the records from a text file.
+#
+def loadColumnarFile(fname):
+
+    with np.load(fname) as data:
+        rawData = next(columnarFileChunks(data, len(data['timestamp'])));
+        return int(data['sec_from_epoch']), rawData;
+
+def columnarFileChunks(data, chunkRows):
+
+    functionNames = data['function_names'].astype(object);
+    # The decoder names unknown functions NULL, which read_csv reads as
+    # a missing value.
+    functionNames[functionNames == "NULL"] = np.nan;
+    events = data['event'];
+    functions = data['function'];
+    timestamps = data['timestamp'];
+
+    for start in range(0, max(1, len(timestamps)), max(1, chunkRows)):
+        end = start + chunkRows;
+        yield pd.DataFrame({"Event": events[start:end],
+                            "Function": functionNames[functions[start:end]]},
+                           index=pd.Index(timestamps[start:end],
+                                          name="Timestamp"));
+
+#
+# Read the records of a text or npz file in dataframes of at most chunkRows
+# records, so that large files can be processed in bounded memory.
+#
+def readTraceChunks(fname, chunkRows):
+
+    if (fname.endswith(".npz")):
+        with np.load(fname) as data:
+            for chunk in columnarFileChunks(data, chunkRows):
+                yield chunk;
+        return;
+
+    skipRows = checkForTimestampAndGetRowSkip(fname);
+    for chunk in pd.read_csv(fname,
+                             header=None, delimiter=" ",
+                             index_col=2,
+                             names=["Event", "Function", "Timestamp"],
+                             dtype={"Event": np.int32, "Timestamp": np.int64},
+                             thousands=",", skiprows = skipRows,
+                             chunksize = chunkRows):
+        yield chunk;
+
 def processFile(fname, dumpCleanDataBool):
 
     global perFileDataFrame;
+    global perFileTimeStamps;
     global perFuncDF;
 
-    skipRows = checkForTimestampAndGetRowSkip(fname);
+    if (fname.endswith(".npz")):
+        perFileTimeStamps[fname], rawData = loadColumnarFile(fname);
+    else:
+        skipRows = checkForTimestampAndGetRowSkip(fname);
 
-    rawData = pd.read_csv(fname,
-                          header=None, delimiter=" ",
-                          index_col=2,
-                          names=["Event", "Function", "Timestamp"],
-                          dtype={"Event": np.int32, "Timestamp": np.int64},
-                          thousands=",", skiprows = skipRows);
+        rawData = pd.read_csv(fname,
+                              header=None, delimiter=" ",
+                              index_col=2,
+                              names=["Event", "Function", "Timestamp"],
+                              dtype={"Event": np.int32,
+                                     "Timestamp": np.int64},
+                              thousands=",", skiprows = skipRows);
 
     print(color.BOLD + color.BLUE +
           "Processing file " + str(fname) + color.END);
@@ -1077,6 +1150,22 @@ def createOutlierHistogramForFunction(func, funcDF, bucketFilenames):
     if (maxOutliers == 0):
         return None;
 
+    return plotBucketOutliers(func, lowerBounds, upperBounds, bucketHeights,
+                              markers, bucketFilenames,
+                              statisticalOutlierThresholdDescr,
+                              userLatencyThresholdDescr,
+                              averageDuration, maxDuration);
+
+#
+# Plot the outlier histogram of a function, given the bounds of each bucket,
+# the number of outliers in it and the size of its marker for operations
+# exceeding the user-defined threshold.
+#
+def plotBucketOutliers(func, lowerBounds, upperBounds, bucketHeights, markers,
+                       bucketFilenames, statisticalOutlierThresholdDescr,
+                       userLatencyThresholdDescr, averageDuration,
+                       maxDuration):
+
     dict = {};
     dict['lowerbound'] = lowerBounds;
     dict['upperbound'] = upperBounds;
@@ -1091,12 +1180,315 @@ def createOutlierHistogramForFunction(func, funcDF, bucketFilenames):
                             dataframe['lowerbound']) // 2 ;
     dataframe['markerY'] = dataframe['height'] + 0.2;
 
-    return plotOutlierHistogram(dataframe, maxOutliers, func,
+    return plotOutlierHistogram(dataframe, max(bucketHeights), func,
                                 statisticalOutlierThresholdDescr,
                                 userLatencyThresholdDescr,
                                 averageDuration,
                                 maxDuration);
 
+#
+# Streaming analysis.
+#
+# The default analysis keeps the intervals of every file in memory, so that
+# it can draw the timeline of every bucket across all the files. The
+# streaming analysis only draws the outlier histograms, and reads each file
+# twice, a chunk of records at a time: the first pass gathers the duration
+# statistics of each function and the extent of the timeline, and the second
+# pass counts the outliers in each bucket. Files are processed in parallel
+# and their results merged, so memory use depends on the number of functions
+# and buckets, not on the size of the trace.
+#
+# The first pass builds a histogram of the durations of each function, with
+# DURATION_BINS_PER_OCTAVE bins for each power of two, to find the bins that
+# hold the percentile. The second pass keeps the durations in those bins,
+# from which the exact percentile is then computed, and counts the durations
+# in the bins above them.
+#
+STREAMING_CHUNK_ROWS = 1000000;
+DURATION_BINS_PER_OCTAVE = 64;
+DURATION_BINS = 64 * DURATION_BINS_PER_OCTAVE + 1;
+
+#
+# Return the histogram bin of each duration. Bin 0 holds durations of zero,
+# bin 1 + i the durations from 2 ** (i / DURATION_BINS_PER_OCTAVE).
+#
+def getDurationBins(durations):
+
+    bins = np.zeros(len(durations), dtype=np.int64);
+    positive = durations > 0;
+    bins[positive] = 1 + np.floor(np.log2(durations[positive]) *
+                                  DURATION_BINS_PER_OCTAVE).astype(np.int64);
+    return np.minimum(bins, DURATION_BINS - 1);
+
+#
+# Iterate over the intervals of a file, a dataframe of function, start, end
+# and durations columns at a time. Errors in the data are only logged if a
+# log file name is given.
+#
+def streamIntervals(fname, logfilename):
+
+    errorReported = logfilename is None;
+    intervalBeginningsStack = [];
+
+    if (logfilename is None):
+        logfile = open(os.devnull, "w");
+    else:
+        try:
+            logfile = open(logfilename, "w");
+        except:
+            logfile = sys.stdout;
+
+    try:
+        for chunk in readTraceChunks(fname, STREAMING_CHUNK_ROWS):
+            beginIntervals, endIntervals, functionNames, errorReported = \
+                matchIntervals(chunk, intervalBeginningsStack, logfile,
+                               logfilename, errorReported);
+            if (len(beginIntervals) == 0):
+                continue;
+
+            dataframe = pd.DataFrame({'function': functionNames,
+                                      'start': np.array(beginIntervals,
+                                                        dtype=np.int64),
+                                      'end': np.array(endIntervals,
+                                                      dtype=np.int64)});
+            dataframe['durations'] = dataframe['end'] - dataframe['start'];
+            yield dataframe;
+
+        reportUnmatchedBeginnings(intervalBeginningsStack, logfile,
+                                  logfilename, errorReported);
+    finally:
+        if (logfile is not sys.stdout):
+            logfile.close();
+
+#
+# First pass over a file. Returns the first and last timestamps of its
+# intervals, and for each function the number of intervals, their total and
+# maximum durations and the histogram of their durations.
+#
+def computeFileDurationStatistics(fname):
+
+    fileFirstTimeStamp = sys.maxsize;
+    fileLastTimeStamp = 0;
+    funcStats = {};
+
+    for dataframe in streamIntervals(fname, "." + fname + ".log"):
+        fileFirstTimeStamp = min(fileFirstTimeStamp,
+                                 int(dataframe['start'].min()));
+        fileLastTimeStamp = max(fileLastTimeStamp, int(dataframe['end'].max()));
+        dataframe['bin'] = getDurationBins(dataframe['durations'].values);
+
+        for func, funcDF in dataframe.groupby('function'):
+            histogram = np.bincount(funcDF['bin'].values,
+                                    minlength=DURATION_BINS);
+            if (func in funcStats):
+                stats = funcStats[func];
+                stats[0] += len(funcDF.index);
+                stats[1] += int(funcDF['durations'].sum());
+                stats[2] = max(stats[2], int(funcDF['durations'].max()));
+                stats[3] += histogram;
+            else:
+                funcStats[func] = [len(funcDF.index),
+                                   int(funcDF['durations'].sum()),
+                                   int(funcDF['durations'].max()), histogram];
+
+    return fname, fileFirstTimeStamp, fileLastTimeStamp, funcStats;
+
+#
+# Second pass over a file. For each function, count the operations in each
+# bucket whose duration falls in a histogram bin above those holding the
+# percentile, and return the durations and buckets of the operations in these
+# bins. Also count the operations exceeding the user-defined threshold in
+# each bucket.
+#
+def countFileOutliers(fname, percentileBins, userThresholds, firstTimeStamp,
+                      numBuckets, timeUnitsPerBucket):
+
+    outliers = {};
+    candidates = {};
+    exceeded = {};
+
+    for dataframe in streamIntervals(fname, None):
+        dataframe['bucket'] = (dataframe['start'] - firstTimeStamp) // \
+                              timeUnitsPerBucket;
+        dataframe['bin'] = getDurationBins(dataframe['durations'].values);
+
+        for func, funcDF in dataframe.groupby('function'):
+            if (func not in percentileBins):
+                continue;
+            lowBin, highBin = percentileBins[func];
+            bins = funcDF['bin'].values;
+            buckets = funcDF['bucket'].values;
+            durations = funcDF['durations'].values;
+
+            # Keep all the durations in the percentile bins, even those of
+            # operations past the last bucket, as they count towards the
+            # percentile.
+            inPercentileBins = (bins >= lowBin) & (bins <= highBin);
+            candidates.setdefault(func, []).append(
+                (durations[inPercentileBins], buckets[inPercentileBins]));
+
+            inBuckets = buckets < numBuckets;
+            counts = np.bincount(buckets[inBuckets & (bins > highBin)],
+                                 minlength=numBuckets);
+            outliers[func] = outliers.get(func, 0) + counts;
+
+            if (func in userThresholds):
+                counts = np.bincount(
+                    buckets[inBuckets & (durations >= userThresholds[func])],
+                    minlength=numBuckets);
+                exceeded[func] = exceeded.get(func, 0) + counts;
+
+    for func, arrays in candidates.items():
+        candidates[func] = (np.concatenate([d for d, b in arrays]),
+                            np.concatenate([b for d, b in arrays]));
+
+    return outliers, candidates, exceeded;
+
+def countFileOutliersStar(args):
+    return countFileOutliers(*args);
+
+#
+# Return the value at the given position of the sorted values, interpolating
+# linearly between values like pandas does when computing a quantile.
+#
+def interpolateSortedValues(values, position):
+
+    low = int(np.floor(position));
+    high = min(low + 1, len(values) - 1);
+    fraction = position - low;
+    lowValue = float(values[low]);
+    highValue = float(values[high]);
+    difference = highValue - lowValue;
+    if (fraction >= 0.5):
+        return highValue - difference * (1 - fraction);
+    return lowValue + difference * fraction;
+
+def streamingAnalysis(fileNames):
+
+    global firstTimeStamp;
+    global lastTimeStamp;
+
+    figures = [];
+    funcStats = {};
+    outliers = {};
+    exceeded = {};
+    thresholds = {};
+    userThresholds = {};
+
+    pool = multiprocessing.Pool(max(1, min(targetParallelism,
+                                           len(fileNames))));
+
+    print(color.BLUE + color.BOLD + "Computing function durations..." +
+          color.END);
+    for fname, fileFirst, fileLast, fileStats in \
+            pool.imap_unordered(computeFileDurationStatistics, fileNames):
+        print(color.BOLD + color.BLUE + "Processed file " + fname + color.END);
+        firstTimeStamp = min(firstTimeStamp, fileFirst);
+        lastTimeStamp = max(lastTimeStamp, fileLast);
+        for func, stats in fileStats.items():
+            if (func in funcStats):
+                merged = funcStats[func];
+                merged[0] += stats[0];
+                merged[1] += stats[1];
+                merged[2] = max(merged[2], stats[2]);
+                merged[3] += stats[3];
+            else:
+                funcStats[func] = stats;
+
+    numBuckets = plotWidth // pixelsPerWidthUnit;
+    timeUnitsPerBucket = (lastTimeStamp - firstTimeStamp) // numBuckets;
+    if (len(funcStats) == 0 or timeUnitsPerBucket <= 0):
+        pool.close();
+        print(color.BOLD + color.RED + "Not enough data to find outliers." +
+              color.END);
+        return figures;
+
+    percentileBins = {};
+    percentilePositions = {};
+    for func, stats in funcStats.items():
+        count, total, maxDuration, histogram = stats;
+        # The percentile lies between the durations at these positions in
+        # the sorted durations, find the bins that hold them.
+        position = (count - 1) * PERCENTILE;
+        cumulative = np.cumsum(histogram);
+        lowBin = int(np.searchsorted(cumulative, int(np.floor(position)),
+                                     side='right'));
+        highBin = int(np.searchsorted(cumulative,
+                                      min(int(np.floor(position)) + 1,
+                                          count - 1),
+                                      side='right'));
+        percentileBins[func] = (lowBin, highBin);
+        # The position relative to the first duration in these bins.
+        percentilePositions[func] = position - \
+            (int(cumulative[lowBin - 1]) if lowBin > 0 else 0);
+
+        if (func in userDefinedLatencyThresholds):
+            userThresholds[func] = userDefinedLatencyThresholds[func];
+        elif ("*" in userDefinedLatencyThresholds):
+            userThresholds[func] = userDefinedLatencyThresholds["*"];
+
+    print(color.BLUE + color.BOLD + "Counting outliers..." + color.END);
+    candidates = {};
+    work = [(fname, percentileBins, userThresholds, firstTimeStamp,
+             numBuckets, timeUnitsPerBucket) for fname in fileNames];
+    for fileOutliers, fileCandidates, fileExceeded in \
+            pool.imap_unordered(countFileOutliersStar, work):
+        for func, counts in fileOutliers.items():
+            outliers[func] = outliers.get(func, 0) + counts;
+        for func, arrays in fileCandidates.items():
+            candidates.setdefault(func, []).append(arrays);
+        for func, counts in fileExceeded.items():
+            exceeded[func] = exceeded.get(func, 0) + counts;
+    pool.close();
+    pool.join();
+
+    # Compute the percentiles from the durations in their bins, and add the
+    # operations in these bins that are outliers.
+    for func, arrays in candidates.items():
+        durations = np.concatenate([d for d, b in arrays]);
+        buckets = np.concatenate([b for d, b in arrays]);
+        thresholds[func] = interpolateSortedValues(np.sort(durations),
+                                                   percentilePositions[func]);
+        isOutlier = (durations >= thresholds[func]) & (buckets < numBuckets);
+        outliers[func] = outliers[func] + \
+                         np.bincount(buckets[isOutlier],
+                                     minlength=numBuckets);
+
+    lowerBounds = [i * timeUnitsPerBucket for i in range(numBuckets)];
+    upperBounds = [(i + 1) * timeUnitsPerBucket for i in range(numBuckets)];
+    # The timelines of each bucket are not generated in this mode.
+    bucketFilenames = [""] * numBuckets;
+
+    for func in sorted(funcStats.keys()):
+        getColorForFunction(func);
+        if (func not in outliers or outliers[func].max() == 0):
+            continue;
+
+        count, total, maxDuration, histogram = funcStats[func];
+        userLatencyThresholdDescr = None;
+        markers = [0] * numBuckets;
+        if (func in exceeded):
+            if (func in userDefinedThresholdNames):
+                userLatencyThresholdDescr = userDefinedThresholdNames[func];
+            else:
+                userLatencyThresholdDescr = userDefinedThresholdNames["*"];
+            markers = [6 if n > 0 else 0 for n in exceeded[func].tolist()];
+
+        statisticalOutlierThresholdDescr = \
+                            '{0:,.0f}'.format(thresholds[func]) \
+                            + " " + timeUnitString + \
+                            " (" + str(PERCENTILE * 100) + \
+                            "th percentile)";
+
+        figures.append(plotBucketOutliers(func, lowerBounds, upperBounds,
+                                          outliers[func].tolist(), markers,
+                                          bucketFilenames,
+                                          statisticalOutlierThresholdDescr,
+                                          userLatencyThresholdDescr,
+                                          float(total) / count, maxDuration));
+
+    return figures;
+
 #
 # Return the string naming the time units used to measure time stamps,
 # depending on how many time units there are in a second.
@@ -1285,6 +1677,14 @@ def main():
                         no function end record, or vice versa.');
     parser.add_argument('-j', dest='jobParallelism', type=int,
                         default='0');
+    parser.add_argument('-s', '--streaming', dest='streaming',
+                        default=False, action='store_true',
+                        help='Only generate the outlier histograms, \
+                        reading the files in chunks and in parallel \
+                        rather than keeping all the data in memory. \
+                        Use this for traces too large to analyze \
+                        otherwise. The timeline charts of each \
+                        interval are not generated in this mode.');
 
     args = parser.parse_args();
 
@@ -1292,6 +1692,11 @@ def main():
         parser.print_help();
         sys.exit(1);
 
+    if (args.streaming and args.dumpCleanData):
+        print(color.BOLD + color.RED +
+              "Clean data cannot be dumped in streaming mode." + color.END);
+        sys.exit(1);
+
     checkOpenFileLimit();
 
     # Determine the target job parallelism
@@ -1316,6 +1721,13 @@ def main():
               "th percentile for that function."
               + color.END);
 
+    if (args.streaming):
+        figuresForAllFunctions = streamingAnalysis(args.files);
+        reset_output();
+        output_file(filename = "WT-outliers.html",
+                    title="Outlier histograms");
+        show(column(figuresForAllFunctions));
+        return;
 
     # Create a directory for the files that display the data summarized
     # in each bucket of the outlier histogram. We call these "bucket files".
@@ -438,16 +438,38 @@ def parseIntervals(df, firstTimeStamp, fname):
     outputDF.to_csv(path_or_buf=outputCSV, index=False, header=True);
 
 
-def processFile(fname):
+#
+# Load a file written by wt_optrack_decode.py in the npz format. Returns the
+# seconds since the Epoch when logging began, and the same dataframe as
+# reading the records from a text file.
+#
+def loadColumnarFile(fname):
+
+    with np.load(fname) as data:
+        functionNames = data['function_names'].astype(object);
+        # The decoder names unknown functions NULL, which read_csv reads as
+        # a missing value.
+        functionNames[functionNames == "NULL"] = np.nan;
+        rawData = pd.DataFrame({"Event": data['event'],
+                                "Function": functionNames[data['function']]},
+                               index=pd.Index(data['timestamp'],
+                                              name="Timestamp"));
+        return int(data['sec_from_epoch']), rawData;
 
-    firstTimeStamp, skipRows = checkForTimestampAndGetRowSkip(fname);
+def processFile(fname):
 
-    rawData = pd.read_csv(fname,
-                          header=None, delimiter=" ",
-                          index_col=2,
-                          names=["Event", "Function", "Timestamp"],
-                          dtype={"Event": np.int32, "Timestamp": np.int64},
-                          thousands=",", skiprows = skipRows);
+    if (fname.endswith(".npz")):
+        firstTimeStamp, rawData = loadColumnarFile(fname);
+    else:
+        firstTimeStamp, skipRows = checkForTimestampAndGetRowSkip(fname);
+
+        rawData = pd.read_csv(fname,
+                              header=None, delimiter=" ",
+                              index_col=2,
+                              names=["Event", "Function", "Timestamp"],
+                              dtype={"Event": np.int32,
+                                     "Timestamp": np.int64},
+                              thousands=",", skiprows = skipRows);
 
     print(color.BOLD + color.BLUE +
           "Processing file " + str(fname) + color.END);
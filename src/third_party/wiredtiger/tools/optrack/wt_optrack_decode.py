@@ -30,12 +30,13 @@ import argparse
 import colorsys
 from multiprocessing import Process
 import multiprocessing
+import multiprocessing.connection
+import numpy as np
 import os
 import os.path
 import struct
 import sys
 import subprocess
-import time
 import traceback
 
 #
@@ -115,23 +116,64 @@ def funcIDtoName(funcID):
 # So we explicitly pad the track record structure in the implementation
 # to make it clear what the record size is.
 #
-def parseOneRecord(file):
+# The records are decoded all at once, as a NumPy structured array mapped
+# onto the file, rather than one at a time.
+#
+recordType = np.dtype([('timestamp', '=u8'), ('funcID', '=i2'),
+                       ('opType', '=i2'), ('padding', 'V4')]);
 
-    bytesRead = "";
-    record = ();
-    RECORD_SIZE = 16;
+# The number of records formatted and written to a text file at a time.
+WRITE_CHUNK_RECORDS = 1 << 20;
 
-    try:
-        bytesRead = file.read(RECORD_SIZE);
-    except:
-        return None;
+def mapRecords(fileName, headerSize):
+
+    # Any partial record at the end of the file is ignored.
+    numRecords = (os.path.getsize(fileName) - headerSize) // recordType.itemsize;
+    if (numRecords <= 0):
+        return np.zeros(0, dtype=recordType);
+
+    return np.memmap(fileName, dtype=recordType, mode='r', offset=headerSize,
+                     shape=(numRecords,));
+
+#
+# Translate the function IDs of the records to names. Returns the names of
+# the distinct functions found in the records, and for each record the index
+# of its function in that list.
+#
+def translateFunctionIDs(funcIDs):
+
+    uniqueIDs, funcIndexes = np.unique(funcIDs, return_inverse=True);
+    funcNames = [funcIDtoName(funcID) for funcID in uniqueIDs.tolist()];
+
+    return funcNames, funcIndexes;
 
-    if (len(bytesRead) < RECORD_SIZE):
-        return None;
+def writeTextFile(outputFile, opTypes, funcNames, funcIndexes, times):
 
-    record = struct.unpack('Qhhxxxx', bytesRead);
+    funcNames = np.array(funcNames, dtype=object);
 
-    return record;
+    for start in range(0, len(times), WRITE_CHUNK_RECORDS):
+        end = start + WRITE_CHUNK_RECORDS;
+        lines = map("{0} {1} {2}\n".format,
+                    opTypes[start:end].tolist(),
+                    funcNames[funcIndexes[start:end]].tolist(),
+                    times[start:end].tolist());
+        outputFile.write("".join(lines));
+
+#
+# Write the records as a compressed NumPy archive of columns, which the
+# analysis scripts can load without parsing text. Function names are stored
+# once, each record only keeps the index of its function name.
+#
+def writeColumnarFile(outputFileName, sec_from_epoch, opTypes, funcNames,
+                      funcIndexes, times):
+
+    np.savez_compressed(outputFileName,
+                        sec_from_epoch=np.array(sec_from_epoch,
+                                                dtype=np.int64),
+                        event=opTypes.astype(np.int32),
+                        function_names=np.array(funcNames, dtype=str),
+                        function=funcIndexes.astype(np.int32),
+                        timestamp=times);
 
 #
 # HEADER_SIZE must be the same as the size of WT_OPTRACK_HEADER
@@ -188,19 +230,16 @@ def getStringFromThreadType(threadType):
     elif (threadType == 1):
         return "internal";
     else:
-        return unknown;
+        return "unknown";
 
 
-def parseFile(fileName):
+def parseFile(fileName, outputFormat):
 
-    done = False;
     file = None;
     threadType = 0;
     threadTypeString = None;
     tsc_nsec_ratio = 1.0;
-    outputFile = None;
     outputFileName = "";
-    totalRecords = 0;
     validVersion = False;
 
     print(color.BOLD + "Processing file " + fileName + color.END);
@@ -214,8 +253,10 @@ def parseFile(fileName):
         raise;
 
     # Read and validate log header
-    validVersion, threadType, tsc_nsec_ratio, sec_from_epoch = \
-                                                    validateHeader(file);
+    with file:
+        validVersion, threadType, tsc_nsec_ratio, sec_from_epoch = \
+                                                        validateHeader(file);
+        headerSize = file.tell();
     if (not validVersion):
         return;
 
@@ -232,49 +273,40 @@ def parseFile(fileName):
 
     print("TSC_NSEC ratio parsed: " + '{0:,.4f}'.format(tsc_nsec_ratio));
 
-    # Open the text file for writing
-    try:
-        outputFileName = fileName + "-" + threadTypeString + ".txt";
-        outputFile = open(outputFileName, "w");
-    except:
+    if (tsc_nsec_ratio == 0):
         print(color.BOLD + color.RED +
-              "Could not open file " + outputfileName + ".txt for writing." +
-              color.END);
+              "Invalid TSC_NSEC ratio in " + fileName + "." + color.END);
         return;
 
+    records = mapRecords(fileName, headerSize);
+    times = (records['timestamp'] / tsc_nsec_ratio).astype(np.int64);
+    opTypes = np.array(records['opType']);
+    funcNames, funcIndexes = translateFunctionIDs(records['funcID']);
+
+    outputFileName = fileName + "-" + threadTypeString + "." + outputFormat;
     print(color.BOLD + color.PURPLE +
           "Writing to output file " + outputFileName + "." + color.END);
 
-    # The first line of the output file contains the seconds from Epoch
-    outputFile.write(str(sec_from_epoch) + "\n");
-
-    while (not done):
-        record = parseOneRecord(file);
-
-        if ((record is None) or len(record) < 3):
-            done = True;
+    try:
+        if (outputFormat == "npz"):
+            writeColumnarFile(outputFileName, sec_from_epoch, opTypes,
+                              funcNames, funcIndexes, times);
         else:
-            try:
-                time = float(record[0]) / tsc_nsec_ratio;
-                funcName = funcIDtoName(record[1]);
-                opType = record[2];
-
-                outputFile.write(str(opType) + " " + funcName + " "
-                                 + str(int(time))
-                                 + "\n");
-                totalRecords += 1;
-            except:
-                exc_type, exc_value, exc_traceback = sys.exc_info()
-                traceback.print_exception(exc_type, exc_value, exc_traceback);
-                print(color.BOLD + color.RED);
-                print("Could not write record " + str(record) +
-                      " to file " + fileName + ".txt.");
-                print(color.END);
-                done = True;
-
-    print("Wrote " + str(totalRecords) + " records to " + outputFileName + ".");
-    file.close();
-    outputFile.close();
+            with open(outputFileName, "w") as outputFile:
+                # The first line of the output file contains the seconds
+                # from Epoch
+                outputFile.write(str(sec_from_epoch) + "\n");
+                writeTextFile(outputFile, opTypes, funcNames, funcIndexes,
+                              times);
+    except:
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        traceback.print_exception(exc_type, exc_value, exc_traceback);
+        print(color.BOLD + color.RED);
+        print("Could not write records to file " + outputFileName + ".");
+        print(color.END);
+        return;
+
+    print("Wrote " + str(len(times)) + " records to " + outputFileName + ".");
 
 def waitOnOneProcess(runningProcesses):
 
@@ -285,9 +317,11 @@ def waitOnOneProcess(runningProcesses):
             del runningProcesses[fname];
             success = True;
 
-    # If we have not found a terminated process, sleep for a while
-    if (not success):
-        time.sleep(5);
+    # If we have not found a terminated process, wait until one terminates,
+    # since decoding a file usually takes much less than a fixed sleep.
+    if (not success and len(runningProcesses) > 0):
+        multiprocessing.connection.wait(
+            [p.sentinel for p in runningProcesses.values()], 5);
 
 def main():
 
@@ -311,6 +345,12 @@ def main():
     parser.add_argument('-m', '--mapfile', dest='mapFileName', type=str,
                         default='optrack-map');
 
+    parser.add_argument('-f', '--format', dest='outputFormat', type=str,
+                        choices=['txt', 'npz'], default='txt',
+                        help='output text files, or compressed NumPy \
+                        archives of columns that the analysis scripts \
+                        can load without parsing text');
+
     args = parser.parse_args();
 
     print("Running with the following parameters:");
@@ -336,7 +376,7 @@ def main():
     # Prepare the processes that will parse files, one per file
     if (len(args.files) > 0):
         for fname in args.files:
-            p = Process(target=parseFile, args=(fname,));
+            p = Process(target=parseFile, args=(fname, args.outputFormat));
             runnableProcesses[fname] = p;
 
     # Spawn these processes, not exceeding the desired parallelism